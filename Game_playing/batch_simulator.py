@@ -0,0 +1,156 @@
+""" Module concernant la simulation vectorisée (NumPy) de nombreuses parties aléatoires """
+
+from functools import lru_cache
+
+import numpy as np
+
+from Game_playing.bitboard import board_tables
+from Game_playing.structures_classes import Directions, Environment
+
+EMPTY = 0
+
+
+@lru_cache(maxsize=None)
+def neighbor_indices(hex_size: int, directions: tuple[tuple[int, int], ...]) -> np.ndarray:
+    """
+    Fonction retournant le tableau (cases, directions) des indices des cases voisines
+    selon un ensemble de directions (indice len(cells) lorsque la case voisine est hors grille)
+    """
+    tables = board_tables(hex_size)
+    outside = len(tables.cells)
+    result = np.full((len(tables.cells), len(directions)), outside, dtype=np.intp)
+    for i, (q, r) in enumerate(tables.cells):
+        for d, (dq, dr) in enumerate(directions):
+            result[i, d] = tables.index.get((q + dq, r + dr), outside)
+    return result
+
+
+class BatchSimulator:
+    """
+    Classe simulant K parties aléatoires à la fois à partir d'une même position
+
+    Les K grilles sont stockées dans un tableau (K, cases + 1) : la dernière colonne
+    représente l'extérieur de la grille. Les coups légaux de toutes les grilles sont
+    calculés en une fois grâce aux tableaux d'indices des voisins, puis un coup légal
+    est tiré au hasard pour chaque grille non terminée.
+    Les règles et le score final sont ceux de MCTS.rollout avec GameDodo et GameGopher :
+    la simulation s'arrête dès qu'un des deux joueurs n'a plus de coup légal
+    et le score est celui de env.final() à ce moment-là.
+    """
+
+    def __init__(self, env: Environment, seed: int | None = None):
+        self.game = env.game
+        self.tables = board_tables(env.hex_size)
+        self.size = len(self.tables.cells)
+        self.max_id = env.max_player.id
+        self.min_id = env.min_player.id
+        self.rng = np.random.default_rng(seed)
+
+        # Cases atteignables (Dodo) ou voisines (Gopher) de chaque case, par joueur
+        self.targets: dict[int, np.ndarray] = {
+            player.id: neighbor_indices(env.hex_size, self.directions(player.directions))
+            for player in (env.max_player, env.min_player)
+        }
+
+    @staticmethod
+    def directions(directions: Directions) -> tuple[tuple[int, int], ...]:
+        """
+        Fonction convertissant une liste de directions en clé hachable
+        """
+        return tuple(tuple(direction) for direction in directions)
+
+    def boards(self, env: Environment, k: int) -> np.ndarray:
+        """
+        Fonction retournant K copies de la grille de l'environnement
+        """
+        grid = env.grid
+        board = np.zeros(self.size + 1, dtype=np.int8)
+        for i, cell in enumerate(self.tables.cells):
+            board[i] = grid[cell]
+        return np.tile(board, (k, 1))
+
+    def legal_mask(self, boards: np.ndarray, player_id: int) -> np.ndarray:
+        """
+        Fonction retournant le masque des coups légaux d'un joueur pour chaque grille
+        Dodo : tableau (K, cases, directions) (pion déplacé, direction)
+        Gopher : tableau (K, cases) (case jouée)
+        """
+        targets = self.targets[player_id]
+        if self.game == "Dodo":
+            empty = boards == EMPTY
+            empty[:, self.size] = False  # l'extérieur de la grille n'est pas une case libre
+            return (boards[:, :self.size] == player_id)[:, :, None] & empty[:, targets]
+
+        opponent_id = self.min_id if player_id == self.max_id else self.max_id
+        own_adjacent = (boards == player_id)[:, targets].any(axis=2)
+        opponent_adjacent = (boards == opponent_id)[:, targets].sum(axis=2)
+        cells = boards[:, :self.size]
+        legal = (cells == EMPTY) & ~own_adjacent & (opponent_adjacent == 1)
+        # Premier coup : toutes les cases sont jouables
+        legal[(cells == EMPTY).all(axis=1)] = True
+        return legal
+
+    def score(self, has_max: np.ndarray, has_min: np.ndarray, current: np.ndarray) -> np.ndarray:
+        """
+        Fonction retournant le score env.final() de grilles où un joueur n'a plus de coup
+        """
+        if self.game == "Dodo":
+            return np.where(~has_max, 1, np.where(~has_min, -1, 0))
+        return np.where(
+            ~has_max & (current == self.max_id), -1,
+            np.where(~has_min & (current == self.min_id), 1, 0),
+        )
+
+    def play(self, boards: np.ndarray, current: np.ndarray, player_id: int, legal: np.ndarray):
+        """
+        Fonction jouant un coup légal tiré au hasard sur chaque grille où player_id a le trait
+        """
+        rows = np.flatnonzero(current == player_id)
+        if len(rows) == 0:
+            return
+        mask = legal[rows].reshape(len(rows), -1)
+        # Le maximum de valeurs aléatoires restreintes aux coups légaux est un tirage uniforme
+        choice = np.argmax(self.rng.random(mask.shape) * mask, axis=1)
+        if self.game == "Dodo":
+            directions = self.targets[player_id].shape[1]
+            start = choice // directions
+            end = self.targets[player_id][start, choice % directions]
+            boards[rows, start] = EMPTY
+            boards[rows, end] = player_id
+        else:
+            boards[rows, choice] = player_id
+
+    def rollouts(self, env: Environment, k: int) -> np.ndarray:
+        """
+        Fonction simulant K parties aléatoires depuis la position de l'environnement
+        Retourne le score final de chaque partie (-1, 0 ou 1)
+        """
+        boards = self.boards(env, k)
+        current = np.full(k, env.current_player.id, dtype=np.int8)
+        scores = np.zeros(k, dtype=np.int8)
+        active = np.arange(k)
+
+        while len(active) > 0:
+            legal_max = self.legal_mask(boards, self.max_id)
+            legal_min = self.legal_mask(boards, self.min_id)
+            axes = tuple(range(1, legal_max.ndim))
+            has_max = legal_max.any(axis=axes)
+            has_min = legal_min.any(axis=axes)
+
+            # Parties terminées : un des deux joueurs n'a plus de coup légal
+            finished = ~(has_max & has_min)
+            scores[active[finished]] = self.score(has_max[finished], has_min[finished],
+                                                  current[finished])
+            running = ~finished
+            active = active[running]
+            boards = boards[running]
+            current = current[running]
+            legal_max = legal_max[running]
+            legal_min = legal_min[running]
+
+            # Un coup aléatoire par partie en cours, puis changement de joueur
+            self.play(boards, current, self.max_id, legal_max)
+            self.play(boards, current, self.min_id, legal_min)
+            current = np.where(current == self.max_id, self.min_id, self.max_id).astype(np.int8)
+
+        return scores
@@ -0,0 +1,465 @@
+""" Module regroupant les environnements de jeu représentés par des bitboards """
+
+from abc import ABC
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from Game_playing.structures_classes import (ALL_DIRECTIONS, Action, ActionDodo,
+                                             ActionGopher, Cell, Directions,
+                                             Environment, GameDodo, GameGopher,
+                                             GridDict, MaxPositionsCr,
+                                             MinPositionsCr, PlayerLocal, Time,
+                                             generate_grid, gopher_final)
+from Game_playing.zobrist import zobrist_keys
+
+
+@dataclass
+class BoardTables:
+    """
+    Classe regroupant les tables précalculées pour une taille de grille donnée
+
+    Chaque case reçoit un indice (ordre de generate_grid) et correspond au bit
+    de même rang dans les bitboards des joueurs.
+    """
+
+    hex_size: int
+    cells: tuple[Cell, ...]
+    index: dict[Cell, int]
+    neighbors: tuple[int, ...]  # masque des voisins de chaque case
+    full: int  # masque de toutes les cases de la grille
+    forward: dict[tuple[tuple[int, int], ...], tuple[tuple[int, ...], ...]] = \
+        field(default_factory=dict)
+
+    def targets(self, directions: Directions) -> tuple[tuple[int, ...], ...]:
+        """
+        Fonction retournant, pour chaque case, les indices des cases atteignables
+        selon un ensemble de directions (table calculée une seule fois)
+        """
+        key = tuple(directions)
+        if key not in self.forward:
+            table = []
+            for q, r in self.cells:
+                targets = []
+                for dq, dr in directions:
+                    if (q + dq, r + dr) in self.index:
+                        targets.append(self.index[(q + dq, r + dr)])
+                table.append(tuple(targets))
+            self.forward[key] = tuple(table)
+        return self.forward[key]
+
+
+@lru_cache(maxsize=None)
+def board_tables(hex_size: int) -> BoardTables:
+    """
+    Fonction retournant les tables précalculées pour une taille de grille
+    """
+    cells = tuple(generate_grid(hex_size))
+    index = {cell: i for i, cell in enumerate(cells)}
+    neighbors = []
+    for q, r in cells:
+        mask = 0
+        for dq, dr in ALL_DIRECTIONS:
+            if (q + dq, r + dr) in index:
+                mask |= 1 << index[(q + dq, r + dr)]
+        neighbors.append(mask)
+    return BoardTables(hex_size, cells, index, tuple(neighbors), (1 << len(cells)) - 1)
+
+
+def bits(mask: int) -> list[int]:
+    """
+    Fonction retournant les indices des bits à 1 d'un masque
+    """
+    result = []
+    while mask:
+        low = mask & -mask
+        result.append(low.bit_length() - 1)
+        mask ^= low
+    return result
+
+
+class BitboardEnvironment(Environment, ABC):
+    """
+    Classe commune aux environnements dont les pions de chaque joueur sont stockés
+    dans un entier Python (un bit par case)
+    """
+
+    # pylint: disable=too-many-arguments, super-init-not-called
+    def __init__(
+        self,
+        grid: GridDict,
+        max_player: PlayerLocal,
+        min_player: PlayerLocal,
+        current_player: PlayerLocal,
+        hex_size: int,
+        total_time: Time,
+        current_round: int,
+        precedent_state: GridDict,
+        game: str,
+    ):
+        self.max_player = max_player
+        self.min_player = min_player
+        self.current_player = current_player
+        self.hex_size = hex_size
+        self.total_time = total_time
+        self.current_round = current_round
+        self.game = game
+        self.tables = board_tables(hex_size)
+        self.zobrist = zobrist_keys(hex_size)
+        # Clés de Zobrist de chaque joueur indexées comme les bits des bitboards
+        self.cell_keys = {
+            player_id: tuple(keys[cell] for cell in self.tables.cells)
+            for player_id, keys in self.zobrist.cells.items()
+        }
+        self.stones: dict[int, int] = {max_player.id: 0, min_player.id: 0}
+        self._grid_view: GridDict | None = None
+        # Résultats mémorisés de both_legals et mobility (valides pour legals_hash, mobility_hash)
+        self.cached_legals: tuple[list[Action], list[Action]] = ([], [])
+        self.cached_mobility = (0, 0)
+        self.load_grid(grid)
+        self.precedent_state = precedent_state.copy()
+
+    # La grille n'est qu'une vue calculée à la demande à partir des bitboards
+    @property
+    def grid(self) -> GridDict:
+        """
+        Grille (vue calculée à partir des bitboards, reconstruite après chaque coup)
+        """
+        if self._grid_view is None:
+            view = {cell: 0 for cell in self.tables.cells}
+            for player_id, mask in self.stones.items():
+                for i in bits(mask):
+                    view[self.tables.cells[i]] = player_id
+            self._grid_view = view
+        return self._grid_view
+
+    @grid.setter
+    def grid(self, grid: GridDict):
+        self.load_grid(grid)
+
+    @property
+    def max_positions(self) -> MaxPositionsCr:
+        """
+        Positions du joueur max (vue calculée, compatible avec les environnements dict)
+        """
+        return MaxPositionsCr(player=self.max_player, positions=self._positions(self.max_player))
+
+    @property
+    def min_positions(self) -> MinPositionsCr:
+        """
+        Positions du joueur min (vue calculée, compatible avec les environnements dict)
+        """
+        return MinPositionsCr(player=self.min_player, positions=self._positions(self.min_player))
+
+    def _positions(self, player: PlayerLocal) -> dict[Cell, int]:
+        return {self.tables.cells[i]: player.id for i in bits(self.stones[player.id])}
+
+    def load_grid(self, grid: GridDict):
+        """
+        Fonction remplaçant la grille et reconstruisant les bitboards des joueurs
+        ainsi que le hash de Zobrist de la position
+        """
+        self.stones = {self.max_player.id: 0, self.min_player.id: 0}
+        for cell, value in grid.items():
+            if value in self.stones:
+                self.stones[value] |= 1 << self.tables.index[cell]
+        self._grid_view = None
+        self.hash = self.compute_hash()
+        if self.evaluation is not None:
+            self.evaluation.load(self)
+
+    def opponent(self, player: PlayerLocal) -> PlayerLocal:
+        """
+        Fonction retournant l'adversaire d'un joueur
+        """
+        return self.min_player if player.id == self.max_player.id else self.max_player
+
+
+class BitboardDodo(BitboardEnvironment):
+    """Classe représentant le jeu Dodo sur bitboards"""
+
+    def load_grid(self, grid: GridDict):
+        super().load_grid(grid)
+        self.one_line = getattr(self, "one_line", False)
+        self.forward = {
+            self.max_player.id: self.tables.targets(self.max_player.directions),
+            self.min_player.id: self.tables.targets(self.min_player.directions),
+        }
+        # Compteurs (hash, coups, pions non bloqués) de chaque joueur, voir counts
+        self.cached_counts: dict[int, tuple[int, int, int]] = {}
+
+    def empty_mask(self) -> int:
+        """
+        Fonction retournant le masque des cases vides
+        """
+        return self.tables.full & ~(self.stones[self.max_player.id]
+                                    | self.stones[self.min_player.id])
+
+    def legals(self, player: PlayerLocal) -> list[ActionDodo]:
+        """
+        Fonction retournant les actions possibles d'un joueur pour un état donné
+        """
+        return self._legals(player, self.empty_mask())
+
+    def _legals(self, player: PlayerLocal, empty: int) -> list[ActionDodo]:
+        cells = self.tables.cells
+        targets = self.forward[player.id]
+        result: list[ActionDodo] = []
+        mask = self.stones[player.id]
+        while mask:
+            low = mask & -mask
+            i = low.bit_length() - 1
+            mask ^= low
+            for j in targets[i]:
+                if empty >> j & 1:
+                    result.append((cells[i], cells[j]))
+        return result
+
+    def pair_legals(self) -> tuple[list[ActionDodo], list[ActionDodo]]:
+        """
+        Fonction calculant les coups légaux des deux joueurs (max, min)
+        avec un seul calcul des cases vides
+        """
+        empty = self.empty_mask()
+        return self._legals(self.max_player, empty), self._legals(self.min_player, empty)
+
+    def counts(self, player: PlayerLocal) -> tuple[int, int]:
+        """
+        Fonction retournant le nombre de coups légaux et le nombre de pions non bloqués
+        d'un joueur en un seul parcours de ses pions (mémorisés jusqu'au coup suivant)
+        """
+        cached = self.cached_counts.get(player.id)
+        if cached is not None and cached[0] == self.hash:
+            return cached[1], cached[2]
+
+        targets = self.forward[player.id]
+        empty = self.empty_mask()
+        moves = 0
+        movable = 0
+        mask = self.stones[player.id]
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            free = 0
+            for j in targets[low.bit_length() - 1]:
+                free += empty >> j & 1
+            moves += free
+            movable += free > 0
+        self.cached_counts[player.id] = (self.hash, moves, movable)
+        return moves, movable
+
+    def legal_count(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le nombre de coups légaux d'un joueur sans construire la liste
+        """
+        return self.counts(player)[0]
+
+    def any_legal(self, player: PlayerLocal) -> bool:
+        """
+        Fonction indiquant si un joueur a au moins un coup légal (arrêt au premier trouvé)
+        """
+        targets = self.forward[player.id]
+        empty = self.empty_mask()
+        mask = self.stones[player.id]
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            for j in targets[low.bit_length() - 1]:
+                if empty >> j & 1:
+                    return True
+        return False
+
+    def movable_count(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le nombre de pions non bloqués d'un joueur
+        """
+        return self.counts(player)[1]
+
+    def final(self) -> int:
+        """
+        Fonction retournant le score si nous sommes dans un état final (fin de partie)
+        """
+        if not self.has_legal(self.max_player):
+            return 1
+        if not self.has_legal(self.min_player):
+            return -1
+        return 0
+
+    def play(self, action: ActionDodo) -> None:
+        """
+        Fonction jouant un coup pour un joueur donné
+        """
+        start = self.tables.index[action[0]]
+        end = self.tables.index[action[1]]
+        keys = self.cell_keys[self.current_player.id]
+        self.stones[self.current_player.id] ^= (1 << start) | (1 << end)
+        self.hash ^= keys[start] ^ keys[end] ^ self.zobrist.side
+        self._grid_view = None
+        if self.evaluation is not None:
+            self.evaluation.move(self.current_player.id, action[0], action[1])
+        self.current_player = (
+            self.min_player if self.current_player is self.max_player else self.max_player
+        )
+
+    def reverse_action(self, action: ActionDodo):
+        """
+        Fonction annulant un coup pour un joueur donné
+        """
+        self.current_player = (
+            self.min_player if self.current_player is self.max_player else self.max_player
+        )
+        start = self.tables.index[action[0]]
+        end = self.tables.index[action[1]]
+        keys = self.cell_keys[self.current_player.id]
+        self.stones[self.current_player.id] ^= (1 << start) | (1 << end)
+        self.hash ^= keys[start] ^ keys[end] ^ self.zobrist.side
+        self._grid_view = None
+        if self.evaluation is not None:
+            self.evaluation.move(self.current_player.id, action[1], action[0])
+
+    def reverse_action_player(self, action: ActionDodo, _: PlayerLocal):
+        """
+        Fonction annulant un coup pour un joueur donné
+        """
+        self.reverse_action(action)
+
+
+class BitboardGopher(BitboardEnvironment):
+    """Classe représentant le jeu Gopher sur bitboards"""
+
+    # Hash de la position des masques de coups légaux mémorisés (voir legal_masks)
+    masks_hash = None
+
+    def __init__(self, *args, **kwargs):
+        # Masques des coups légaux (max, min) de la position masks_hash
+        self.cached_masks = (0, 0)
+        super().__init__(*args, **kwargs)
+
+    def load_grid(self, grid: GridDict):
+        super().load_grid(grid)
+        self.precedent_action = getattr(self, "precedent_action", None)
+
+    @property
+    def neighbor_dict(self) -> dict[Cell, list[Cell]]:
+        """
+        Voisins de chaque case (vue compatible avec GameGopher)
+        """
+        cells = self.tables.cells
+        return {cells[i]: [cells[j] for j in bits(mask)]
+                for i, mask in enumerate(self.tables.neighbors)}
+
+    def legal_masks(self) -> tuple[int, int]:
+        """
+        Fonction retournant les masques des coups légaux des deux joueurs (max, min)
+        Un seul parcours des pions de chaque joueur donne les cases voisines d'au moins un
+        et d'au moins deux de ses pions, qui suffisent aux règles des deux joueurs
+        (masques mémorisés pour la position courante)
+        """
+        if self.masks_hash != self.hash:
+            self.cached_masks = self._legal_masks()
+            self.masks_hash = self.hash
+        return self.cached_masks
+
+    def _legal_masks(self) -> tuple[int, int]:
+        max_stones = self.stones[self.max_player.id]
+        min_stones = self.stones[self.min_player.id]
+
+        # Premier coup : toutes les cases sont jouables
+        if not max_stones and not min_stones:
+            return self.tables.full, self.tables.full
+
+        neighbors = self.tables.neighbors
+        adjacent = []
+        for stones in (max_stones, min_stones):
+            once = 0
+            twice = 0
+            mask = stones
+            while mask:
+                low = mask & -mask
+                cell_neighbors = neighbors[low.bit_length() - 1]
+                twice |= once & cell_neighbors
+                once |= cell_neighbors
+                mask ^= low
+            adjacent.append((once, twice))
+
+        (max_once, max_twice), (min_once, min_twice) = adjacent
+        empty = ~(max_stones | min_stones)
+        return (
+            min_once & ~min_twice & ~max_once & empty,
+            max_once & ~max_twice & ~min_once & empty,
+        )
+
+    def legal_mask(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le masque des coups légaux d'un joueur
+        """
+        masks = self.legal_masks()
+        return masks[0] if player.id == self.max_player.id else masks[1]
+
+    def cells_of(self, mask: int) -> list[ActionGopher]:
+        """
+        Fonction retournant les cases d'un masque
+        """
+        cells = self.tables.cells
+        result: list[ActionGopher] = []
+        while mask:
+            low = mask & -mask
+            result.append(cells[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def legals(self, player: PlayerLocal) -> list[ActionGopher]:
+        return self.cells_of(self.legal_mask(player))
+
+    def pair_legals(self) -> tuple[list[ActionGopher], list[ActionGopher]]:
+        """
+        Fonction calculant les coups légaux des deux joueurs (max, min) en un seul parcours
+        """
+        max_mask, min_mask = self.legal_masks()
+        return self.cells_of(max_mask), self.cells_of(min_mask)
+
+    def legal_count(self, player: PlayerLocal) -> int:
+        return self.legal_mask(player).bit_count()
+
+    def any_legal(self, player: PlayerLocal) -> bool:
+        return self.legal_mask(player) != 0
+
+    def final(self) -> int:
+        """
+        Fonction retournant le score si nous sommes dans un état final (fin de partie)
+        """
+        return gopher_final(self)
+
+    def play(self, action: ActionGopher):
+        """
+        Fonction jouant un coup pour un joueur donné
+        """
+        i = self.tables.index[action]
+        self.stones[self.current_player.id] |= 1 << i
+        self.hash ^= self.cell_keys[self.current_player.id][i] ^ self.zobrist.side
+        self._grid_view = None
+        if self.evaluation is not None:
+            self.evaluation.place(self.current_player.id, action)
+        self.current_player = (
+            self.min_player if self.current_player is self.max_player else self.max_player
+        )
+
+    def reverse_action(self, action: ActionGopher):
+        """
+        Fonction annulant un coup pour un joueur donné
+        """
+        self.current_player = (
+            self.min_player if self.current_player is self.max_player else self.max_player
+        )
+        i = self.tables.index[action]
+        self.stones[self.current_player.id] &= ~(1 << i)
+        self.hash ^= self.cell_keys[self.current_player.id][i] ^ self.zobrist.side
+        self._grid_view = None
+        if self.evaluation is not None:
+            self.evaluation.remove(self.current_player.id, action)
+
+
+# Environnements disponibles (Dodo, Gopher) pour chaque représentation de la grille
+BACKENDS: dict[str, tuple[type[Environment], type[Environment]]] = {
+    "dict": (GameDodo, GameGopher),
+    "bitboard": (BitboardDodo, BitboardGopher),
+}
@@ -1,5 +1,11 @@
 """" Exemples de Grid """
 
+from Game_playing.bitboard import BACKENDS
+from Game_playing.structures_classes import (ALL_DIRECTIONS, DOWN_DIRECTIONS,
+                                             UP_DIRECTIONS, Environment,
+                                             PlayerLocal, convert_grid,
+                                             generate_grid)
+
 GRID = (
     (-1, -1, -1, -1, -1, -1, 0, 0, 2, 0, 0, 0, 0),
     (-1, -1, -1, -1, -1, 0, 0, 2, 0, 0, 0, 0, 0),
@@ -77,3 +83,30 @@ INIT_GRID3 = (
     (1, 1, 1, 0, -1),
     (1, 1, 1, -1, -1),
 )
+
+
+# Grilles initiales de Dodo disponibles selon la taille
+DODO_GRIDS = {3: INIT_GRID3, 4: INIT_GRID4, 7: INIT_GRID}
+
+
+def build_environment(
+    game: str, hex_size: int, backend: str = "dict", player_id: int = 1
+) -> Environment:
+    """
+    Fonction créant un environnement de jeu en position initiale (joueur 1 au trait)
+    player_id : joueur max de l'environnement
+    """
+    dodo_class, gopher_class = BACKENDS[backend]
+    if game == "Dodo":
+        grid = convert_grid(DODO_GRIDS[hex_size], hex_size)
+        first = PlayerLocal(1, UP_DIRECTIONS)
+        second = PlayerLocal(2, DOWN_DIRECTIONS)
+        env_class = dodo_class
+    else:
+        grid = generate_grid(hex_size)
+        first = PlayerLocal(1, ALL_DIRECTIONS)
+        second = PlayerLocal(2, ALL_DIRECTIONS)
+        env_class = gopher_class
+
+    player, opponent = (first, second) if player_id == 1 else (second, first)
+    return env_class(grid, player, opponent, first, hex_size, 0, 0, grid, game)
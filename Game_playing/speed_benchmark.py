@@ -0,0 +1,67 @@
+""" Module comparant la vitesse des différentes représentations de la grille """
+
+import argparse
+import random
+import time
+
+from Game_playing.bitboard import BACKENDS
+from Game_playing.grid import build_environment
+from Game_playing.structures_classes import Environment
+
+
+def random_playouts(env: Environment, duration: float) -> tuple[int, int, float]:
+    """
+    Fonction jouant des parties aléatoires complètes pendant une durée donnée
+    Retourne le nombre de nœuds joués, le nombre de parties et le temps écoulé
+    """
+    nodes = 0
+    games = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        stack = []
+        while env.final() == 0:
+            action = random.choice(env.legals(env.current_player))
+            stack.append(action)
+            env.play(action)
+        nodes += len(stack)
+        games += 1
+        while stack:
+            env.reverse_action(stack.pop())
+    return nodes, games, time.perf_counter() - start
+
+
+def compare_backends(game: str, hex_size: int, duration: float) -> dict[str, float]:
+    """
+    Fonction affichant et retournant le nombre de nœuds par seconde de chaque backend
+    """
+    results = {}
+    for backend in BACKENDS:
+        random.seed(0)
+        env = build_environment(game, hex_size, backend)
+        nodes, games, elapsed = random_playouts(env, duration)
+        results[backend] = nodes / elapsed
+        print(f"{game} taille {hex_size} [{backend}] : {nodes / elapsed:.0f} nœuds/s "
+              f"({games} parties en {elapsed:.1f}s)")
+    reference = results["dict"]
+    for backend, speed in results.items():
+        print(f"  {backend}: x{speed / reference:.2f}")
+    return results
+
+
+def main():
+    """Lancement du benchmark depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        description="Compare the speed of the board backends"
+    )
+    parser.add_argument("game", choices=["dodo", "gopher"])
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0,
+                        help="Duration of each measure (default: 5)")
+    args = parser.parse_args()
+
+    game = "Dodo" if args.game == "dodo" else "Gopher"
+    compare_backends(game, args.size, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
 """ Module regroupant l'ensemble des structures de données utilisées """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Union
 from collections import namedtuple
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
 import Game_playing.hexagonal_board as hexa
+from Game_playing.zobrist import compute_hash, zobrist_keys
 
 # Types de base utilisés par l'arbitre
 
@@ -69,6 +71,26 @@ class Environment(ABC):
     current_round: int
     precedent_state: GridDict
     game: str
+    # Positions des pions de chaque joueur, créées par les environnements
+    # (tenues à jour par play et reverse_action, reconstruites par load_grid)
+    max_positions: MaxPositionsCr = field(init=False, repr=False, compare=False)
+    min_positions: MinPositionsCr = field(init=False, repr=False, compare=False)
+
+    # Requêtes mémorisées (voir both_legals et mobility) : hash de la position pour laquelle
+    # le résultat a été calculé. Le hash change à chaque play, reverse_action ou load_grid,
+    # les résultats sont donc conservés jusqu'au prochain coup joué ou annulé.
+    legals_hash = None
+    mobility_hash = None
+    cached_legals: tuple[list[Action], list[Action]] = field(
+        default_factory=lambda: ([], []), init=False, repr=False, compare=False
+    )
+    cached_mobility: tuple[int, int] = field(
+        default=(0, 0), init=False, repr=False, compare=False
+    )
+
+    # Évaluation incrémentale attachée à l'environnement (voir Strategies/evaluation.py) :
+    # play, reverse_action et load_grid lui transmettent les cases modifiées
+    evaluation = None
 
     @abstractmethod
     def legals(self, player: PlayerLocal) -> list[Action]:
@@ -94,6 +116,143 @@ class Environment(ABC):
         Fonction annulant un coup pour un joueur donné
         """
 
+    def legal_count(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le nombre de coups légaux d'un joueur
+        (les environnements la redéfinissent pour compter sans construire la liste)
+        """
+        return len(self.legals(player))
+
+    def any_legal(self, player: PlayerLocal) -> bool:
+        """
+        Fonction indiquant si un joueur a au moins un coup légal
+        (les environnements la redéfinissent pour s'arrêter au premier coup trouvé)
+        """
+        return bool(self.legals(player))
+
+    def pair_legals(self) -> tuple[list[Action], list[Action]]:
+        """
+        Fonction calculant les coups légaux des deux joueurs (max, min)
+        (les environnements la redéfinissent pour ne parcourir la grille qu'une fois)
+        """
+        return self.legals(self.max_player), self.legals(self.min_player)
+
+    def both_legals(self) -> tuple[list[Action], list[Action]]:
+        """
+        Fonction retournant les coups légaux des deux joueurs (max, min)
+        Les listes sont mémorisées pour la position courante et ne doivent pas être modifiées
+        """
+        if self.legals_hash != self.hash:
+            self.cached_legals = self.pair_legals()
+            self.legals_hash = self.hash
+        return self.cached_legals
+
+    def mobility(self) -> tuple[int, int]:
+        """
+        Fonction retournant le nombre de coups légaux des deux joueurs (max, min),
+        mémorisé pour la position courante
+        """
+        if self.mobility_hash != self.hash:
+            if self.legals_hash == self.hash:
+                max_legals, min_legals = self.cached_legals
+                self.cached_mobility = len(max_legals), len(min_legals)
+            else:
+                self.cached_mobility = (self.legal_count(self.max_player),
+                                        self.legal_count(self.min_player))
+            self.mobility_hash = self.hash
+        return self.cached_mobility
+
+    def has_legal(self, player: PlayerLocal) -> bool:
+        """
+        Fonction indiquant si un joueur a au moins un coup légal
+        (réutilise les coups ou la mobilité déjà mémorisés pour la position courante)
+        """
+        index = 0 if player.id == self.max_player.id else 1
+        if self.legals_hash == self.hash:
+            return bool(self.cached_legals[index])
+        if self.mobility_hash == self.hash:
+            return self.cached_mobility[index] > 0
+        return self.any_legal(player)
+
+    def load_grid(self, grid: GridDict):
+        """
+        Fonction remplaçant la grille et reconstruisant les positions des joueurs
+        ainsi que le hash de Zobrist de la position (joueur au trait compris)
+        """
+        self.grid = grid
+        self.max_positions.positions.clear()
+        self.min_positions.positions.clear()
+
+        for cell in self.grid:
+            if self.grid[cell] == self.max_player.id:
+                self.max_positions.positions[cell] = self.max_player.id
+            elif self.grid[cell] == self.min_player.id:
+                self.min_positions.positions[cell] = self.min_player.id
+
+        self.hash = self.compute_hash()
+        if self.evaluation is not None:
+            self.evaluation.load(self)
+
+    def compute_hash(self) -> int:
+        """
+        Fonction calculant entièrement le hash de Zobrist de la position
+        (le hash courant est mis à jour par play et reverse_action)
+        """
+        return compute_hash(self.grid, self.current_player.id, self.hex_size)
+
+    def check_consistency(self):
+        """
+        Fonction vérifiant que les structures maintenues par play et reverse_action
+        (positions des joueurs, hash) correspondent à la grille
+        Lève une AssertionError en cas d'incohérence
+        """
+        for player, positions in (
+            (self.max_player, self.max_positions.positions),
+            (self.min_player, self.min_positions.positions),
+        ):
+            expected = {cell for cell, value in self.grid.items() if value == player.id}
+            if set(positions) != expected:
+                raise AssertionError(
+                    f"Positions du joueur {player.id} incohérentes avec la grille: "
+                    f"{sorted(set(positions) ^ expected)}"
+                )
+        if self.hash != self.compute_hash():
+            raise AssertionError("Hash de Zobrist incohérent avec la grille")
+
+
+# Tables des cases atteignables pour une taille de grille et un ensemble de directions
+@lru_cache(maxsize=None)
+def forward_table(
+    hex_size: int, directions: tuple[tuple[int, int], ...]
+) -> dict[Cell, tuple[Cell, ...]]:
+    """
+    Fonction retournant, pour chaque case, les cases atteignables en un coup
+    selon un ensemble de directions (calculée une seule fois par taille)
+    """
+    grid = generate_grid(hex_size)
+    return {
+        cell: tuple(
+            target for target in hexa.neighbor_gopher(cell[0], cell[1], list(directions))
+            if target in grid
+        )
+        for cell in grid
+    }
+
+
+@lru_cache(maxsize=None)
+def backward_table(
+    hex_size: int, directions: tuple[tuple[int, int], ...]
+) -> dict[Cell, tuple[Cell, ...]]:
+    """
+    Fonction retournant, pour chaque case, les cases depuis lesquelles un pion
+    peut l'atteindre en un coup selon un ensemble de directions
+    """
+    table: dict[Cell, list[Cell]] = {cell: [] for cell in generate_grid(hex_size)}
+    for cell, targets in forward_table(hex_size, directions).items():
+        for target in targets:
+            table[target].append(cell)
+    return {cell: tuple(sources) for cell, sources in table.items()}
+
 
 # DataClass Game Dodo
 
@@ -118,23 +277,137 @@ class GameDodo(Environment):
         self.precedent_state = self.grid.copy()
         self.one_line = False
 
+        # Mode debug : vérifie les coups légaux incrémentaux contre un parcours complet
+        self.check_legals = False
+
+        # Clés de Zobrist de la taille de grille
+        self.zobrist = zobrist_keys(self.hex_size)
+
+        # Tables des cases atteignables (et des cases de départ) de chaque joueur
+        self.forward = {
+            player.id: forward_table(self.hex_size, tuple(player.directions))
+            for player in (self.max_player, self.min_player)
+        }
+        self.backward = {
+            player.id: backward_table(self.hex_size, tuple(player.directions))
+            for player in (self.max_player, self.min_player)
+        }
+
         self.max_positions = MaxPositionsCr(player=self.max_player, positions={})
         self.min_positions = MinPositionsCr(player=self.min_player, positions={})
+        self.load_grid(self.grid)
 
-        self.max_positions.positions.clear()
-        self.min_positions.positions.clear()
+    def load_grid(self, grid: GridDict):
+        """
+        Fonction remplaçant la grille et reconstruisant les positions des joueurs
+        et la liste des coups de chaque pion
+        """
+        super().load_grid(grid)
+
+        # Cases libres atteignables par chaque pion (seuls les pions non bloqués sont stockés)
+        # et nombre total de coups de chaque joueur
+        self.moves: dict[int, dict[Cell, list[Cell]]] = {
+            self.max_player.id: {}, self.min_player.id: {}
+        }
+        self.move_count: dict[int, int] = {self.max_player.id: 0, self.min_player.id: 0}
+        for positions in (self.max_positions.positions, self.min_positions.positions):
+            for position, player_id in positions.items():
+                self._update_moves(player_id, position)
+
+    def _update_moves(self, player_id: int, position: Cell):
+        """
+        Fonction recalculant les cases atteignables par un pion
+        """
+        targets = [target for target in self.forward[player_id][position]
+                   if self.grid[target] == EMPTY]
+        self.move_count[player_id] += len(targets) - len(self.moves[player_id].get(position, ()))
+        if targets:
+            self.moves[player_id][position] = targets
+        else:
+            self.moves[player_id].pop(position, None)
 
-        for cell in self.grid:
-            if self.grid[cell] == self.max_player.id:
-                self.max_positions.positions[cell] = self.max_player.id
-            elif self.grid[cell] == self.min_player.id:
-                self.min_positions.positions[cell] = self.min_player.id
+    def _move_piece(self, player_id: int, start: Cell, end: Cell):
+        """
+        Fonction déplaçant un pion et mettant à jour les coups des pions concernés :
+        le pion déplacé et les pions dont une case atteignable a été libérée ou occupée
+        """
+        self.grid[end] = player_id
+        self.grid[start] = EMPTY
+        keys = self.zobrist.cells[player_id]
+        self.hash ^= keys[start] ^ keys[end]
+        if self.evaluation is not None:
+            self.evaluation.move(player_id, start, end)
+
+        if player_id == self.max_player.id:
+            del self.max_positions.positions[start]
+            self.max_positions.positions[end] = player_id
+        else:
+            del self.min_positions.positions[start]
+            self.min_positions.positions[end] = player_id
+
+        self.move_count[player_id] -= len(self.moves[player_id].pop(start, ()))
+        self._update_moves(player_id, end)
+
+        for other_id, backward in self.backward.items():
+            for cell in (start, end):
+                for source in backward[cell]:
+                    if self.grid[source] == other_id:
+                        self._update_moves(other_id, source)
 
     # Fonction retournant les actions possibles d'un joueur pour un état donné (voir optimisation)
     def legals(self, player: PlayerLocal) -> list[ActionDodo]:
         """
         Fonction retournant les actions possibles d'un joueur pour un état donné
         """
+        result = [
+            (position, target)
+            for position, targets in self.moves[player.id].items()
+            for target in targets
+        ]
+        if self.check_legals:
+            expected = self.legals_full_scan(player)
+            if set(result) != set(expected):
+                raise AssertionError(
+                    f"Coups légaux incrémentaux incohérents pour le joueur {player.id}: "
+                    f"{sorted(result)} au lieu de {sorted(expected)}"
+                )
+        return result
+
+    def legal_count(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le nombre de coups légaux d'un joueur (tenu à jour par les coups)
+        """
+        return self.move_count[player.id]
+
+    def any_legal(self, player: PlayerLocal) -> bool:
+        """
+        Fonction indiquant si un joueur a au moins un coup légal (un pion non bloqué)
+        """
+        return bool(self.moves[player.id])
+
+    def movable_count(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le nombre de pions non bloqués d'un joueur
+        """
+        return len(self.moves[player.id])
+
+    def check_consistency(self):
+        """
+        Fonction vérifiant les positions, le hash et les coups maintenus de chaque joueur
+        """
+        super().check_consistency()
+        for player in (self.max_player, self.min_player):
+            expected = self.legals_full_scan(player)
+            if set(self.legals(player)) != set(expected):
+                raise AssertionError(f"Coups du joueur {player.id} incohérents avec la grille")
+            if self.move_count[player.id] != len(expected):
+                raise AssertionError(f"Nombre de coups du joueur {player.id} incohérent")
+
+    def legals_full_scan(self, player: PlayerLocal) -> list[ActionDodo]:
+        """
+        Fonction calculant les actions possibles d'un joueur en parcourant tous ses pions
+        (référence pour le mode debug)
+        """
         actions: Dict[ActionDodo, Any] = {}
 
         if player.id == self.max_positions.player.id:
@@ -161,9 +434,9 @@ class GameDodo(Environment):
         Fonction retournant le score si nous sommes dans un état final (fin de partie)
         """
 
-        if not self.legals(self.max_positions.player):
+        if not self.moves[self.max_player.id]:
             return 1
-        if not self.legals(self.min_positions.player):
+        if not self.moves[self.min_player.id]:
             return -1
         return 0
 
@@ -172,17 +445,8 @@ class GameDodo(Environment):
         Fonction jouant un coup pour un joueur donné
         """
 
-        # Mise à jour de la grille
-        self.grid[action[1]] = self.current_player.id
-        self.grid[action[0]] = 0
-
-        # Mise à jour des positions des joueurs
-        if self.current_player.id == self.max_positions.player.id:
-            del self.max_positions.positions[action[0]]
-            self.max_positions.positions[action[1]] = self.current_player.id
-        else:
-            del self.min_positions.positions[action[0]]
-            self.min_positions.positions[action[1]] = self.current_player.id
+        # Mise à jour de la grille, des positions et des coups des joueurs
+        self._move_piece(self.current_player.id, action[0], action[1])
 
         # Changement de joueur
         self.current_player = (
@@ -190,6 +454,7 @@ class GameDodo(Environment):
             if self.current_player == self.max_player
             else self.max_player
         )
+        self.hash ^= self.zobrist.side
 
     def reverse_action(self, action: ActionDodo):
         """
@@ -201,42 +466,35 @@ class GameDodo(Environment):
             if self.current_player == self.max_player
             else self.max_player
         )
+        self.hash ^= self.zobrist.side
 
-        # Mise à jour de la grille
-        self.grid[action[0]] = self.current_player.id
-        self.grid[action[1]] = EMPTY
-
-        # Mise à jour des positions des joueurs
-        if self.current_player.id == self.min_positions.player.id:
-            self.min_positions.positions.pop(action[1])
-            self.min_positions.positions[action[0]] = self.min_positions.player.id
-        else:
-            self.max_positions.positions.pop(action[1])
-            self.max_positions.positions[action[0]] = self.max_positions.player.id
+        # Mise à jour de la grille, des positions et des coups des joueurs
+        self._move_piece(self.current_player.id, action[1], action[0])
 
     def reverse_action_player(self, action: ActionDodo, _: PlayerLocal):
         """
         Fonction annulant un coup pour un joueur donné
         """
 
-        # Mise à jour de la grille
-        self.grid[action[0]] = self.current_player.id
-        self.grid[action[1]] = EMPTY
-
-        # Mise à jour des positions des joueurs
-        if self.current_player.id == self.max_positions.player.id:
-            self.min_positions.positions.pop(action[1])
-            self.min_positions.positions[action[0]] = self.min_positions.player.id
-        else:
-            self.max_positions.positions.pop(action[1])
-            self.max_positions.positions[action[0]] = self.max_positions.player.id
+        # Le coup annulé est celui de l'adversaire du joueur courant
+        opponent = self.min_player if self.current_player == self.max_player else self.max_player
+        self._move_piece(opponent.id, action[1], action[0])
 
         # Changement de joueur
-        self.current_player = (
-            self.min_player
-            if self.current_player == self.max_player
-            else self.max_player
-        )
+        self.current_player = opponent
+        self.hash ^= self.zobrist.side
+
+
+def gopher_final(env: Environment) -> int:
+    """
+    Fonction retournant le score d'une position de Gopher (point de vue max) :
+    le joueur au trait qui n'a plus de coup légal a perdu (GameGopher et BitboardGopher)
+    """
+    if env.current_player.id == env.max_player.id and not env.has_legal(env.max_player):
+        return -1
+    if env.current_player.id == env.min_player.id and not env.has_legal(env.min_player):
+        return 1
+    return 0
 
 
 @dataclass
@@ -268,18 +526,93 @@ class GameGopher(Environment):
                     l.append(neighbor)
             self.neighbor_dict[cell] = l
 
+        # Mode debug : vérifie les coups légaux incrémentaux contre un parcours complet
+        self.check_legals = False
+
+        # Clés de Zobrist de la taille de grille
+        self.zobrist = zobrist_keys(self.hex_size)
+
         self.max_positions = MaxPositionsCr(player=self.max_player, positions={})
         self.min_positions = MinPositionsCr(player=self.min_player, positions={})
-        self.max_positions.positions.clear()
-        self.min_positions.positions.clear()
+        self.load_grid(self.grid)
 
-        for cell in self.grid:
-            if self.grid[cell] == self.max_player.id:
-                self.max_positions.positions[cell] = self.max_player.id
-            elif self.grid[cell] == self.min_player.id:
-                self.min_positions.positions[cell] = self.min_player.id
+    def load_grid(self, grid: GridDict):
+        """
+        Fonction remplaçant la grille et reconstruisant les positions des joueurs,
+        les compteurs de voisins et les cases jouables de chaque joueur
+        """
+        super().load_grid(grid)
+
+        # Nombre de voisins de chaque joueur pour chaque case
+        self.neighbor_count: dict[int, dict[Cell, int]] = {
+            self.max_player.id: {cell: 0 for cell in self.grid},
+            self.min_player.id: {cell: 0 for cell in self.grid},
+        }
+        for cell, value in self.grid.items():
+            if value in self.neighbor_count:
+                for neighbor in self.neighbor_dict[cell]:
+                    self.neighbor_count[value][neighbor] += 1
+
+        # Cases jouables de chaque joueur (hors premier coup)
+        max_count = self.neighbor_count[self.max_player.id]
+        min_count = self.neighbor_count[self.min_player.id]
+        self.playable: dict[int, set[Cell]] = {
+            self.max_player.id: {
+                cell for cell in self.grid
+                if self.grid[cell] == EMPTY and max_count[cell] == 0 and min_count[cell] == 1
+            },
+            self.min_player.id: {
+                cell for cell in self.grid
+                if self.grid[cell] == EMPTY and min_count[cell] == 0 and max_count[cell] == 1
+            },
+        }
 
     def legals(self, player: PlayerLocal) -> list[ActionGopher]:
+        if (
+                len(self.max_positions.positions) == 0
+                and len(self.min_positions.positions) == 0
+        ):
+            return list(self.grid)
+
+        result = list(self.playable[player.id])
+        if self.check_legals:
+            expected = self.legals_full_scan(player)
+            if set(result) != set(expected):
+                raise AssertionError(
+                    f"Coups légaux incrémentaux incohérents pour le joueur {player.id}: "
+                    f"{sorted(result)} au lieu de {sorted(expected)}"
+                )
+        return result
+
+    def legal_count(self, player: PlayerLocal) -> int:
+        """
+        Fonction retournant le nombre de coups légaux d'un joueur (cases jouables)
+        """
+        if not self.max_positions.positions and not self.min_positions.positions:
+            return len(self.grid)
+        return len(self.playable[player.id])
+
+    def any_legal(self, player: PlayerLocal) -> bool:
+        """
+        Fonction indiquant si un joueur a au moins une case jouable
+        """
+        return bool(self.playable[player.id]) or \
+            not self.max_positions.positions and not self.min_positions.positions
+
+    def check_consistency(self):
+        """
+        Fonction vérifiant les positions, le hash et les cases jouables de chaque joueur
+        """
+        super().check_consistency()
+        for player in (self.max_player, self.min_player):
+            if set(self.legals(player)) != set(self.legals_full_scan(player)):
+                raise AssertionError(f"Coups du joueur {player.id} incohérents avec la grille")
+
+    def legals_full_scan(self, player: PlayerLocal) -> list[ActionGopher]:
+        """
+        Fonction calculant les actions possibles d'un joueur en parcourant toute la grille
+        (référence pour le mode debug)
+        """
         result: list[ActionGopher] = []
 
         if (
@@ -325,13 +658,7 @@ class GameGopher(Environment):
         """
         Fonction retournant le score si nous sommes dans un état final (fin de partie)
         """
-        if not self.legals(self.max_positions.player) and \
-            self.max_positions.player.id == self.current_player.id:
-            return -1
-        if not self.legals(self.min_positions.player) and \
-            self.min_positions.player.id == self.current_player.id:
-            return 1
-        return 0
+        return gopher_final(self)
 
     def play(self, action: ActionGopher):
         """
@@ -345,8 +672,30 @@ class GameGopher(Environment):
         # Mise à jour des positions des joueurs
         if self.current_player.id == self.max_player.id:
             self.max_positions.positions[action] = self.current_player.id
+            opponent_id = self.min_player.id
         else:
             self.min_positions.positions[action] = self.current_player.id
+            opponent_id = self.max_player.id
+
+        self.hash ^= self.zobrist.cells[self.current_player.id][action]
+        if self.evaluation is not None:
+            self.evaluation.place(self.current_player.id, action)
+
+        # Mise à jour des cases jouables autour du pion posé
+        own_count = self.neighbor_count[self.current_player.id]
+        opponent_count = self.neighbor_count[opponent_id]
+        own_playable = self.playable[self.current_player.id]
+        opponent_playable = self.playable[opponent_id]
+        own_playable.discard(action)
+        opponent_playable.discard(action)
+        for neighbor in self.neighbor_dict[action]:
+            count = own_count[neighbor] + 1
+            own_count[neighbor] = count
+            own_playable.discard(neighbor)
+            if count == 1 and opponent_count[neighbor] == 0 and self.grid[neighbor] == EMPTY:
+                opponent_playable.add(neighbor)
+            else:
+                opponent_playable.discard(neighbor)
 
         # Changement de joueur
         self.current_player = (
@@ -354,6 +703,7 @@ class GameGopher(Environment):
             if self.current_player == self.max_player
             else self.max_player
         )
+        self.hash ^= self.zobrist.side
 
     def reverse_action(self, action: ActionGopher):
         """
@@ -366,6 +716,7 @@ class GameGopher(Environment):
             if self.current_player == self.max_player
             else self.max_player
         )
+        self.hash ^= self.zobrist.side
 
         # Mise à jour de la grille
         self.grid[action] = 0
@@ -373,20 +724,124 @@ class GameGopher(Environment):
         # Mise à jour des positions des joueurs
         if self.current_player.id == self.min_positions.player.id:
             self.min_positions.positions.pop(action)
+            opponent_id = self.max_player.id
         else:
             self.max_positions.positions.pop(action)
+            opponent_id = self.min_player.id
+
+        self.hash ^= self.zobrist.cells[self.current_player.id][action]
+        if self.evaluation is not None:
+            self.evaluation.remove(self.current_player.id, action)
+
+        # Mise à jour des cases jouables autour du pion retiré
+        own_count = self.neighbor_count[self.current_player.id]
+        opponent_count = self.neighbor_count[opponent_id]
+        own_playable = self.playable[self.current_player.id]
+        opponent_playable = self.playable[opponent_id]
+        for neighbor in self.neighbor_dict[action]:
+            count = own_count[neighbor] - 1
+            own_count[neighbor] = count
+            if self.grid[neighbor] != EMPTY:
+                continue
+            if count == 0 and opponent_count[neighbor] == 1:
+                own_playable.add(neighbor)
+            if count == 1 and opponent_count[neighbor] == 0:
+                opponent_playable.add(neighbor)
+            else:
+                opponent_playable.discard(neighbor)
+        if own_count[action] == 0 and opponent_count[action] == 1:
+            own_playable.add(action)
+        if opponent_count[action] == 0 and own_count[action] == 1:
+            opponent_playable.add(action)
 
 
 Strategy = Callable[[Environment, PlayerLocal, GridDict, dict], Action]
 
 
+# Encodage compact des actions en entiers (tables de transposition, arbres compacts)
+NO_ACTION = -1
+CELL_OFFSET = 32  # décalage rendant les coordonnées positives (6 bits par coordonnée)
+
+
+def encode_cell(cell: Cell) -> int:
+    """
+    Fonction encodant une case sur 12 bits
+    """
+    return (cell[0] + CELL_OFFSET) << 6 | (cell[1] + CELL_OFFSET)
+
+
+def decode_cell(code: int) -> Cell:
+    """
+    Fonction décodant une case encodée par encode_cell
+    """
+    return (code >> 6) - CELL_OFFSET, (code & 0x3F) - CELL_OFFSET
+
+
+def encode_action(action: Action | None) -> int:
+    """
+    Fonction encodant une action (Gopher : 12 bits, Dodo : 1 bit de type + 24 bits)
+    """
+    if action is None:
+        return NO_ACTION
+    if isinstance(action[0], tuple):
+        return 1 << 24 | encode_cell(action[0]) << 12 | encode_cell(action[1])
+    return encode_cell(action)
+
+
+def decode_action(code: int) -> Action | None:
+    """
+    Fonction décodant une action encodée par encode_action
+    """
+    if code < 0:
+        return None
+    if code >> 24:
+        return decode_cell(code >> 12 & 0xFFF), decode_cell(code & 0xFFF)
+    return decode_cell(code)
+
+
+# Copie transmissible d'un environnement à un autre processus (pickle) :
+# classe de l'environnement et arguments de son constructeur
+EnvSnapshot = tuple
+
+
+def snapshot_env(env: Environment) -> EnvSnapshot:
+    """
+    Fonction retournant une copie sérialisable d'un environnement
+    (les positions des joueurs et les structures incrémentales sont reconstruites
+    par restore_env)
+    """
+    return (
+        type(env),
+        dict(env.grid),
+        env.max_player,
+        env.min_player,
+        env.current_player.id,
+        env.hex_size,
+        env.total_time,
+        env.current_round,
+        dict(env.precedent_state),
+        env.game,
+    )
+
+
+def restore_env(snapshot: EnvSnapshot) -> Environment:
+    """
+    Fonction reconstruisant un environnement à partir de snapshot_env
+    """
+    (env_class, grid, max_player, min_player, current_player_id,
+     hex_size, total_time, current_round, precedent_state, game) = snapshot
+    current_player = max_player if current_player_id == max_player.id else min_player
+    return env_class(grid, max_player, min_player, current_player, hex_size,
+                     total_time, current_round, precedent_state, game)
+
+
 def generate_grid(t: int) -> GridDict:
     """
     Fonction permettant de créer une nouvelle grille vide
     """
     grid: GridDict = {}
     for r in range(t-1, -(t-1) - 1, -1):
-        for q in range(min((t-1), r + (t-1)), max(-(t-1), r - (t-1)) + 1):
+        for q in range(max(-(t-1), r - (t-1)), min((t-1), r + (t-1)) + 1):
             grid[(q, r)] = EMPTY
     return grid
 
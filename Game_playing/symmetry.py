@@ -0,0 +1,219 @@
+""" Module concernant les symétries de la grille hexagonale (positions canoniques) """
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from Game_playing.bitboard import board_tables
+from Game_playing.structures_classes import Action, Cell, Environment
+from Game_playing.zobrist import zobrist_keys
+
+MASK_64 = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class Symmetry:
+    """
+    Classe représentant une symétrie de la grille : rotation de rotations × 60°,
+    précédée de la réflexion (q, r) -> (r, q) si reflected, avec échange des couleurs
+    des pions (et du joueur au trait) si swap_colours
+    permutation[i] : indice de l'image de la case d'indice i (ordre de board_tables)
+    """
+
+    rotations: int
+    reflected: bool
+    swap_colours: bool
+    permutation: tuple[int, ...]
+
+
+def transform_cell(cell: Cell, rotations: int, reflected: bool) -> Cell:
+    """
+    Fonction retournant l'image d'une case par une réflexion éventuelle suivie de rotations
+    En coordonnées cubiques (x, y, z) = (q, r - q, -r), la rotation de 60° est
+    (x, y, z) -> (-z, -x, -y), soit (q, r) -> (r, r - q)
+    """
+    q, r = cell
+    if reflected:
+        q, r = r, q
+    for _ in range(rotations):
+        q, r = r, r - q
+    return q, r
+
+
+@lru_cache(maxsize=None)
+def symmetries(game: str, hex_size: int, colour_swap: bool = True) -> tuple[Symmetry, ...]:
+    """
+    Fonction retournant les symétries d'un jeu pour une taille de grille (l'identité en premier)
+    Gopher : les 12 symétries de l'hexagone (6 rotations, avec ou sans réflexion)
+    Dodo : l'identité et la réflexion (q, r) -> (r, q), qui conservent les directions
+    de chaque joueur, et si colour_swap la rotation de 180° et sa composée avec la réflexion,
+    qui échangent les directions des deux joueurs et donc leurs couleurs
+    """
+    tables = board_tables(hex_size)
+    if game == "Dodo":
+        elements = [(0, False, False), (0, True, False)]
+        if colour_swap:
+            elements += [(3, False, True), (3, True, True)]
+    else:
+        elements = [(rotations, reflected, False)
+                    for reflected in (False, True) for rotations in range(6)]
+
+    return tuple(
+        Symmetry(
+            rotations, reflected, swap_colours,
+            tuple(tables.index[transform_cell(cell, rotations, reflected)]
+                  for cell in tables.cells),
+        )
+        for rotations, reflected, swap_colours in elements
+    )
+
+
+def transform_action(action: Action, symmetry: Symmetry, hex_size: int) -> Action:
+    """
+    Fonction retournant l'image d'une action (case ou déplacement) par une symétrie
+    """
+    cells = board_tables(hex_size).cells
+    index = board_tables(hex_size).index
+    if isinstance(action[0], tuple):
+        return tuple(cells[symmetry.permutation[index[cell]]] for cell in action)
+    return cells[symmetry.permutation[index[action]]]
+
+
+def inverse_action(action: Action, symmetry: Symmetry, hex_size: int) -> Action:
+    """
+    Fonction retournant l'antécédent d'une action par une symétrie
+    """
+    tables = board_tables(hex_size)
+    inverse = {image: i for i, image in enumerate(symmetry.permutation)}
+    if isinstance(action[0], tuple):
+        return tuple(tables.cells[inverse[tables.index[cell]]] for cell in action)
+    return tables.cells[inverse[tables.index[action]]]
+
+
+@dataclass(frozen=True)
+class WideKeys:
+    """
+    Classe regroupant les clés de Zobrist « larges » d'un ensemble de symétries :
+    le mot de 64 bits de rang s d'une clé est la clé de Zobrist de l'image de la case
+    (et de la couleur) par la symétrie s. Un seul XOR met donc à jour les hash
+    de toutes les positions symétriques à la fois.
+    """
+
+    symmetries: tuple[Symmetry, ...]
+    cells: dict[int, dict[Cell, int]]
+    side: int
+    swapped: int  # mots des symétries échangeant les couleurs (joueur au trait inversé)
+
+
+@lru_cache(maxsize=None)
+def wide_keys(game: str, hex_size: int, colour_swap: bool = True) -> WideKeys:
+    """
+    Fonction retournant les clés larges d'un jeu et d'une taille de grille
+    """
+    group = symmetries(game, hex_size, colour_swap)
+    tables = board_tables(hex_size)
+    keys = zobrist_keys(hex_size)
+
+    cells: dict[int, dict[Cell, int]] = {1: {}, 2: {}}
+    for player_id in (1, 2):
+        for i, cell in enumerate(tables.cells):
+            wide = 0
+            for lane, symmetry in enumerate(group):
+                colour = 3 - player_id if symmetry.swap_colours else player_id
+                image = tables.cells[symmetry.permutation[i]]
+                wide |= keys.cells[colour][image] << (64 * lane)
+            cells[player_id][cell] = wide
+
+    side = 0
+    swapped = 0
+    for lane, symmetry in enumerate(group):
+        side |= keys.side << (64 * lane)
+        if symmetry.swap_colours:
+            swapped |= keys.side << (64 * lane)
+    return WideKeys(group, cells, side, swapped)
+
+
+class SymmetricHash:
+    """
+    Classe maintenant incrémentalement le hash de Zobrist de toutes les images
+    d'une position par les symétries du jeu
+
+    Le hash de rang 0 (identité) est égal à env.hash. La clé canonique est le plus petit
+    des hash : deux positions symétriques ont la même clé canonique.
+    """
+
+    def __init__(self, env: Environment, colour_swap: bool = True):
+        self.hex_size = env.hex_size
+        self.keys = wide_keys(env.game, env.hex_size, colour_swap)
+        self.lanes = len(self.keys.symmetries)
+        self.load(env)
+
+    def load(self, env: Environment):
+        """
+        Fonction calculant entièrement les hash de la position de l'environnement
+        """
+        wide = 0
+        for cell, value in env.grid.items():
+            if value in self.keys.cells:
+                wide ^= self.keys.cells[value][cell]
+        if env.current_player.id == 2:
+            wide ^= self.keys.side
+        self.wide = wide ^ self.keys.swapped
+
+    def apply(self, action: Action, player_id: int):
+        """
+        Fonction mettant à jour les hash après un coup de player_id (ou son annulation)
+        """
+        cells = self.keys.cells[player_id]
+        if isinstance(action[0], tuple):
+            self.wide ^= cells[action[0]] ^ cells[action[1]] ^ self.keys.side
+        else:
+            self.wide ^= cells[action] ^ self.keys.side
+
+    def lane(self, index: int) -> int:
+        """
+        Fonction retournant le hash de l'image de la position par la symétrie de rang index
+        """
+        return self.wide >> (64 * index) & MASK_64
+
+    def canonical(self) -> tuple[int, Symmetry]:
+        """
+        Fonction retournant la clé canonique et la symétrie menant à la position canonique
+        """
+        best = 0
+        best_key = self.wide & MASK_64
+        for index in range(1, self.lanes):
+            key = self.wide >> (64 * index) & MASK_64
+            if key < best_key:
+                best, best_key = index, key
+        return best_key, self.keys.symmetries[best]
+
+
+def canonical_key(env: Environment, colour_swap: bool = True) -> tuple[int, Symmetry]:
+    """
+    Fonction calculant la clé canonique d'une position (sans suivi incrémental)
+    """
+    return SymmetricHash(env, colour_swap).canonical()
+
+
+def unique_actions(env: Environment, actions: list[Action]) -> list[Action]:
+    """
+    Fonction retournant un représentant de chaque classe d'actions équivalentes :
+    deux actions sont équivalentes si une symétrie laissant la position invariante
+    envoie l'une sur l'autre (grille vide de Gopher : une action sur douze environ)
+    """
+    tracker = SymmetricHash(env, colour_swap=False)
+    stabilizer = [symmetry for index, symmetry in enumerate(tracker.keys.symmetries)
+                  if index > 0 and tracker.lane(index) == env.hash]
+    if not stabilizer:
+        return actions
+
+    seen: set[Action] = set()
+    result = []
+    for action in actions:
+        if action in seen:
+            continue
+        result.append(action)
+        seen.add(action)
+        for symmetry in stabilizer:
+            seen.add(transform_action(action, symmetry, env.hex_size))
+    return result
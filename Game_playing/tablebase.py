@@ -0,0 +1,271 @@
+""" Module concernant les tables de finales (tablebases) de Gopher sur les petites grilles """
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from Game_playing.batch_simulator import neighbor_indices
+from Game_playing.bitboard import board_tables
+from Game_playing.structures_classes import (ALL_DIRECTIONS, EMPTY, Action,
+                                             Environment)
+
+# Identifiants des joueurs sur la grille (le rouge commence)
+RED = 1
+BLUE = 2
+
+# Fichiers des tables : tablebases/gopher_<taille>.tb à la racine du dépôt (non versionnés)
+TABLEBASE_DIR = Path(__file__).resolve().parent.parent / "tablebases"
+
+# En-tête du fichier : signature, taille de la grille, nombre d'enregistrements
+MAGIC = b"GTB1"
+HEADER = struct.Struct("<4sIQ")
+
+# Clé d'une position : la grille lue comme un nombre en base 3 (case i : chiffre de rang i).
+# Chaque enregistrement est un entier de 64 bits (clé << 1 | victoire du joueur au trait)
+# et le fichier est trié par clé ; la clé doit donc tenir sur 63 bits (40 cases au plus)
+MAX_CELLS = 40
+
+# Nombre de positions traitées à la fois par le générateur (mémoire des masques NumPy)
+CHUNK = 200_000
+
+# Tables ouvertes (None : pas de fichier pour cette taille), par taille de grille
+TABLEBASES: dict[int, "Tablebase | None"] = {}
+
+
+def tablebase_path(hex_size: int) -> Path:
+    """
+    Fonction retournant le chemin du fichier de la table d'une taille de grille
+    """
+    return TABLEBASE_DIR / f"gopher_{hex_size}.tb"
+
+
+@lru_cache(maxsize=None)
+def powers_of_three(cells: int) -> tuple[int, ...]:
+    """
+    Fonction retournant les puissances de 3 associées à chaque case
+    """
+    return tuple(3**i for i in range(cells))
+
+
+def grid_key(env: Environment) -> int:
+    """
+    Fonction retournant la clé (base 3) de la grille d'un environnement
+    """
+    grid = env.grid
+    key = 0
+    for cell, power in zip(board_tables(env.hex_size).cells, powers_of_three(len(grid))):
+        key += grid[cell] * power
+    return key
+
+
+class Tablebase:
+    """
+    Classe représentant une table de finales ouverte avec mmap
+
+    Le fichier est projeté en mémoire et consulté par recherche dichotomique
+    directement dans la projection : l'ouverture est instantanée et aucune copie
+    n'est faite. Le joueur au trait est déduit du nombre de pions (le rouge commence).
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self.memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.hex_size, self.count = HEADER.unpack_from(self.memory)
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas une table de finales Gopher")
+        self.records = memoryview(self.memory)[HEADER.size:].cast("Q")
+        self.powers = powers_of_three(len(board_tables(self.hex_size).cells))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def probe(self, key: int) -> int | None:
+        """
+        Fonction retournant 1 si le joueur au trait gagne, 0 s'il perd
+        et None si la position n'est pas dans la table
+        """
+        low, high = 0, self.count
+        target = key << 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.records[middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.records[low] >> 1 == key:
+            return self.records[low] & 1
+        return None
+
+    def best_action(self, env: Environment) -> Action | None:
+        """
+        Fonction retournant un coup gagnant pour le joueur au trait
+        (None si la position est perdue ou absente de la table)
+        """
+        if env.hex_size != self.hex_size:
+            return None
+        key = grid_key(env)
+        if self.probe(key) != 1:
+            return None
+
+        index = board_tables(env.hex_size).index
+        mover = env.current_player.id
+        for action in env.legals(env.current_player):
+            if self.probe(key + mover * self.powers[index[action]]) == 0:
+                return action
+        return None
+
+    def close(self):
+        """
+        Fonction fermant la projection du fichier
+        """
+        self.records.release()
+        self.memory.close()
+
+
+def get_tablebase(hex_size: int) -> Tablebase | None:
+    """
+    Fonction retournant la table de finales d'une taille de grille (ouverte à la première
+    utilisation) ou None si elle n'a pas été générée
+    """
+    if hex_size not in TABLEBASES:
+        path = tablebase_path(hex_size)
+        TABLEBASES[hex_size] = Tablebase(path) if path.exists() else None
+    return TABLEBASES[hex_size]
+
+
+def decode_boards(keys: np.ndarray, cells: int) -> np.ndarray:
+    """
+    Fonction retournant les grilles (K, cases + 1) de clés en base 3
+    (la dernière colonne représente l'extérieur de la grille)
+    """
+    boards = np.zeros((len(keys), cells + 1), dtype=np.int8)
+    rest = keys.copy()
+    for i in range(cells):
+        boards[:, i] = rest % 3
+        rest //= 3
+    return boards
+
+
+def legal_moves(boards: np.ndarray, neighbors: np.ndarray, mover: int) -> np.ndarray:
+    """
+    Fonction retournant le masque (K, cases) des coups légaux du joueur au trait :
+    case vide, voisine d'exactement un pion adverse et d'aucun pion ami
+    """
+    cells = boards[:, :-1]
+    opponent = BLUE if mover == RED else RED
+    own_adjacent = (boards == mover)[:, neighbors].any(axis=2)
+    opponent_adjacent = (boards == opponent)[:, neighbors].sum(axis=2)
+    legal = (cells == EMPTY) & ~own_adjacent & (opponent_adjacent == 1)
+    legal[(cells == EMPTY).all(axis=1)] = True
+    return legal
+
+
+def children(
+    keys: np.ndarray, neighbors: np.ndarray, powers: np.ndarray, mover: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Fonction retournant les positions atteintes par chaque coup légal :
+    indice de la position de départ et clé de la position atteinte
+    """
+    boards = decode_boards(keys, len(powers))
+    rows, cols = np.nonzero(legal_moves(boards, neighbors, mover))
+    return rows, keys[rows] + np.uint64(mover) * powers[cols]
+
+
+def generate(hex_size: int, verbose: bool = True) -> np.ndarray:
+    """
+    Fonction résolvant Gopher sur une grille par analyse rétrograde
+    Les positions atteignables sont énumérées couche par couche (nombre de pions),
+    puis les couches sont résolues de la dernière à la première : une position est gagnée
+    pour le joueur au trait si l'un de ses coups mène à une position perdue pour l'adversaire
+    (une position sans coup légal est perdue).
+    Retourne les enregistrements triés (clé << 1 | victoire du joueur au trait)
+    """
+    cells = len(board_tables(hex_size).cells)
+    if cells > MAX_CELLS:
+        raise ValueError(f"Grille trop grande pour une table de finales ({cells} cases)")
+    neighbors = neighbor_indices(hex_size, tuple(tuple(d) for d in ALL_DIRECTIONS))
+    powers = np.array(powers_of_three(cells), dtype=np.uint64)
+    start = time.time()
+
+    # Énumération en avant des positions atteignables
+    layers = [np.zeros(1, dtype=np.uint64)]
+    while len(layers[-1]) > 0:
+        mover = RED if len(layers) % 2 == 1 else BLUE
+        keys = layers[-1]
+        reached = [
+            np.unique(children(keys[i:i + CHUNK], neighbors, powers, mover)[1])
+            for i in range(0, len(keys), CHUNK)
+        ]
+        layers.append(np.unique(np.concatenate(reached)))
+        if verbose:
+            print(f"couche {len(layers) - 1} : {len(layers[-1])} positions "
+                  f"({time.time() - start:.1f}s)")
+    layers.pop()
+
+    # Résolution rétrograde, de la couche la plus pleine à la position initiale
+    wins = [np.zeros(0, dtype=bool)] * len(layers)
+    for depth in range(len(layers) - 1, -1, -1):
+        mover = RED if depth % 2 == 0 else BLUE
+        keys = layers[depth]
+        result = np.zeros(len(keys), dtype=bool)
+        for i in range(0, len(keys), CHUNK):
+            rows, reached = children(keys[i:i + CHUNK], neighbors, powers, mover)
+            if len(rows) == 0:
+                continue
+            following = layers[depth + 1]
+            lost = ~wins[depth + 1][np.searchsorted(following, reached)]
+            result[i:i + CHUNK] = np.bincount(rows, weights=lost,
+                                              minlength=min(CHUNK, len(keys) - i)) > 0
+        wins[depth] = result
+        if verbose:
+            print(f"couche {depth} résolue : {result.mean():.1%} de victoires "
+                  f"({time.time() - start:.1f}s)")
+
+    records = np.concatenate([
+        keys << np.uint64(1) | won.astype(np.uint64) for keys, won in zip(layers, wins)
+    ])
+    records.sort()
+    return records
+
+
+def write_tablebase(hex_size: int, records: np.ndarray, path: Path):
+    """
+    Fonction écrivant une table de finales (en-tête puis enregistrements triés)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, hex_size, len(records)))
+        records.astype("<u8").tofile(file)
+    os.replace(temporary, path)
+
+
+def main():
+    """Génération des tables de finales depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        description="Solve Gopher on small boards and write the endgame tablebases"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 4],
+                        help="Board sizes to solve (default: 3 4)")
+    parser.add_argument("--output", type=Path, default=TABLEBASE_DIR,
+                        help="Directory of the tablebase files (default: tablebases/)")
+    args = parser.parse_args()
+
+    for hex_size in args.sizes:
+        records = generate(hex_size)
+        path = args.output / tablebase_path(hex_size).name
+        write_tablebase(hex_size, records, path)
+        first_move = "rouge" if records[0] & np.uint64(1) else "bleu"
+        print(f"taille {hex_size} : {len(records)} positions, {path.stat().st_size} octets "
+              f"({path}), le joueur {first_move} gagne")
+
+
+if __name__ == "__main__":
+    main()
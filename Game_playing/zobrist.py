@@ -0,0 +1,51 @@
+""" Module concernant le hachage de Zobrist des positions de jeu """
+
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Graine fixe : les clés (et donc les hash) sont identiques d'une exécution à l'autre
+ZOBRIST_SEED = 20240601
+
+Cell = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class ZobristKeys:
+    """
+    Classe regroupant les clés aléatoires de 64 bits d'une taille de grille
+    cells[player_id][cell] : clé d'un pion du joueur sur la case
+    side : clé ajoutée lorsque le joueur 2 a le trait
+    """
+
+    cells: dict[int, dict[Cell, int]]
+    side: int
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(hex_size: int) -> ZobristKeys:
+    """
+    Fonction retournant les clés de Zobrist d'une taille de grille
+    (toutes les coordonnées du carré englobant l'hexagone reçoivent une clé)
+    """
+    rng = random.Random(ZOBRIST_SEED + hex_size)
+    coordinates = range(-(hex_size - 1), hex_size)
+    cells = {
+        player_id: {(q, r): rng.getrandbits(64) for q in coordinates for r in coordinates}
+        for player_id in (1, 2)
+    }
+    return ZobristKeys(cells, rng.getrandbits(64))
+
+
+def compute_hash(grid: dict[Cell, int], current_player_id: int, hex_size: int) -> int:
+    """
+    Fonction calculant entièrement le hash d'une position (grille et joueur au trait)
+    """
+    keys = zobrist_keys(hex_size)
+    result = 0
+    for cell, value in grid.items():
+        if value in keys.cells:
+            result ^= keys.cells[value][cell]
+    if current_player_id == 2:
+        result ^= keys.side
+    return result
@@ -2,13 +2,20 @@
 
 import argparse
 import ast
+import time
 
 from Game_playing.hexagonal_board import neighbor_gopher
 from Game_playing.structures_classes import (Action, Environment, GridDict,
                                              Score, State, Time)
+from Game_playing.tablebase import get_tablebase
+from Game_playing.zobrist import compute_hash
 
 from Strategies.mcts import MCTS
-from Strategies.strategies import (strategy_first_legal, strategy_minmax,
+from Strategies.mcts_parallel import parallel_search, set_mcts_workers
+from Strategies.opening_book import book_action
+from Strategies.proof_number import WIN, ProofNumberSearch, is_endgame
+from Strategies.strategies import (set_search_workers, set_symmetric_table,
+                                   strategy_first_legal, strategy_minmax,
                                    strategy_random)
 from main import initialize
 
@@ -33,19 +40,11 @@ def reinit(env: Environment, time_left: Time, state: State, player: int):
     grid: GridDict = {}
     for cell in state:
         grid[cell[0]] = cell[1]
-    env.grid = grid
-
-    # Réinitialisation des positions des joueurs
-    env.max_positions.positions.clear()
-    env.min_positions.positions.clear()
-
-    for cell in env.grid:
-        if env.grid[cell] == env.max_player.id:
-            env.max_positions.positions[cell] = env.max_player.id
-        elif env.grid[cell] == env.min_player.id:
-            env.min_positions.positions[cell] = env.min_player.id
 
+    # Réinitialisation de la grille, des positions des joueurs et du hash de la position
     env.current_player = param_player
+    env.load_grid(grid)
+
     env.current_round += 1
     print("Round ", env.current_round)
 
@@ -63,6 +62,65 @@ def copie_action(env: Environment) -> Action:
     return None
 
 
+def find_opponent_move(env: Environment, action: Action) -> Action | None:
+    """
+    Fonction retrouvant le coup de l'adversaire en comparant la nouvelle grille
+    à l'état précédent sur lequel on a joué notre coup action
+    """
+    expected = env.precedent_state.copy()
+    if env.game == "Dodo":
+        expected[action[0]] = 0
+        expected[action[1]] = env.max_player.id
+    else:
+        expected[action] = env.max_player.id
+
+    opponent_id = env.min_player.id
+    appeared = [cell for cell in env.grid
+                if env.grid[cell] == opponent_id and expected[cell] != opponent_id]
+    vanished = [cell for cell in env.grid
+                if expected[cell] == opponent_id and env.grid[cell] != opponent_id]
+
+    if env.game == "Dodo" and len(appeared) == 1 and len(vanished) == 1:
+        return vanished[0], appeared[0]
+    if env.game == "Gopher" and len(appeared) == 1 and not vanished:
+        return appeared[0]
+    return None
+
+
+def game_mcts(env: Environment) -> MCTS:
+    """
+    Fonction retournant le moteur MCTS conservé pendant toute la partie
+    Si sa dernière recherche partait de l'état précédent, la racine est avancée
+    de notre coup et de la réponse de l'adversaire pour réutiliser le sous-arbre
+    """
+    mcts: MCTS | None = getattr(env, "mcts", None)
+    if mcts is None:
+        mcts = MCTS()
+        env.mcts = mcts
+        return mcts
+
+    previous_hash = compute_hash(env.precedent_state, env.max_player.id, env.hex_size)
+    reply = None
+    if mcts.last_action is not None and mcts.root_hash == previous_hash:
+        reply = find_opponent_move(env, mcts.last_action)
+    if reply is None or not mcts.advance([mcts.last_action, reply]):
+        mcts.reset()
+    return mcts
+
+
+def prove_endgame(env: Environment, play_time: Time) -> Action | None:
+    """
+    Fonction cherchant un coup gagnant par df-pn lorsque la fin de partie est proche
+    Retourne None si la position n'est pas prouvée dans le budget (nœuds et temps)
+    """
+    if not is_endgame(env):
+        return None
+    search = ProofNumberSearch(deadline=time.time() + play_time)
+    result, action = search.search(env)
+    print(f"df-pn : résultat {result} ({search.nodes} nœuds)")
+    return action if result == WIN else None
+
+
 def initialize_for_network(
     game: str, state: State, player: int, hex_size: int, total_time: Time
 ) -> Environment:
@@ -163,8 +221,7 @@ def strategy_mcts_network(
     Fonction permettant de jouer un coup avec l'algorithme MCTS (Monte Carlo Tree Search)
     """
     env = reinit(env, time_left, state, player)
-    mcts = MCTS()
-    action = mcts.search(env, 300)
+    action = parallel_search(env, 300)
     return env, action
 
 
@@ -176,6 +233,12 @@ def strategy_dodo(
     """
     # Réinitialisation de l'environnement
     env = reinit(env, time_left, state, player)
+
+    # Position du livre d'ouvertures : coup précalculé, sans recherche
+    action = book_action(env)
+    if action is not None:
+        return env, action
+
     # Calcul du temps de jeu en fonction du nombre de tours restants (voir article ReadMe)
     if env.hex_size in (6, 7):
         play_time = time_left / (100 + max(100 - env.current_round, 0))
@@ -184,9 +247,16 @@ def strategy_dodo(
     print("play_time", play_time)
     print(f"time left {time_left}")
 
-    # Appel de l'algorithme MCTS
-    mcts = MCTS()
-    action = mcts.search(env, round_time=play_time)
+    # Fin de partie : coup gagnant prouvé par df-pn (sinon le temps restant va au MCTS)
+    start_time = time.time()
+    action = prove_endgame(env, play_time / 2)
+    if action is not None:
+        return env, action
+    play_time -= time.time() - start_time
+
+    # Appel de l'algorithme MCTS (parallélisé si plusieurs processus, sinon avec le moteur
+    # de la partie qui réutilise le sous-arbre du coup précédent)
+    action = parallel_search(env, round_time=play_time, engine=game_mcts(env))
 
     return env, action
 
@@ -201,15 +271,31 @@ def strategy_gopher(
     # Réinitialisation de l'environnement
     env = reinit(env, time_left, state, player)
 
+    # Petites grilles résolues : coup gagnant lu dans la table de finales, sans recherche
+    tablebase = get_tablebase(env.hex_size)
+    if tablebase is not None:
+        action = tablebase.best_action(env)
+        if action is not None:
+            return env, action
+
+    # Position du livre d'ouvertures : coup précalculé, sans recherche
+    action = book_action(env)
+    if action is not None:
+        return env, action
+
     # Ouverture déterministe dans un coin
     if env.max_player.id == 1 and (env.current_round in (0, 1)):
         return env, (0, env.hex_size - 1)
 
+    # Fin de partie : coup gagnant prouvé par df-pn
+    action = prove_endgame(env, time_left / (20 + max(33 - env.current_round, 0)))
+    if action is not None:
+        return env, action
+
     # Stratégie de survie si le temps restant est trop faible pour alpha-beta
     if time_left < 25:
         play_time = time_left / (20 + max(33 - env.current_round, 0))
-        mcts = MCTS()
-        action = mcts.search(env, round_time=play_time)
+        action = game_mcts(env).search(env, round_time=play_time)
         return env, action
     if time_left < 3:
         return env, strategy_first_legal(env, env.max_player)
@@ -275,7 +361,18 @@ if __name__ == "__main__":
     parser.add_argument("-s", "--server-url", default="http://localhost:8080/")
     parser.add_argument("-d", "--disable-dodo", action="store_true")
     parser.add_argument("-g", "--disable-gopher", action="store_true")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Number of processes used by the MCTS (default: 1)")
+    parser.add_argument("-p", "--parallel", choices=["root", "tree"], default="root",
+                        help="MCTS parallelization: one tree per process or a shared tree")
+    parser.add_argument("-a", "--search-workers", type=int, default=1,
+                        help="Number of processes used by the alpha-beta (Lazy SMP)")
+    parser.add_argument("-y", "--symmetry", action="store_true",
+                        help="Index the alpha-beta transposition table by canonical keys")
     args = parser.parse_args()
+    set_mcts_workers(args.workers, args.parallel)
+    set_search_workers(args.search_workers)
+    set_symmetric_table(args.symmetry)
 
     available_games = [DODO_STR, GOPHER_STR]
     if args.disable_dodo:
@@ -0,0 +1,151 @@
+""" Module concernant l'évaluation incrémentale des positions """
+
+from functools import lru_cache
+
+from Game_playing.bitboard import board_tables
+from Game_playing.structures_classes import Cell, Environment, PlayerLocal
+
+# Poids des caractéristiques (différence entre le joueur et son adversaire) :
+# - mobility : nombre de coups légaux (à Dodo le joueur qui n'a plus de coup gagne) ;
+# - blocked : nombre de pions bloqués (Dodo) ;
+# - edge : somme des anneaux des pions (0 au centre, taille - 1 au bord de la grille) ;
+# - pieces : nombre de pions (constant à Dodo, à un près à Gopher).
+# L'évaluation reste bien inférieure à WIN_SCORE sur toutes les tailles de grille.
+# Contre l'ancienne évaluation (toujours nulle), seule la mobilité de Gopher gagne des
+# parties (voir le README) : les poids de Dodo restent nuls tant qu'aucun n'est meilleur.
+WEIGHTS: dict[str, dict[str, int]] = {
+    "Dodo": {"mobility": 0, "blocked": 0, "edge": 0, "pieces": 0},
+    "Gopher": {"mobility": 20, "blocked": 0, "edge": 0, "pieces": 0},
+}
+
+# Mode debug : vérifie les accumulateurs contre un calcul complet à chaque évaluation
+CHECK_EVALUATION = False
+
+
+def set_evaluation_check(enabled: bool):
+    """
+    Fonction activant la vérification des accumulateurs de l'évaluation
+    """
+    global CHECK_EVALUATION  # pylint: disable=global-statement
+    CHECK_EVALUATION = enabled
+
+
+@lru_cache(maxsize=None)
+def edge_table(hex_size: int) -> dict[Cell, int]:
+    """
+    Fonction retournant l'anneau de chaque case (distance hexagonale au centre) :
+    0 au centre, hex_size - 1 sur le bord ; l'anneau est invariant par les symétries
+    de la grille, ce qui garde l'évaluation compatible avec les clés canoniques
+    """
+    return {(q, r): max(abs(q), abs(r), abs(q - r)) for q, r in board_tables(hex_size).cells}
+
+
+class IncrementalEvaluation:
+    """
+    Classe représentant l'évaluation incrémentale d'un environnement
+
+    Les accumulateurs des pions (nombre et anneaux) sont mis à jour par play et
+    reverse_action à partir des seules cases modifiées. La mobilité et les pions bloqués
+    sont lus dans les structures incrémentales de l'environnement (coups de chaque pion
+    à Dodo, cases jouables à Gopher) : l'évaluation d'une feuille est en O(1) avec les
+    environnements dict (les bitboards recomptent leurs masques).
+    """
+
+    def __init__(self, env: Environment):
+        self.weights = WEIGHTS[env.game]
+        self.edges = edge_table(env.hex_size)
+        self.pieces: dict[int, int] = {}
+        self.edge: dict[int, int] = {}
+        self.load(env)
+
+    def accumulators(self, env: Environment) -> tuple[dict[int, int], dict[int, int]]:
+        """
+        Fonction calculant entièrement les accumulateurs (nombre de pions, anneaux)
+        """
+        pieces = {env.max_player.id: 0, env.min_player.id: 0}
+        edge = {env.max_player.id: 0, env.min_player.id: 0}
+        for cell, value in env.grid.items():
+            if value in pieces:
+                pieces[value] += 1
+                edge[value] += self.edges[cell]
+        return pieces, edge
+
+    def load(self, env: Environment):
+        """
+        Fonction recalculant les accumulateurs de la position de l'environnement
+        """
+        self.pieces, self.edge = self.accumulators(env)
+
+    def place(self, player_id: int, cell: Cell):
+        """
+        Fonction mettant à jour les accumulateurs après la pose d'un pion (Gopher)
+        """
+        self.pieces[player_id] += 1
+        self.edge[player_id] += self.edges[cell]
+
+    def remove(self, player_id: int, cell: Cell):
+        """
+        Fonction mettant à jour les accumulateurs après le retrait d'un pion (Gopher)
+        """
+        self.pieces[player_id] -= 1
+        self.edge[player_id] -= self.edges[cell]
+
+    def move(self, player_id: int, start: Cell, end: Cell):
+        """
+        Fonction mettant à jour les accumulateurs après le déplacement d'un pion (Dodo)
+        """
+        self.edge[player_id] += self.edges[end] - self.edges[start]
+
+    def score(self, env: Environment, player: PlayerLocal) -> int:
+        """
+        Fonction retournant l'évaluation de la position du point de vue d'un joueur
+        """
+        if CHECK_EVALUATION:
+            self.check(env)
+
+        weights = self.weights
+        max_id = env.max_player.id
+        min_id = env.min_player.id
+        max_moves, min_moves = env.mobility()
+        value = (
+            weights["mobility"] * (max_moves - min_moves)
+            + weights["edge"] * (self.edge[max_id] - self.edge[min_id])
+            + weights["pieces"] * (self.pieces[max_id] - self.pieces[min_id])
+        )
+        if weights["blocked"]:
+            max_blocked = self.pieces[max_id] - env.movable_count(env.max_player)
+            min_blocked = self.pieces[min_id] - env.movable_count(env.min_player)
+            value += weights["blocked"] * (max_blocked - min_blocked)
+        return value if player.id == max_id else -value
+
+    def check(self, env: Environment):
+        """
+        Fonction vérifiant les accumulateurs et les compteurs de l'environnement
+        contre un calcul complet (mode debug)
+        Lève une AssertionError en cas d'incohérence
+        """
+        pieces, edge = self.accumulators(env)
+        if (pieces, edge) != (self.pieces, self.edge):
+            raise AssertionError(
+                f"Accumulateurs de l'évaluation incohérents : pions {self.pieces} au lieu de "
+                f"{pieces}, anneaux {self.edge} au lieu de {edge}"
+            )
+        for player in (env.max_player, env.min_player):
+            legals = env.legals(player)
+            if env.legal_count(player) != len(legals):
+                raise AssertionError(
+                    f"Mobilité du joueur {player.id} incohérente : "
+                    f"{env.legal_count(player)} au lieu de {len(legals)}"
+                )
+            if env.game == "Dodo" and env.movable_count(player) != len({a[0] for a in legals}):
+                raise AssertionError(f"Pions bloqués du joueur {player.id} incohérents")
+
+
+def get_evaluation(env: Environment) -> IncrementalEvaluation:
+    """
+    Fonction retournant l'évaluation incrémentale d'un environnement
+    (attachée à la première utilisation, puis tenue à jour par les coups)
+    """
+    if env.evaluation is None:
+        env.evaluation = IncrementalEvaluation(env)
+    return env.evaluation
@@ -0,0 +1,100 @@
+""" Module concernant la parallélisation de l'alpha-beta (Lazy SMP) """
+
+import atexit
+from multiprocessing.pool import Pool
+from typing import Callable
+
+from Game_playing.structures_classes import (Action, Environment,
+                                             EnvSnapshot, PlayerLocal,
+                                             restore_env, snapshot_env)
+from Strategies.move_ordering import MoveOrdering
+from Strategies.process_pool import PersistentPool
+from Strategies.shared_transposition import SharedTranspositionTable
+
+# Recherche itérative (approfondissement itératif) exécutée par chaque processus :
+# search(env, player, deadline, start_depth=..., table=..., ordering=...)
+# -> (score, coup, profondeur atteinte)
+SearchFunction = Callable[..., tuple[float, Action | None, int]]
+
+SearchResult = tuple[int, float, Action | None]  # profondeur, score, coup
+
+# Pool de processus auxiliaires conservé d'un coup à l'autre, attaché à une table partagée
+POOL = PersistentPool()
+
+# Table partagée ouverte par chaque processus auxiliaire (initialisée par attach_table)
+WORKER_TABLE: SharedTranspositionTable | None = None
+
+
+def attach_table(name: str, size_mb: float):
+    """
+    Fonction exécutée au démarrage de chaque processus auxiliaire : ouverture de la table partagée
+    """
+    global WORKER_TABLE  # pylint: disable=global-statement
+    WORKER_TABLE = SharedTranspositionTable(size_mb, name=name)
+    atexit.register(WORKER_TABLE.close)
+
+
+def get_pool(helpers: int, table: SharedTranspositionTable) -> Pool:
+    """
+    Fonction retournant le pool de processus auxiliaires
+    (recréé uniquement si sa taille ou la table partagée change)
+    """
+    return POOL.get(helpers, key=table.name, initializer=attach_table,
+                    initargs=(table.name, table.size_mb))
+
+
+def smp_worker(task: tuple[SearchFunction, EnvSnapshot, int, float, int, int]) -> SearchResult:
+    """
+    Fonction exécutée par un processus auxiliaire : recherche de la même racine
+    sur sa propre copie de la position, à partir d'une profondeur décalée,
+    en partageant la table de transposition
+    """
+    search, snapshot, player_id, deadline, start_depth, generation = task
+    env = restore_env(snapshot)
+    player = env.max_player if player_id == env.max_player.id else env.min_player
+    WORKER_TABLE.new_search()
+    WORKER_TABLE.generation = generation
+    score, action, depth = search(
+        env, player, deadline, start_depth=start_depth, table=WORKER_TABLE,
+        ordering=MoveOrdering(),
+    )
+    return depth, score, action
+
+
+def lazy_smp_search(
+    env: Environment,
+    player: PlayerLocal,
+    deadline: float,
+    workers: int,
+    table: SharedTranspositionTable,
+    search: SearchFunction,
+    ordering: MoveOrdering | None = None,
+) -> tuple[float, Action | None, int]:
+    """
+    Fonction lançant la recherche de la même racine dans plusieurs processus (Lazy SMP)
+
+    Les processus ne communiquent que par la table de transposition partagée : chacun
+    profite des entrées écrites par les autres (coups et bornes), ce qui désynchronise
+    les recherches et permet d'atteindre une profondeur plus grande dans le même temps.
+    Un processus sur deux commence une profondeur plus loin pour diversifier les arbres.
+    Le processus principal cherche lui aussi ; on retourne le résultat de la recherche
+    complète la plus profonde (score, coup, profondeur), celui du processus principal
+    en cas d'égalité.
+    """
+    helpers = workers - 1
+    pending = None
+    if helpers > 0:
+        snapshot = snapshot_env(env)
+        tasks = [
+            (search, snapshot, player.id, deadline, 1 + i % 2, table.generation)
+            for i in range(1, helpers + 1)
+        ]
+        pending = get_pool(helpers, table).map_async(smp_worker, tasks)
+
+    score, action, depth = search(env, player, deadline, table=table, ordering=ordering)
+
+    if pending is not None:
+        for helper_depth, helper_score, helper_action in pending.get():
+            if helper_action is not None and (action is None or helper_depth > depth):
+                score, action, depth = helper_score, helper_action, helper_depth
+    return score, action, depth
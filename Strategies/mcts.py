@@ -2,10 +2,34 @@
 
 import math
 import random
+import sys
 import time
 from collections import deque
 
-from Game_playing.structures_classes import Action, Environment
+from Game_playing.batch_simulator import BatchSimulator
+from Game_playing.structures_classes import (Action, Environment,
+                                             decode_action, encode_action)
+from Game_playing.symmetry import unique_actions
+from Strategies.mcts_tree import (DEFAULT_MAX_NODES, NO_NODE, ROOT,
+                                  TERMINAL, UNEXPANDED, ArrayTree)
+
+
+# Mode RAVE : nombre de visites d'un enfant pour lequel les statistiques AMAF
+# et les statistiques propres de l'enfant ont le même poids (beta = 1/2)
+RAVE_EQUIVALENCE = 500
+
+
+def expansion(env: Environment) -> tuple[list[Action], int]:
+    """
+    Fonction retournant les coups à développer depuis une position et le résultat
+    de la partie (env.final()) : aucun coup si la partie est finie
+    À Dodo, la partie est aussi finie quand le joueur qui vient de jouer n'a plus de coup,
+    alors que le joueur au trait en a encore : ses coups ne doivent pas être développés
+    """
+    result = env.final()
+    if result != 0:
+        return [], result
+    return env.legals(env.current_player), 0
 
 
 # tree node class definition
@@ -18,11 +42,9 @@ class TreeNode:
         # initialisation de l'environnement
         self.env = env
 
-        # initialisation de l'état terminal ou non
-        if not self.env.legals(self.env.current_player):
-            self.is_terminal = True
-        else:
-            self.is_terminal = False
+        # initialisation des actions non explorées et de l'état terminal ou non
+        self.unexplored_actions, result = expansion(self.env)
+        self.is_terminal = not self.unexplored_actions
 
         # initialisation du flag indiquant si le nœud est complètement développé
         self.is_fully_expanded = self.is_terminal
@@ -35,7 +57,13 @@ class TreeNode:
         self.score = 0
         # initialisation des enfants du nœud
         self.children: list[TreeNode] = []
-        self.unexplored_actions = self.env.legals(self.env.current_player)
+        # valeur prouvée du nœud du point de vue du joueur max (MCTS-Solver) :
+        # 1 partie gagnée, -1 partie perdue, 0 valeur inconnue
+        self.max_to_move = self.env.current_player.id == self.env.max_player.id
+        self.proven = result if self.is_terminal else 0
+        # statistiques AMAF (mode RAVE) des actions jouées ensuite par le joueur au trait :
+        # action -> [visites, score]
+        self.amaf: dict[Action, list[float]] = {}
 
 
 class MCTS:
@@ -45,29 +73,68 @@ class MCTS:
     Ajouter les sources :
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        check_invariants: bool = False,
+        tree_store: str = "nodes",
+        max_nodes: int = DEFAULT_MAX_NODES,
+        playouts_per_leaf: int = 1,
+        solver: bool = True,
+        rave: bool = False,
+        rave_equivalence: int = RAVE_EQUIVALENCE,
+        rollout_cutoff: int | None = None,
+        cutoff_threshold: float | None = None,
+        symmetry: bool = True,
+    ):
         self.root = None
-
-    # reinitialisation des positions des joueurs
-    def reinit_pos(self, env: Environment):
+        # Mode debug : vérifie après chaque simulation que l'environnement est revenu
+        # à la position de la racine et que ses structures incrémentales sont cohérentes
+        self.check_invariants = check_invariants
+        # Stockage de l'arbre : objets TreeNode ("nodes") ou tableaux compacts ("arrays")
+        self.tree_store = tree_store
+        self.max_nodes = max_nodes
+        self.tree: ArrayTree | None = None
+        # Nombre de simulations de la dernière recherche
+        self.simulations = 0
+        # Nombre de parties aléatoires jouées depuis chaque feuille : au-delà de 1,
+        # elles sont simulées ensemble par le simulateur vectorisé (BatchSimulator)
+        self.playouts_per_leaf = playouts_per_leaf
+        self.simulator: BatchSimulator | None = None
+        # MCTS-Solver (arbre "nodes") : les victoires et défaites certaines sont propagées
+        # vers la racine, les enfants prouvés ne sont plus explorés et la recherche
+        # s'arrête dès que la racine est prouvée
+        self.solver = solver
+        # RAVE (arbre "nodes") : la sélection mélange UCB1 et les statistiques AMAF
+        # (all-moves-as-first) avec beta = sqrt(k / (3 n + k))
+        self.rave = rave
+        self.rave_equivalence = rave_equivalence
+        self.last_playout: list[Action] = []
+        # Simulations tronquées : arrêt après rollout_cutoff coups ou dès que l'évaluation
+        # statique dépasse cutoff_threshold en valeur absolue (score = évaluation statique)
+        self.rollout_cutoff = rollout_cutoff
+        self.cutoff_threshold = cutoff_threshold
+        # Racine symétrique (grille vide de Gopher...) : un seul coup par classe
+        # de coups symétriques est exploré
+        self.symmetry = symmetry
+        # Réutilisation de l'arbre d'un coup à l'autre (voir advance) : hash de la racine
+        # et action retournée par la dernière recherche
+        self.reuse = False
+        self.root_hash: int | None = None
+        self.last_action: Action | None = None
+
+    def check_simulation(self, env: Environment, root_hash: int):
         """
-        Méthode permettant de réinitialiser les positions des joueurs
+        Méthode vérifiant l'environnement après une simulation (mode check_invariants)
+        play et reverse_action maintiennent les positions : aucune reconstruction n'est faite
         """
-
-        env.max_positions.positions.clear()
-        env.min_positions.positions.clear()
-        for cell in env.grid:
-            if env.grid[cell] == env.max_player.id:
-                env.max_positions.positions[cell] = env.max_player.id
-            elif env.grid[cell] == env.min_player.id:
-                env.min_positions.positions[cell] = env.min_player.id
+        if env.hash != root_hash:
+            raise AssertionError("L'environnement n'est pas revenu à la position de la racine")
+        env.check_consistency()
 
     def expand(self, node: TreeNode):
         """
         Méthode d'expansion qui permet d'ajouter un enfant à un nœud donné
         """
-        self.reinit_pos(node.env)
-
         action: Action = (
             node.unexplored_actions.pop()
         )  # on récupère une action enfant non explorée
@@ -77,10 +144,6 @@ class MCTS:
         )  # on crée un nouveau nœud enfant
         node.env.reverse_action(action)  # on annule l'action
 
-        # reinitialisation des positions des joueurs
-        self.reinit_pos(child.env)
-        self.reinit_pos(node.env)
-
         if child not in node.children:
             node.children.append(child)
 
@@ -93,23 +156,42 @@ class MCTS:
         """
 
         i = 0
-        self.reinit_pos(param_env)
+        truncated = self.rollout_cutoff is not None or self.cutoff_threshold is not None
+        evaluation = None
 
         # Création d'une pile pour stocker les actions effectuées
         stack: deque = deque()
 
         # Tant que la partie n'est pas terminée on joue des coups aléatoires
-        while param_env.legals(param_env.max_player) and param_env.legals(
-                param_env.min_player
-        ):
+        while True:
+            max_legals, min_legals = param_env.both_legals()
+            if not max_legals or not min_legals:
+                break
+
+            # Arrêt anticipé de la simulation (nombre de coups ou évaluation décisive)
+            if truncated:
+                evaluation = self.static_evaluation(param_env, len(max_legals), len(min_legals))
+                if (self.rollout_cutoff is not None and i >= self.rollout_cutoff) or (
+                    self.cutoff_threshold is not None
+                    and abs(evaluation) >= self.cutoff_threshold
+                ):
+                    break
+                evaluation = None
+
             i += 1
-            action: Action = random.choice(param_env.legals(param_env.current_player))
+            action: Action = random.choice(
+                max_legals if param_env.current_player.id == param_env.max_player.id
+                else min_legals
+            )
             stack.append(action)
             param_env.play(action)
 
-        score: int = (
-            param_env.final()
-        )  # on récupère le score final de la partie (-1, 1)
+        # on récupère le score final de la partie (-1, 1) ou l'évaluation statique
+        score: float = param_env.final() if evaluation is None else evaluation
+
+        # on conserve les actions de la partie simulée pour les statistiques AMAF
+        if self.rave:
+            self.last_playout = list(stack)
 
         # on annule les actions effectuées pour revenir à l'état initial
         while len(stack) > 0:
@@ -118,7 +200,27 @@ class MCTS:
 
         return score
 
-    def backpropagate(self, node: TreeNode, score: int):
+    def static_evaluation(self, env: Environment, max_moves: int, min_moves: int) -> float:
+        """
+        Méthode retournant une évaluation rapide de la position entre -1 et 1 (point de vue max)
+        à partir de la mobilité des joueurs : à Dodo le joueur qui a le moins de coups
+        se rapproche de la victoire, à Gopher c'est celui qui en a le plus
+        """
+        balance = (max_moves - min_moves) / (max_moves + min_moves)
+        return -balance if env.game == "Dodo" else balance
+
+    def evaluate(self, env: Environment) -> tuple[float, int]:
+        """
+        Méthode évaluant une feuille : somme des scores et nombre de parties simulées
+        (une partie avec rollout ou playouts_per_leaf parties avec le simulateur vectorisé)
+        """
+        if self.playouts_per_leaf <= 1:
+            return self.rollout(env), 1
+        self.last_playout = []  # les parties vectorisées ne conservent pas leurs actions
+        scores = self.simulator.rollouts(env, self.playouts_per_leaf)
+        return float(scores.sum()), self.playouts_per_leaf
+
+    def backpropagate(self, node: TreeNode, score: float, visits: int = 1):
         """
         Méthode de backpropagation
         qui permet de remonter les visites et les scores jusqu'au nœud racine
@@ -127,27 +229,94 @@ class MCTS:
         # on remonte les visites et les scores jusqu'au nœud racine
         while node is not None:
             # update node's visits
-            node.visits += 1
+            node.visits += visits
             # update node's score
             node.score += score
             # set node to parent
             node = node.parent
 
+    def update_amaf(self, node: TreeNode, tree_actions: list[Action], score: float):
+        """
+        Méthode mettant à jour les statistiques AMAF (mode RAVE) des nœuds de la descente :
+        chaque nœud crédite la première occurrence des actions jouées ensuite (dans l'arbre
+        puis dans la partie simulée) par le joueur qui a le trait dans ce nœud
+        """
+        path: list[TreeNode] = []
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+
+        # Seules les positions réellement jouées (racine puis une par action de la descente)
+        # sont mises à jour
+        actions = list(tree_actions) + self.last_playout
+        for depth, current in enumerate(path[:len(tree_actions) + 1]):
+            seen = set()
+            for action in actions[depth::2]:
+                if action in seen:
+                    continue
+                seen.add(action)
+                statistics = current.amaf.setdefault(action, [0, 0.0])
+                statistics[0] += 1
+                statistics[1] += score
+
+    def propagate_proof(self, node: TreeNode):
+        """
+        Méthode remontant les valeurs prouvées (MCTS-Solver) à partir du parent d'un nœud prouvé :
+        un nœud est gagné pour le joueur qui a le trait si un de ses enfants l'est, et perdu
+        si tous ses coups ont été développés et que tous ses enfants sont perdus
+        """
+        while node is not None and not node.proven:
+            good = 1 if node.max_to_move else -1
+            proven = [child.proven for child in node.children]
+            if good in proven:
+                node.proven = good
+            elif not node.unexplored_actions and all(value == -good for value in proven):
+                node.proven = -good
+            else:
+                return
+            node = node.parent
+
     def get_best_move(self, param_node: TreeNode, exploration_constant=math.sqrt(2)):
         """
         Méthode qui permet de sélectionner le meilleur enfant en fonction de la formule UCB1
         """
 
+        # les enfants dont la valeur est prouvée ne sont plus explorés (MCTS-Solver)
+        children = param_node.children
+        if self.solver:
+            children = [child for child in children if not child.proven] or children
+
         # calcul des poids des enfants
-        choices_weights = [
-            (child.score / child.visits)
-            + exploration_constant
-            * math.sqrt((math.log(param_node.visits) / child.visits))
-            for child in param_node.children
-        ]
+        if self.rave:
+            choices_weights = [
+                self.rave_value(param_node, child)
+                + exploration_constant
+                * math.sqrt((math.log(param_node.visits) / child.visits))
+                for child in children
+            ]
+        else:
+            choices_weights = [
+                (child.score / child.visits)
+                + exploration_constant
+                * math.sqrt((math.log(param_node.visits) / child.visits))
+                for child in children
+            ]
 
         # retourner l'enfant avec le poids le plus élevé
-        return param_node.children[choices_weights.index(max(choices_weights))]
+        return children[choices_weights.index(max(choices_weights))]
+
+    def rave_value(self, node: TreeNode, child: TreeNode) -> float:
+        """
+        Méthode retournant la valeur d'un enfant mélangeant son score moyen et le score AMAF
+        de son action dans le nœud parent (poids beta décroissant avec les visites de l'enfant)
+        """
+        value = child.score / child.visits
+        statistics = node.amaf.get(child.parent_action)
+        if not statistics:
+            return value
+        beta = math.sqrt(self.rave_equivalence / (3 * child.visits + self.rave_equivalence))
+        return (1 - beta) * value + beta * statistics[1] / statistics[0]
 
     def select(self, node: TreeNode):
         """
@@ -160,7 +329,6 @@ class MCTS:
             deque()
         )  # on crée une pile pour stocker les actions effectuées
         current_node: TreeNode = node  # on initialise le nœud actuel
-        self.reinit_pos(current_node.env)
 
         # Tant que le nœud actuel n'est pas terminal on sélectionne le meilleur enfant
         while not current_node.is_terminal:
@@ -174,8 +342,6 @@ class MCTS:
             stack.append(current_node.parent_action)
             node.env.play(current_node.parent_action)
 
-            self.reinit_pos(current_node.env)
-
         return current_node, stack
 
     def get_most_winning(self, node: TreeNode):
@@ -187,8 +353,17 @@ class MCTS:
         max_score = -float("inf")
         best_node = None
 
+        # MCTS-Solver : un coup prouvé gagnant est joué, les coups prouvés perdants sont évités
+        children = node.children
+        if self.solver:
+            good = 1 if node.max_to_move else -1
+            winning = [child for child in children if child.proven == good]
+            if winning:
+                return max(winning, key=lambda child: child.visits)
+            children = [child for child in children if child.proven != -good] or children
+
         # on parcourt les enfants du nœud actuel et on retourne le meilleur enfant
-        for child in node.children:
+        for child in children:
             score = child.score / child.visits
             if score > max_score:
                 max_score = score
@@ -203,72 +378,323 @@ class MCTS:
 
         return (n * (time_left / time_spent) * 1.1) < (visits_best - visits_second_best)
 
+    def within_budget(self, n: int, nb_simulations: int, round_time, start_time: float) -> bool:
+        """
+        Méthode indiquant si la recherche peut continuer : nb_simulations simulations
+        si round_time est None, sinon jusqu'à ce que round_time secondes soient écoulées
+        """
+        if round_time is None:
+            return n < nb_simulations
+        return (time.time() - start_time) < round_time
+
+    def stop_early(
+        self, n: int, children_visits: list[int], root_visits: int, round_time, start_time: float
+    ) -> bool:
+        """
+        Méthode appliquant la stratégie STOP (recherche limitée en temps uniquement) à partir
+        des visites des enfants de la racine : le deuxième enfant le plus visité ne peut plus
+        rattraper le premier dans le temps restant
+        """
+        if round_time is None:
+            return False
+        visits = sorted(set(children_visits))
+        visits_best = visits[-1] if visits else 0
+        visits_second_best = visits[-2] if len(visits) > 1 else root_visits
+        time_spent = time.time() - start_time
+        time_left = round_time - time_spent
+        if time_spent > 0 and self.stop(n, time_left, time_spent, visits_best, visits_second_best):
+            print(f"temps économisé: {time_left}")
+            return True
+        return False
+
+    def advance(self, actions: list[Action]) -> bool:
+        """
+        Méthode descendant l'arbre de la dernière recherche le long des actions jouées depuis
+        (notre coup puis la réponse de l'adversaire) : le nœud atteint devient la racine
+        de la prochaine recherche avec ses statistiques et le reste de l'arbre est libéré
+        Retourne False si ce nœud n'a pas été développé (la prochaine recherche repart de zéro)
+        """
+        self.reuse = False
+        if self.tree_store == "arrays":
+            node = ROOT if self.tree is not None else NO_NODE
+            for action in actions:
+                if node == NO_NODE:
+                    break
+                code = encode_action(action)
+                node = next((child for child in self.tree.children(node)
+                             if self.tree.action[child] == code), NO_NODE)
+            self.tree = self.tree.extract(node) if node != NO_NODE else None
+            self.reuse = self.tree is not None
+            return self.reuse
+
+        node = self.root
+        for action in actions:
+            if node is None:
+                break
+            node = next((child for child in node.children if child.parent_action == action), None)
+        self.release(self.root, keep=node)
+        if node is None:
+            self.root = None
+            return False
+        node.parent = None
+        node.parent_action = None
+        self.root = node
+        self.reuse = True
+        return True
+
+    def reset(self):
+        """
+        Méthode libérant l'arbre de la dernière recherche (la prochaine repart de zéro)
+        """
+        self.release(self.root)
+        self.root = None
+        self.tree = None
+        self.reuse = False
+
+    def release(self, root: TreeNode | None, keep: TreeNode | None = None):
+        """
+        Méthode libérant un arbre (sauf le sous-arbre keep) en cassant les références
+        circulaires parent / enfants pour que la mémoire soit rendue immédiatement
+        """
+        stack = [root] if root is not None else []
+        while stack:
+            node = stack.pop()
+            if node is keep:
+                continue
+            stack.extend(node.children)
+            node.children = []
+            node.parent = None
+
     def search(self, initial_state: Environment, nb_simulations=800, round_time=None):
         """
         Méthode principale de l'algorithme MCTS qui permet de rechercher la meilleure action 
         à jouer en fonction de l'état initial select -> expand -> rollout -> backpropagate
+        Après advance, la recherche reprend l'arbre conservé au lieu d'en créer un nouveau
         """
 
-        self.root = TreeNode(initial_state, None)  # création du nœud racine
+        reuse = self.reuse
+        self.reuse = False
+        self.root_hash = initial_state.hash
+        if self.playouts_per_leaf > 1:
+            self.simulator = BatchSimulator(initial_state)
+        if self.tree_store == "arrays":
+            self.last_action = self.search_arrays(initial_state, nb_simulations, round_time, reuse)
+            return self.last_action
+
+        if reuse and self.root.env is initial_state:
+            print(f"arbre réutilisé: {self.root.visits} simulations")
+        else:
+            self.release(self.root)
+            self.root = TreeNode(initial_state, None)  # création du nœud racine
+            if self.symmetry:
+                self.root.unexplored_actions = unique_actions(
+                    initial_state, self.root.unexplored_actions
+                )
         node: TreeNode
         stack: deque[
             Action
         ]  # initialisation de la pile pour stocker les actions effectuées
         start_time = time.time()
         n: int = 0
+        root_hash = initial_state.hash
 
-        # si le temps de simulation est None on effectue un nombre de simulations donné
-        if round_time is None:
-            for _ in range(nb_simulations):
-                n += 1
-                node, stack = self.select(self.root)  # selection d'un nœud (sélection)
+        # nb_simulations simulations si le temps de simulation est None, sinon
+        # des simulations jusqu'à ce que le temps soit écoulé (ou arrêt STOP)
+        while self.within_budget(n, nb_simulations, round_time, start_time):
+            n += 1
+
+            node, stack = self.select(self.root)  # Séléction d'un nœud (sélection)
 
-                score = self.rollout(node.env)  # simulation d'une partie (simulation)
+            score, visits = self.evaluate(node.env)  # Simulation d'une partie (simulation)
+            if self.rave:
+                self.update_amaf(node, stack, score / visits)
 
-                # on annule les actions effectuées pour revenir à l'état initial
-                while len(stack) > 0:
-                    self.root.env.reverse_action(stack.pop())
+            # On annule les actions effectuées pour revenir à l'état initial
+            while len(stack) > 0:
+                self.root.env.reverse_action(stack.pop())
 
-                self.backpropagate(node, score)  # backpropagation des résultats
+            self.backpropagate(node, score, visits)  # Backpropagation des résultats
+            if self.solver and node.proven:
+                self.propagate_proof(node.parent)
 
-                self.reinit_pos(self.root.env)
+            if self.check_invariants:
+                self.check_simulation(self.root.env, root_hash)
+
+            # La racine est prouvée : le résultat ne peut plus changer
+            if self.solver and self.root.proven:
+                if round_time is not None:
+                    print(f"position prouvée ({'gagnée' if self.root.proven > 0 else 'perdue'}),"
+                          f" temps économisé: {round_time - (time.time() - start_time)}")
+                break
+
+            # On vérifie si on peut arrêter la recherche (stratégie STOP)
+            if self.stop_early(n * self.playouts_per_leaf,
+                               [child.visits for child in self.root.children],
+                               self.root.visits, round_time, start_time):
+                break
+
+        if round_time is not None:
+            print(f"nombre de simulations: {n} "
+                  f"({node_bytes_per_node(self.root):.0f} octets/nœud)")
+        self.simulations = n
+
+        # On retourne le nœud enfant avec le meilleur ratio de victoires
+        self.last_action = self.get_most_winning(self.root).parent_action
+        return self.last_action
 
-        # si le temps de simulation est donné
-        # on effectue des simulations jusqu'à ce que le temps soit écoulé
+    def select_array_child(self, tree: ArrayTree, node: int, exploration_constant=math.sqrt(2)):
+        """
+        Méthode retournant le premier enfant non visité d'un nœud de l'arbre compact,
+        ou à défaut l'enfant de meilleur score UCB1
+        """
+        visits = tree.visits
+        scores = tree.scores
+        log_visits = math.log(visits[node]) if visits[node] else 0.0
+        best_child = NO_NODE
+        best_weight = -float("inf")
+        child = tree.first_child[node]
+        while child != NO_NODE:
+            child_visits = visits[child]
+            if child_visits == 0:
+                return child
+            weight = scores[child] / child_visits \
+                + exploration_constant * math.sqrt(log_visits / child_visits)
+            if weight > best_weight:
+                best_weight = weight
+                best_child = child
+            child = tree.next_sibling[child]
+        return best_child
+
+    def node_actions(self, env: Environment, node: int) -> list[int]:
+        """
+        Méthode retournant les actions encodées des enfants d'un nœud de l'ArrayTree
+        (à la racine, une seule action par classe de coups symétriques) ;
+        aucune action si la partie est finie : le nœud est alors marqué terminal
+        """
+        actions, _ = expansion(env)
+        if node == ROOT and self.symmetry:
+            actions = unique_actions(env, actions)
+        return [encode_action(action) for action in actions]
+
+    def descend_array(
+        self, env: Environment, tree: ArrayTree, virtual_loss: float | None = None
+    ) -> tuple[int, list[int]]:
+        """
+        Méthode descendant l'arbre compact depuis la racine (les nœuds non développés
+        sont développés au passage) jusqu'à un nœud jamais visité, terminal ou qui ne peut
+        plus être développé (arbre plein) : les actions sont jouées sur env
+        Avec virtual_loss, chaque nœud parcouru reçoit une visite et perd virtual_loss
+        Retourne le nœud atteint et les actions encodées y menant
+        """
+        node = ROOT
+        path: list[int] = []
+        if virtual_loss is not None:
+            tree.visits[node] += 1
+            tree.scores[node] -= virtual_loss
+        while True:
+            if tree.state[node] == UNEXPANDED and \
+                    not tree.expand(node, self.node_actions(env, node)):
+                break  # arbre plein : simulation depuis ce nœud
+            if tree.state[node] == TERMINAL:
+                break
+            node = self.select_array_child(tree, node)
+            path.append(tree.action[node])
+            env.play(decode_action(tree.action[node]))
+            first_visit = tree.visits[node] == 0
+            if virtual_loss is not None:
+                tree.visits[node] += 1
+                tree.scores[node] -= virtual_loss
+            if first_visit:
+                break
+        return node, path
+
+    def search_arrays(
+        self, initial_state: Environment, nb_simulations=800, round_time=None, reuse=False
+    ):
+        """
+        Variante de search utilisant un arbre stocké dans des tableaux (ArrayTree) :
+        les enfants d'un nœud sont créés en une fois lors de sa première sélection
+        et l'arbre cesse de grandir lorsque max_nodes est atteint
+        """
+        if reuse:
+            tree = self.tree
+            print(f"arbre réutilisé: {tree.visits[ROOT]} simulations")
         else:
-            while (time.time() - start_time) < round_time:
-                n += 1
+            tree = ArrayTree(self.max_nodes)
+            tree.add(NO_NODE)
+        self.tree = tree
+        root = ROOT
+        env = initial_state
+        root_hash = env.hash
+        start_time = time.time()
+        n: int = 0
 
-                node, stack = self.select(self.root)  # Séléction d'un nœud (sélection)
+        while self.within_budget(n, nb_simulations, round_time, start_time):
+            n += 1
 
-                # score current node (simulation phase)
-                score = self.rollout(node.env)  # Simulation d'une partie (simulation)
+            # Sélection (et expansion) d'un nœud
+            node, path = self.descend_array(env, tree)
 
-                # On annule les actions effectuées pour revenir à l'état initial
-                while len(stack) > 0:
-                    self.root.env.reverse_action(stack.pop())
+            score, visits = self.evaluate(env)  # Simulation d'une partie (simulation)
 
-                self.backpropagate(node, score)  # Backpropagation des résultats
+            # On annule les actions effectuées pour revenir à l'état initial
+            for code in reversed(path):
+                env.reverse_action(decode_action(code))
 
-                self.reinit_pos(self.root.env)
+            # Backpropagation des résultats
+            while node != NO_NODE:
+                tree.visits[node] += visits
+                tree.scores[node] += score
+                node = tree.parent[node]
 
-                # Mise à jour des variables pour la stratégie STOP
-                visits_best = max(self.root.children, key=lambda child: child.visits).visits
-                visits_second_best = max(
-                    [child for child in self.root.children if child.visits != visits_best],
-                    key=lambda child: child.visits,
-                    default=self.root
-                ).visits
+            if self.check_invariants:
+                self.check_simulation(env, root_hash)
 
-                # On vérifie si on peut arrêter la recherche STOP
-                time_spent = time.time() - start_time
-                time_left = round_time - time_spent if round_time else 0
-                if time_spent > 0 and \
-                        self.stop(n, time_left, time_spent, visits_best, visits_second_best):
-                    print(f"temps économisé: {time_left}")
-                    break
+            # Stratégie STOP
+            if self.stop_early(n * self.playouts_per_leaf,
+                               [tree.visits[child] for child in tree.children(root)],
+                               tree.visits[root], round_time, start_time):
+                break
 
-            print(f"nombre de simulations: {n}")
+        if round_time is not None:
+            print(f"nombre de simulations: {n} "
+                  f"({len(tree)} nœuds, {tree.bytes_per_node():.0f} octets/nœud)")
+        self.simulations = n
 
-        # On retourne le nœud enfant avec le meilleur ratio de victoires
-        return self.get_most_winning(self.root).parent_action
+        # On retourne l'action de l'enfant avec le meilleur ratio de victoires
+        best_child = max(
+            (child for child in tree.children(root) if tree.visits[child] > 0),
+            key=lambda child: tree.scores[child] / tree.visits[child],
+            default=NO_NODE,
+        )
+        return decode_action(tree.action[best_child]) if best_child != NO_NODE else None
+
+    def root_statistics(self) -> dict[Action, tuple[int, float]]:
+        """
+        Méthode retournant le nombre de visites et le score des enfants de la racine
+        de la dernière recherche
+        """
+        if self.tree_store == "arrays":
+            tree = self.tree
+            return {
+                decode_action(tree.action[child]): (tree.visits[child], tree.scores[child])
+                for child in tree.children(ROOT)
+            }
+        return {child.parent_action: (child.visits, child.score) for child in self.root.children}
+
+
+def node_bytes_per_node(root: TreeNode) -> float:
+    """
+    Fonction estimant la mémoire occupée par nœud d'un arbre d'objets TreeNode
+    (objet, dictionnaire d'attributs et listes d'enfants et d'actions non explorées)
+    """
+    total = 0
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        total += sys.getsizeof(node) + sys.getsizeof(node.__dict__) \
+            + sys.getsizeof(node.children) + sys.getsizeof(node.unexplored_actions)
+        stack.extend(node.children)
+    return total / count
@@ -0,0 +1,259 @@
+""" Module comparant les variantes du MCTS (une sous-commande par comparaison) """
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from Game_playing.grid import DODO_GRIDS, build_environment
+from Game_playing.structures_classes import Action, Environment
+from Strategies.mcts import MCTS, node_bytes_per_node
+from Strategies.mcts_dag import DagMCTS
+from Strategies.mcts_parallel import TreeParallelMCTS
+
+
+def play_match(
+    game: str, hex_size: int, engines: dict[int, Callable[[Environment], Action]]
+) -> int:
+    """
+    Fonction jouant une partie entre deux moteurs (indexés par joueur)
+    Chaque moteur joue dans son propre environnement dont il est le joueur max
+    Retourne le joueur gagnant
+    """
+    envs = {player_id: build_environment(game, hex_size, player_id=player_id)
+            for player_id in engines}
+    referee = envs[1]
+    while referee.final() == 0:
+        player_id = referee.current_player.id
+        action = engines[player_id](envs[player_id])
+        for env in envs.values():
+            env.play(action)
+    return 1 if referee.final() > 0 else 2
+
+
+def compare_mcts_parallel(
+    game: str, hex_size: int, duration: float, cores: list[int], games: int
+) -> dict[int, tuple[float, float]]:
+    """
+    Fonction comparant le MCTS séquentiel et le MCTS à arbre partagé pour chaque nombre
+    de processus : simulations par seconde depuis la position initiale et taux de victoire
+    contre le MCTS séquentiel (duration secondes par coup, couleurs alternées)
+    """
+    def sequential(env: Environment) -> Action:
+        return MCTS().search(env, round_time=duration)
+
+    random.seed(0)
+    mcts = MCTS()
+    start = time.perf_counter()
+    mcts.search(build_environment(game, hex_size), round_time=duration)
+    reference = mcts.simulations / (time.perf_counter() - start)
+
+    results = {}
+    for workers in cores:
+        random.seed(workers)
+        engine = TreeParallelMCTS(workers)
+        start = time.perf_counter()
+        engine.search(build_environment(game, hex_size), round_time=duration)
+        speed = engine.simulations / (time.perf_counter() - start)
+
+        def tree_parallel(env: Environment, engine=engine) -> Action:
+            return engine.search(env, round_time=duration)
+
+        wins = 0
+        for i in range(games):
+            tree_player = 1 + i % 2
+            engines = {tree_player: tree_parallel, 3 - tree_player: sequential}
+            wins += play_match(game, hex_size, engines) == tree_player
+        results[workers] = (speed, wins / games if games else 0.0)
+
+    print(f"{game} taille {hex_size}, {duration}s par coup")
+    print(f"  séquentiel : {reference:.0f} simulations/s")
+    for workers, (speed, win_rate) in results.items():
+        print(f"  arbre partagé, {workers} processus : {speed:.0f} simulations/s "
+              f"(x{speed / reference:.2f}), {win_rate:.0%} de victoires sur {games} parties")
+    return results
+
+
+def tree_size(mcts: MCTS) -> tuple[int, float]:
+    """
+    Fonction retournant le nombre de nœuds et la mémoire totale (octets) de la dernière
+    recherche d'un MCTS (arbre ou graphe)
+    """
+    if isinstance(mcts, DagMCTS):
+        return len(mcts.table), len(mcts.table) * mcts.bytes_per_node()
+    count = 0
+    stack = [mcts.root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count, count * node_bytes_per_node(mcts.root)
+
+
+def compare_mcts_dag(
+    game: str, hex_size: int, budgets: list[int], seeds: int
+) -> dict[str, tuple[float, int, float]]:
+    """
+    Fonction comparant le MCTS sur arbre et le MCTS sur graphe de positions (DagMCTS) :
+    - convergence : plus petit nombre de simulations à partir duquel le coup choisi
+      ne change plus jusqu'au plus grand budget (moyenne sur plusieurs graines)
+    - mémoire : nombre de nœuds et octets occupés avec le plus grand budget
+    """
+    budgets = sorted(budgets)
+    engines: dict[str, Callable[[], MCTS]] = {
+        "arbre": lambda: MCTS(solver=False),
+        "graphe": DagMCTS,
+    }
+    results = {}
+    for name, engine in engines.items():
+        convergence = 0
+        for seed in range(seeds):
+            choices = []
+            for budget in budgets:
+                random.seed(seed)
+                mcts = engine()
+                choices.append(mcts.search(build_environment(game, hex_size), budget))
+            stable = len(budgets) - 1
+            while stable > 0 and choices[stable - 1] == choices[-1]:
+                stable -= 1
+            convergence += budgets[stable]
+        nodes, memory = tree_size(mcts)
+        results[name] = (convergence / seeds, nodes, memory)
+
+    print(f"{game} taille {hex_size}, budgets {budgets}, {seeds} graines")
+    for name, (convergence, nodes, memory) in results.items():
+        print(f"  {name} : convergence en {convergence:.0f} simulations, "
+              f"{nodes} nœuds ({memory / 1024:.0f} Ko) pour {budgets[-1]} simulations")
+    return results
+
+
+def sample_positions(game: str, hex_size: int, count: int) -> list[list[Action]]:
+    """
+    Fonction tirant des positions de test : suites de coups aléatoires de longueurs variées
+    depuis la position initiale (parties non terminées)
+    """
+    env = build_environment(game, hex_size)
+    positions = []
+    while len(positions) < count:
+        actions = []
+        for _ in range(random.randint(0, 4 * hex_size)):
+            legals = env.legals(env.current_player)
+            if not legals or env.final() != 0:
+                break
+            actions.append(random.choice(legals))
+            env.play(actions[-1])
+        if env.final() == 0 and env.legals(env.current_player):
+            positions.append(actions)
+        for action in reversed(actions):
+            env.reverse_action(action)
+    return positions
+
+
+def compare_rollout_cutoffs(
+    game: str, hex_size: int, plies: list[int | None], thresholds: list[float | None],
+    positions: int, rollouts: int,
+) -> dict[tuple[int | None, float | None], tuple[float, float]]:
+    """
+    Fonction mesurant, pour chaque réglage des simulations tronquées (nombre de coups,
+    seuil de l'évaluation statique), le nombre de simulations par seconde et l'écart moyen
+    entre la valeur estimée d'une position et celle estimée par des simulations complètes
+    """
+    random.seed(0)
+    tests = sample_positions(game, hex_size, positions)
+    env = build_environment(game, hex_size)
+
+    def estimate(mcts: MCTS) -> tuple[list[float], float]:
+        values = []
+        start = time.perf_counter()
+        for actions in tests:
+            for action in actions:
+                env.play(action)
+            values.append(sum(mcts.rollout(env) for _ in range(rollouts)) / rollouts)
+            for action in reversed(actions):
+                env.reverse_action(action)
+        return values, len(tests) * rollouts / (time.perf_counter() - start)
+
+    reference, reference_speed = estimate(MCTS())
+    print(f"{game} taille {hex_size}, {len(tests)} positions, {rollouts} simulations par position")
+    print(f"  complètes : {reference_speed:.0f} simulations/s")
+
+    results = {}
+    for ply in plies:
+        for threshold in thresholds:
+            if ply is None and threshold is None:
+                continue
+            values, speed = estimate(MCTS(rollout_cutoff=ply, cutoff_threshold=threshold))
+            error = sum(abs(value - ref) for value, ref in zip(values, reference)) / len(tests)
+            results[(ply, threshold)] = (speed, error)
+            print(f"  coupure {ply} coups, seuil {threshold} : {speed:.0f} simulations/s "
+                  f"(x{speed / reference_speed:.1f}), écart moyen {error:.3f}")
+    return results
+
+
+def optional_number(value: str) -> float | None:
+    """
+    Fonction convertissant un argument numérique de la ligne de commande ("none" : désactivé)
+    """
+    return None if value.lower() == "none" else float(value)
+
+
+def main():
+    """Lancement d'une comparaison depuis la ligne de commande"""
+    position = argparse.ArgumentParser(add_help=False)
+    position.add_argument("game", choices=["dodo", "gopher"])
+    position.add_argument("--size", type=int, default=4, choices=range(3, 11),
+                          help="Size of the initial grid (default: 4, Dodo: 3, 4 or 7)")
+
+    parser = argparse.ArgumentParser(description="Compare variants of the MCTS")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parallel = commands.add_parser(
+        "parallel", parents=[position],
+        help="Compare the tree-parallel MCTS with the sequential MCTS",
+    )
+    parallel.add_argument("--seconds", type=float, default=5.0,
+                          help="Search time per move (default: 5)")
+    parallel.add_argument("--cores", type=int, nargs="+", default=[1, 2, 4, 8],
+                          help="Numbers of processes of the tree-parallel MCTS")
+    parallel.add_argument("--games", type=int, default=10,
+                          help="Games played against the sequential MCTS (default: 10)")
+
+    dag = commands.add_parser(
+        "dag", parents=[position],
+        help="Compare the tree and the transposition-aware (DAG) MCTS",
+    )
+    dag.add_argument("--budgets", type=int, nargs="+", default=[250, 500, 1000, 2000, 4000],
+                     help="Numbers of simulations compared (default: 250 to 4000)")
+    dag.add_argument("--seeds", type=int, default=5,
+                     help="Seeds averaged (default: 5)")
+
+    cutoff = commands.add_parser(
+        "cutoff", parents=[position], help="Compare the truncated rollout settings"
+    )
+    cutoff.add_argument("--plies", type=optional_number, nargs="+", default=[None, 10, 20, 40],
+                        help="Rollout cutoffs in plies (none: no cutoff)")
+    cutoff.add_argument("--thresholds", type=optional_number, nargs="+",
+                        default=[None, 0.5, 0.8],
+                        help="Static evaluation thresholds (none: no threshold)")
+    cutoff.add_argument("--positions", type=int, default=20,
+                        help="Test positions (default: 20)")
+    cutoff.add_argument("--rollouts", type=int, default=50,
+                        help="Rollouts per test position (default: 50)")
+
+    args = parser.parse_args()
+    if args.game == "dodo" and args.size not in DODO_GRIDS:
+        parser.error(f"Dodo is only available on sizes {sorted(DODO_GRIDS)}")
+
+    game = "Dodo" if args.game == "dodo" else "Gopher"
+    if args.command == "parallel":
+        compare_mcts_parallel(game, args.size, args.seconds, args.cores, args.games)
+    elif args.command == "dag":
+        compare_mcts_dag(game, args.size, args.budgets, args.seeds)
+    elif args.command == "cutoff":
+        plies = [None if ply is None else int(ply) for ply in args.plies]
+        compare_rollout_cutoffs(game, args.size, plies, args.thresholds,
+                                args.positions, args.rollouts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+""" Module concernant le MCTS sur un graphe de positions (transpositions partagées) """
+
+import math
+import sys
+import time
+from collections import deque
+
+from Game_playing.structures_classes import Action, Environment
+from Game_playing.symmetry import unique_actions
+from Strategies.mcts import MCTS, expansion
+
+
+class DagNode:
+    """
+    Classe représentant une position du graphe de recherche
+    Les enfants sont les arêtes (action, hash de la position atteinte) : deux suites de coups
+    menant à la même position partagent le même nœud et donc les mêmes statistiques
+    """
+
+    def __init__(self, env: Environment):
+        self.unexplored_actions, _ = expansion(env)
+        self.is_terminal = not self.unexplored_actions
+        self.children: list[tuple[Action, int]] = []
+        self.visits = 0
+        self.score = 0
+
+
+class DagMCTS(MCTS):
+    """
+    Classe représentant un MCTS dont les nœuds sont stockés dans une table indexée
+    par le hash de Zobrist des positions (graphe orienté acyclique au lieu d'un arbre)
+
+    La sélection utilise les statistiques partagées des positions atteintes et la
+    rétropropagation met à jour les nœuds du chemin réellement parcouru.
+
+    Seules les options de MCTS qui s'appliquent au graphe sont acceptées (les autres lèvent
+    un TypeError) : les simulations tronquées (rollout_cutoff, cutoff_threshold) passent par
+    rollout, mais les nœuds sont toujours des DagNode (pas de tree_store ni de max_nodes),
+    sans valeur prouvée (pas de solver), sans statistiques AMAF (pas de rave) et simulés
+    une partie à la fois (pas de playouts_per_leaf).
+    """
+
+    def __init__(
+        self,
+        check_invariants: bool = False,
+        rollout_cutoff: int | None = None,
+        cutoff_threshold: float | None = None,
+        symmetry: bool = True,
+    ):
+        super().__init__(
+            check_invariants=check_invariants,
+            solver=False,
+            rollout_cutoff=rollout_cutoff,
+            cutoff_threshold=cutoff_threshold,
+            symmetry=symmetry,
+        )
+        self.table: dict[int, DagNode] = {}
+
+    def get_best_edge(
+        self, node: DagNode, exploration_constant=math.sqrt(2)
+    ) -> tuple[Action, int]:
+        """
+        Méthode retournant l'arête menant à l'enfant de meilleur score UCB1
+        """
+        log_visits = math.log(node.visits)
+        best_edge = node.children[0]
+        best_weight = -float("inf")
+        for action, key in node.children:
+            child = self.table[key]
+            weight = child.score / child.visits \
+                + exploration_constant * math.sqrt(log_visits / child.visits)
+            if weight > best_weight:
+                best_weight = weight
+                best_edge = (action, key)
+        return best_edge
+
+    def select_path(self, env: Environment) -> tuple[list[DagNode], list[Action]]:
+        """
+        Méthode descendant le graphe depuis la racine jusqu'à une nouvelle position
+        (ou une position terminale) : retourne les nœuds parcourus et les actions jouées
+        """
+        node = self.table[env.hash]
+        path = [node]
+        actions: list[Action] = []
+        while not node.is_terminal:
+            if node.unexplored_actions:
+                action = node.unexplored_actions.pop()
+                env.play(action)
+                key = env.hash
+                child = self.table.get(key)
+                is_new = child is None
+                if is_new:
+                    child = DagNode(env)
+                    self.table[key] = child
+                node.children.append((action, key))
+            else:
+                action, key = self.get_best_edge(node)
+                env.play(action)
+                child = self.table[key]
+                is_new = False
+            actions.append(action)
+            path.append(child)
+            node = child
+            if is_new:
+                break
+        return path, actions
+
+    def search(self, initial_state: Environment, nb_simulations=800, round_time=None):
+        """
+        Méthode principale : sélection d'un chemin, simulation depuis la position atteinte
+        et rétropropagation le long du chemin, jusqu'à épuisement du budget
+        """
+        env = initial_state
+        root_hash = env.hash
+        self.root_hash = root_hash
+        self.table = {root_hash: DagNode(env)}
+        root = self.table[root_hash]
+        if self.symmetry:
+            root.unexplored_actions = unique_actions(env, root.unexplored_actions)
+        stack: deque[Action] = deque()
+        start_time = time.time()
+        n: int = 0
+
+        while self.within_budget(n, nb_simulations, round_time, start_time):
+            n += 1
+
+            path, actions = self.select_path(env)
+            stack.extend(actions)
+
+            score = self.rollout(env)  # Simulation depuis la position atteinte
+
+            # On annule les actions effectuées pour revenir à l'état initial
+            while len(stack) > 0:
+                env.reverse_action(stack.pop())
+
+            # Rétropropagation le long du chemin parcouru
+            for node in path:
+                node.visits += 1
+                node.score += score
+
+            if self.check_invariants:
+                self.check_simulation(env, root_hash)
+
+            # Stratégie STOP
+            if self.stop_early(n, [self.table[key].visits for _, key in root.children],
+                               root.visits, round_time, start_time):
+                break
+
+        if round_time is not None:
+            print(f"nombre de simulations: {n} "
+                  f"({len(self.table)} nœuds, {self.bytes_per_node():.0f} octets/nœud)")
+        self.simulations = n
+
+        # On retourne l'action menant à la position avec le meilleur ratio de victoires
+        statistics = self.root_statistics()
+        self.last_action = max(
+            (action for action, (visits, _) in statistics.items() if visits > 0),
+            key=lambda action: statistics[action][1] / statistics[action][0],
+            default=None,
+        )
+        return self.last_action
+
+    def root_statistics(self) -> dict[Action, tuple[int, float]]:
+        """
+        Méthode retournant le nombre de visites et le score des positions atteintes
+        depuis la racine de la dernière recherche
+        """
+        root = self.table[self.root_hash]
+        return {
+            action: (self.table[key].visits, self.table[key].score)
+            for action, key in root.children
+        }
+
+    def advance(self, actions: list[Action]) -> bool:
+        """
+        Méthode sans réutilisation pour le graphe : la prochaine recherche repart de zéro
+        """
+        self.reset()
+        return False
+
+    def reset(self):
+        super().reset()
+        self.table = {}
+
+    def bytes_per_node(self) -> float:
+        """
+        Fonction estimant la mémoire occupée par nœud (objet, dictionnaire d'attributs,
+        listes d'arêtes et d'actions non explorées et entrée de la table)
+        """
+        if not self.table:
+            return 0.0
+        total = sys.getsizeof(self.table)
+        for node in self.table.values():
+            total += sys.getsizeof(node) + sys.getsizeof(node.__dict__) \
+                + sys.getsizeof(node.children) + sys.getsizeof(node.unexplored_actions) \
+                + sum(sys.getsizeof(edge) for edge in node.children)
+        return total / len(self.table)
@@ -0,0 +1,236 @@
+""" Module concernant la parallélisation du MCTS (à la racine ou dans un arbre partagé) """
+
+import random
+import time
+from multiprocessing.pool import Pool
+
+from Game_playing.structures_classes import (Action, Environment,
+                                             EnvSnapshot, decode_action,
+                                             restore_env, snapshot_env)
+from Strategies.mcts import MCTS
+from Strategies.mcts_tree import NO_NODE, ROOT, ArrayTree
+from Strategies.process_pool import PersistentPool
+
+# Nombre de processus utilisés par le MCTS (1 : recherche séquentielle)
+# et mode de parallélisation ("root" : un arbre par processus, "tree" : arbre partagé)
+MCTS_WORKERS = 1
+MCTS_PARALLEL_MODE = "root"
+PARALLEL_MODES = ("root", "tree")
+
+# Arbre partagé : perte virtuelle appliquée aux nœuds en cours d'évaluation
+# et nombre de feuilles envoyées à chaque processus par lot
+VIRTUAL_LOSS = 1.0
+LEAVES_PER_WORKER = 8
+
+# Temps minimal laissé à chaque processus pour effectuer au moins une simulation
+MIN_WORKER_TIME = 0.01
+
+# Pool de processus conservé d'un coup à l'autre (créé à la première utilisation)
+POOL = PersistentPool()
+
+RootStatistics = dict[Action, tuple[int, float]]
+
+
+def set_mcts_workers(workers: int, mode: str = "root"):
+    """
+    Fonction fixant le nombre de processus utilisés par le MCTS et le mode de parallélisation
+    """
+    global MCTS_WORKERS, MCTS_PARALLEL_MODE  # pylint: disable=global-statement
+    if mode not in PARALLEL_MODES:
+        raise ValueError(f"Mode de parallélisation inconnu : {mode}")
+    MCTS_WORKERS = max(1, workers)
+    MCTS_PARALLEL_MODE = mode
+
+
+def get_pool(workers: int) -> Pool:
+    """
+    Fonction retournant le pool de processus (recréé uniquement si sa taille change)
+    """
+    return POOL.get(workers)
+
+
+def search_worker(
+    task: tuple[EnvSnapshot, int, int, float | None, str]
+) -> tuple[RootStatistics, int]:
+    """
+    Fonction exécutée par un processus : recherche MCTS sur sa propre copie de la position
+    Retourne les statistiques des enfants de la racine et le nombre de simulations
+    """
+    snapshot, seed, nb_simulations, deadline, tree_store = task
+    random.seed(seed)
+    env = restore_env(snapshot)
+    mcts = MCTS(tree_store=tree_store)
+    round_time = None if deadline is None else max(deadline - time.time(), MIN_WORKER_TIME)
+    mcts.search(env, nb_simulations, round_time)
+    return mcts.root_statistics(), mcts.simulations
+
+
+# Position de la racine conservée par chaque processus (arbre partagé) : copie et environnement
+WORKER_ENV: tuple[EnvSnapshot, Environment] | None = None
+
+
+def rollout_worker(task: tuple[EnvSnapshot, int, list[list[int]]]) -> list[float]:
+    """
+    Fonction exécutée par un processus : simulation d'un lot de feuilles de l'arbre partagé
+    Chaque feuille est décrite par la suite des actions encodées menant de la racine à elle
+    """
+    global WORKER_ENV  # pylint: disable=global-statement
+    snapshot, seed, paths = task
+    if WORKER_ENV is None or WORKER_ENV[0] != snapshot:
+        WORKER_ENV = (snapshot, restore_env(snapshot))
+    env = WORKER_ENV[1]
+    random.seed(seed)
+    mcts = MCTS()
+
+    scores = []
+    for path in paths:
+        actions = [decode_action(code) for code in path]
+        for action in actions:
+            env.play(action)
+        scores.append(mcts.rollout(env))
+        for action in reversed(actions):
+            env.reverse_action(action)
+    return scores
+
+
+class TreeParallelMCTS(MCTS):
+    """
+    Classe représentant un MCTS parallélisé dans un arbre partagé (tree parallelization)
+
+    Le processus principal sélectionne un lot de feuilles dans un unique ArrayTree :
+    une perte virtuelle est appliquée aux nœuds parcourus pour que les descentes suivantes
+    du lot explorent d'autres branches. Les simulations du lot sont réparties entre les
+    processus du pool puis rétropropagées en retirant la perte virtuelle.
+    """
+
+    def __init__(self, workers: int, leaves_per_worker: int = LEAVES_PER_WORKER, **kwargs):
+        super().__init__(tree_store="arrays", **kwargs)
+        self.workers = workers
+        self.leaves_per_worker = leaves_per_worker
+
+    def select_leaf(self, env: Environment, tree: ArrayTree) -> tuple[int, list[int]]:
+        """
+        Méthode sélectionnant une feuille en appliquant la perte virtuelle sur le chemin
+        Retourne la feuille et les actions encodées y menant (l'environnement est restauré)
+        """
+        node, path = self.descend_array(env, tree, VIRTUAL_LOSS)
+        for code in reversed(path):
+            env.reverse_action(decode_action(code))
+        return node, path
+
+    def search(self, initial_state: Environment, nb_simulations=800, round_time=None):
+        """
+        Méthode principale : sélection d'un lot de feuilles, simulations en parallèle
+        puis rétropropagation, jusqu'à épuisement du budget (simulations ou temps)
+        """
+        tree = ArrayTree(self.max_nodes)
+        self.tree = tree
+        tree.add(NO_NODE)
+        env = initial_state
+        root_hash = env.hash
+        snapshot = snapshot_env(env)
+        pool = get_pool(self.workers)
+        batch_size = self.workers * self.leaves_per_worker
+        start_time = time.time()
+        n: int = 0
+
+        while self.within_budget(n, nb_simulations, round_time, start_time):
+            size = batch_size if round_time is not None else min(batch_size, nb_simulations - n)
+            leaves = [self.select_leaf(env, tree) for _ in range(size)]
+
+            # Répartition des feuilles entre les processus
+            tasks = [
+                (snapshot, random.getrandbits(32),
+                 [path for _, path in leaves[i::self.workers]])
+                for i in range(min(self.workers, size))
+            ]
+            results = pool.map(rollout_worker, tasks, chunksize=1)
+
+            # Rétropropagation (les visites ont été comptées lors de la sélection)
+            for i, scores in enumerate(results):
+                for (node, _), score in zip(leaves[i::self.workers], scores):
+                    while node != NO_NODE:
+                        tree.scores[node] += score + VIRTUAL_LOSS
+                        node = tree.parent[node]
+            n += size
+
+            if self.check_invariants:
+                self.check_simulation(env, root_hash)
+
+            # Stratégie STOP (évaluée après chaque lot)
+            if self.stop_early(n, [tree.visits[child] for child in tree.children(ROOT)],
+                               tree.visits[ROOT], round_time, start_time):
+                break
+
+        if round_time is not None:
+            print(f"nombre de simulations ({self.workers} processus, arbre partagé): {n} "
+                  f"({len(tree)} nœuds)")
+        self.simulations = n
+
+        # On retourne l'action de l'enfant avec le meilleur ratio de victoires
+        best_child = max(
+            (child for child in tree.children(ROOT) if tree.visits[child] > 0),
+            key=lambda child: tree.scores[child] / tree.visits[child],
+            default=NO_NODE,
+        )
+        return decode_action(tree.action[best_child]) if best_child != NO_NODE else None
+
+
+def merge_statistics(results: list[RootStatistics]) -> RootStatistics:
+    """
+    Fonction additionnant les visites et les scores des enfants de la racine
+    calculés par chaque processus
+    """
+    merged: RootStatistics = {}
+    for statistics in results:
+        for action, (visits, score) in statistics.items():
+            total_visits, total_score = merged.get(action, (0, 0.0))
+            merged[action] = (total_visits + visits, total_score + score)
+    return merged
+
+
+def parallel_search(
+    env: Environment,
+    nb_simulations: int = 800,
+    round_time: float | None = None,
+    workers: int | None = None,
+    tree_store: str = "nodes",
+    mode: str | None = None,
+    engine: MCTS | None = None,
+) -> Action:
+    """
+    Fonction recherchant la meilleure action avec un MCTS parallélisé :
+    - mode "root" : chaque processus développe son propre arbre (graine différente,
+      même échéance) puis les statistiques des enfants de la racine sont fusionnées
+    - mode "tree" : un arbre partagé dont les feuilles sont simulées par les processus
+      (voir TreeParallelMCTS)
+    Avec un seul processus, la recherche est faite par engine s'il est fourni
+    (moteur conservé d'un coup à l'autre) ou par un nouveau MCTS
+    """
+    workers = MCTS_WORKERS if workers is None else workers
+    mode = MCTS_PARALLEL_MODE if mode is None else mode
+    if workers <= 1:
+        engine = MCTS(tree_store=tree_store) if engine is None else engine
+        return engine.search(env, nb_simulations, round_time)
+    if mode == "tree":
+        return TreeParallelMCTS(workers).search(env, nb_simulations, round_time)
+
+    deadline = None if round_time is None else time.time() + round_time
+    snapshot = snapshot_env(env)
+    base_seed = random.getrandbits(32)
+    tasks = [
+        (snapshot, base_seed + i, nb_simulations, deadline, tree_store)
+        for i in range(workers)
+    ]
+    results = get_pool(workers).map(search_worker, tasks, chunksize=1)
+
+    merged = merge_statistics([statistics for statistics, _ in results])
+    print(f"nombre de simulations ({workers} processus): "
+          f"{sum(simulations for _, simulations in results)}")
+
+    # On retourne l'action avec le meilleur ratio de victoires
+    return max(
+        (action for action, (visits, _) in merged.items() if visits > 0),
+        key=lambda action: merged[action][1] / merged[action][0],
+        default=None,
+    )
@@ -0,0 +1,119 @@
+""" Module concernant le stockage compact (structure de tableaux) de l'arbre MCTS """
+
+from array import array
+from collections import deque
+
+from Game_playing.structures_classes import NO_ACTION
+
+# États d'un nœud
+UNEXPANDED = 0  # enfants pas encore créés
+EXPANDED = 1
+TERMINAL = 2
+
+NO_NODE = -1
+ROOT = 0  # indice du premier nœud ajouté
+
+# Nombre maximal de nœuds par défaut
+DEFAULT_MAX_NODES = 1_000_000
+
+
+class ArrayTree:
+    """
+    Classe représentant un arbre MCTS stocké sous forme de tableaux (module array)
+
+    Le nœud i est décrit par visits[i], scores[i], parent[i], first_child[i],
+    next_sibling[i], action[i] (action encodée par encode_action menant au nœud)
+    et state[i]. Les enfants d'un nœud sont chaînés par next_sibling.
+    Aucun objet Python n'est créé par nœud et la taille de l'arbre est bornée par capacity.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_MAX_NODES):
+        self.capacity = capacity
+        self.visits = array("I")
+        self.scores = array("d")
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.action = array("i")
+        self.state = array("B")
+
+    def __len__(self) -> int:
+        return len(self.visits)
+
+    def add(self, parent: int, action: int = NO_ACTION) -> int:
+        """
+        Fonction ajoutant un nœud et retournant son indice
+        """
+        self.visits.append(0)
+        self.scores.append(0.0)
+        self.parent.append(parent)
+        self.first_child.append(NO_NODE)
+        self.next_sibling.append(NO_NODE)
+        self.action.append(action)
+        self.state.append(UNEXPANDED)
+        return len(self.visits) - 1
+
+    def expand(self, node: int, actions: list[int]) -> bool:
+        """
+        Fonction créant les enfants d'un nœud pour une liste d'actions encodées
+        Retourne False (sans rien créer) si la capacité de l'arbre serait dépassée
+        """
+        if not actions:
+            self.state[node] = TERMINAL
+            return True
+        if len(self) + len(actions) > self.capacity:
+            return False
+
+        previous = NO_NODE
+        for code in reversed(actions):
+            child = self.add(node, code)
+            self.next_sibling[child] = previous
+            previous = child
+        self.first_child[node] = previous
+        self.state[node] = EXPANDED
+        return True
+
+    def children(self, node: int) -> list[int]:
+        """
+        Fonction retournant les indices des enfants d'un nœud
+        """
+        result = []
+        child = self.first_child[node]
+        while child != NO_NODE:
+            result.append(child)
+            child = self.next_sibling[child]
+        return result
+
+    def extract(self, node: int) -> "ArrayTree":
+        """
+        Fonction retournant un nouvel arbre contenant uniquement le sous-arbre d'un nœud
+        (qui devient la racine) avec ses statistiques : le reste de l'arbre n'est pas copié
+        """
+        tree = ArrayTree(self.capacity)
+        queue = deque([(node, tree.add(NO_NODE))])
+        while queue:
+            old, new = queue.popleft()
+            tree.visits[new] = self.visits[old]
+            tree.scores[new] = self.scores[old]
+            tree.state[new] = self.state[old]
+            previous = NO_NODE
+            for child in self.children(old):
+                copy = tree.add(new, self.action[child])
+                if previous == NO_NODE:
+                    tree.first_child[new] = copy
+                else:
+                    tree.next_sibling[previous] = copy
+                previous = copy
+                queue.append((child, copy))
+        return tree
+
+    def bytes_per_node(self) -> float:
+        """
+        Fonction retournant la mémoire occupée par nœud (taille des tableaux / nombre de nœuds)
+        """
+        if not self:
+            return 0.0
+        arrays = (self.visits, self.scores, self.parent, self.first_child,
+                  self.next_sibling, self.action, self.state)
+        allocated = sum(values.buffer_info()[1] * values.itemsize for values in arrays)
+        return allocated / len(self)
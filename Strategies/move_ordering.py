@@ -0,0 +1,111 @@
+""" Module concernant l'ordonnancement des coups des recherches alpha-beta et NegaScout """
+
+from typing import Optional
+
+from Game_playing.structures_classes import Action
+
+# Priorités : coup de la table de transposition, puis coups killers, puis historique
+HASH_MOVE_PRIORITY = 1 << 62
+KILLER_PRIORITY = 1 << 61
+
+MAX_PLY = 128
+
+
+class MoveOrdering:
+    """
+    Classe regroupant les heuristiques d'ordonnancement des coups :
+    - le coup de la table de transposition (hash move) est joué en premier
+    - deux coups killers par profondeur (coups ayant provoqué une coupure au même niveau)
+    - une table d'historique indexée par joueur et par action, incrémentée de depth²
+      à chaque coupure
+    Les tables sont conservées entre les itérations et les coups d'une même partie.
+    """
+
+    def __init__(self, game_key: tuple = ()):
+        self.game_key = game_key
+        self.killers: list[list[Optional[Action]]] = [[None, None] for _ in range(MAX_PLY)]
+        self.history: dict[tuple[int, Action], int] = {}
+
+        # Statistiques de la recherche en cours
+        self.nodes = 0
+        self.moves_searched = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(
+        self, actions: list[Action], ply: int, player_id: int, hash_move: Optional[Action] = None
+    ) -> list[Action]:
+        """
+        Fonction retournant les actions triées de la plus prometteuse à la moins prometteuse
+        """
+        killers = self.killers[ply] if ply < MAX_PLY else [None, None]
+        history = self.history
+
+        def priority(action: Action) -> int:
+            if action == hash_move:
+                return HASH_MOVE_PRIORITY
+            if action == killers[0]:
+                return KILLER_PRIORITY + 1
+            if action == killers[1]:
+                return KILLER_PRIORITY
+            return history.get((player_id, action), 0)
+
+        return sorted(actions, key=priority, reverse=True)
+
+    def cutoff(self, action: Action, ply: int, player_id: int, depth: int, index: int):
+        """
+        Fonction enregistrant une coupure provoquée par une action (index : rang de l'action)
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != action:
+                killers[1] = killers[0]
+                killers[0] = action
+
+        key = (player_id, action)
+        self.history[key] = self.history.get(key, 0) + depth * depth
+
+    def node(self, moves_searched: int):
+        """
+        Fonction enregistrant le nombre de coups explorés dans un nœud interne
+        """
+        self.nodes += 1
+        self.moves_searched += moves_searched
+
+    def branching_factor(self) -> float:
+        """
+        Fonction retournant le nombre moyen de coups explorés par nœud interne
+        """
+        return self.moves_searched / self.nodes if self.nodes else 0.0
+
+    def first_move_cutoff_rate(self) -> float:
+        """
+        Fonction retournant la proportion de coupures obtenues dès le premier coup
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def report(self) -> str:
+        """
+        Fonction retournant les statistiques de la recherche en cours
+        """
+        return (
+            f"ordonnancement : facteur de branchement {self.branching_factor():.2f} "
+            f"({self.nodes} nœuds internes), {self.cutoffs} coupures dont "
+            f"{self.first_move_cutoff_rate():.1%} au premier coup"
+        )
+
+    def new_search(self):
+        """
+        Fonction préparant une nouvelle recherche : les statistiques sont remises à zéro
+        et l'historique est divisé par deux pour favoriser les coupures récentes
+        """
+        self.nodes = 0
+        self.moves_searched = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        for key in self.history:
+            self.history[key] //= 2
@@ -7,14 +7,17 @@ from Game_playing.structures_classes import (
     Environment, PlayerLocal
 )
 
-from strategies import evaluate_dynamic, strategy_minmax
+from Strategies.move_ordering import MoveOrdering
+from Strategies.strategies import evaluate_dynamic
 
 
 class NegaScoutEngine:
     """ NegaScout Engine """
-    def __init__(self, board: Environment, depth: int):
+    def __init__(self, board: Environment, depth: int, ordering: MoveOrdering | None = None):
         self.board = board
         self.depth = depth
+        # Heuristiques d'ordonnancement (killers, historique) partagées avec l'alpha-beta
+        self.ordering = ordering if ordering is not None else MoveOrdering()
 
     def negascout(self, alpha, beta, depth, player):
         """ NegaScout algorithm """
@@ -32,9 +35,11 @@ class NegaScoutEngine:
             # Ou retournez une valeur appropriée
             return evaluate_dynamic(self.board, self.board.grid, player)
 
+        ply = self.depth - depth + 1
+        legal_moves = self.ordering.order(legal_moves, ply, player.id)
         first_move = True
 
-        for move in legal_moves:
+        for index, move in enumerate(legal_moves):
             self.board.play(move)
             score = -self.negascout(-b, -alpha, depth - 1, opponent)
 
@@ -47,11 +52,14 @@ class NegaScoutEngine:
             self.board.reverse_action(move)
             alpha = max(score, alpha)
             if alpha >= beta:
+                self.ordering.cutoff(move, ply, player.id, depth, index)
+                self.ordering.node(index + 1)
                 return alpha
 
             b = alpha + 1
             first_move = False
 
+        self.ordering.node(len(legal_moves))
         return best
 
     def get_move(self, player: PlayerLocal) -> Action:
@@ -60,7 +68,8 @@ class NegaScoutEngine:
         """
 
         self.board.grid = deepcopy(self.board.grid)
-        legals = self.board.legals(player)
+        self.ordering.new_search()
+        legals = self.ordering.order(self.board.legals(player), 0, player.id)
         opponent = self.board.min_player if player == self.board.max_player \
                                             else self.board.max_player
         best = -inf
@@ -76,7 +85,5 @@ class NegaScoutEngine:
 
             self.board.reverse_action(move)
 
+        print(self.ordering.report())
         return best_move
-
-
-
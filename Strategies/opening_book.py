@@ -0,0 +1,271 @@
+""" Module concernant le livre d'ouvertures (coups précalculés des premières positions) """
+
+import argparse
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+from array import array
+from pathlib import Path
+
+from Game_playing.grid import DODO_GRIDS, build_environment
+from Game_playing.structures_classes import (Action, Environment, GridDict,
+                                             decode_action, encode_action)
+from Game_playing.symmetry import (Symmetry, canonical_key, inverse_action,
+                                   transform_action)
+from Strategies.mcts import MCTS
+from Strategies.move_ordering import MoveOrdering
+from Strategies.strategies import TT_SIZE_MB, iterative_deepening
+from Strategies.transposition import TranspositionTable
+
+# Fichiers des livres : books/<jeu>_<taille>.book à la racine du dépôt (non versionnés)
+BOOK_DIR = Path(__file__).resolve().parent.parent / "books"
+
+# En-tête du fichier : signature, taille de la grille, nombre de positions ;
+# suivent les clés canoniques triées (64 bits) puis les coups encodés (32 bits),
+# exprimés dans le repère de la position canonique
+MAGIC = b"OBK2"
+HEADER = struct.Struct("<4sIQ")
+
+# Livres ouverts (None : pas de fichier pour ce jeu et cette taille)
+BOOKS: dict[tuple[str, int], "OpeningBook | None"] = {}
+
+# Position à chercher par le générateur : grille et joueur au trait
+BookPosition = tuple[GridDict, int]
+
+
+def book_path(game: str, hex_size: int) -> Path:
+    """
+    Fonction retournant le chemin du livre d'un jeu et d'une taille de grille
+    """
+    return BOOK_DIR / f"{game.lower()}_{hex_size}.book"
+
+
+class OpeningBook:
+    """
+    Classe représentant un livre d'ouvertures ouvert avec mmap
+
+    Les clés canoniques des positions (plus petit hash de Zobrist des positions
+    symétriques, voir Game_playing.symmetry) sont triées et consultés par recherche
+    dichotomique directement dans la projection du fichier ; le coup de la position
+    se trouve au même rang dans le tableau des coups.
+    """
+
+    def __init__(self, path: Path):
+        with open(path, "rb") as file:
+            self.memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.hex_size, self.count = HEADER.unpack_from(self.memory)
+        if magic != MAGIC:
+            raise ValueError(f"{path} n'est pas un livre d'ouvertures")
+        view = memoryview(self.memory)
+        moves_offset = HEADER.size + 8 * self.count
+        self.keys = view[HEADER.size:moves_offset].cast("Q")
+        self.moves = view[moves_offset:moves_offset + 4 * self.count].cast("I")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def probe(self, key: int) -> Action | None:
+        """
+        Fonction retournant le coup du livre pour une clé canonique (ou None)
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.keys[middle] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.keys[low] == key:
+            return decode_action(self.moves[low])
+        return None
+
+    def close(self):
+        """
+        Fonction fermant la projection du fichier
+        """
+        self.keys.release()
+        self.moves.release()
+        self.memory.close()
+
+
+def get_opening_book(game: str, hex_size: int) -> OpeningBook | None:
+    """
+    Fonction retournant le livre d'un jeu et d'une taille de grille (ouvert à la première
+    utilisation) ou None s'il n'a pas été généré
+    """
+    if (game, hex_size) not in BOOKS:
+        path = book_path(game, hex_size)
+        BOOKS[(game, hex_size)] = OpeningBook(path) if path.exists() else None
+    return BOOKS[(game, hex_size)]
+
+
+def book_action(env: Environment) -> Action | None:
+    """
+    Fonction retournant le coup du livre pour la position de l'environnement
+    (None si la position n'est pas dans le livre ou si le coup n'y est pas légal)
+    Le coup lu est ramené du repère canonique à celui de la position
+    """
+    book = get_opening_book(env.game, env.hex_size)
+    if book is None:
+        return None
+    key, symmetry = canonical_key(env)
+    move = book.probe(key)
+    if move is None:
+        return None
+    action = inverse_action(move, symmetry, env.hex_size)
+    if action not in env.legals(env.current_player):
+        return None
+    return action
+
+
+def position_env(game: str, hex_size: int, position: BookPosition) -> Environment:
+    """
+    Fonction créant un environnement sur une position, le joueur au trait étant le joueur max
+    """
+    grid, player_id = position
+    env = build_environment(game, hex_size, player_id=player_id)
+    env.current_player = env.max_player
+    env.load_grid(grid)
+    return env
+
+
+def book_worker(task: tuple[str, int, BookPosition, float]) -> int:
+    """
+    Fonction exécutée par un processus : recherche longue d'une position du livre
+    (MCTS pour Dodo, alpha-beta pour Gopher, comme le client réseau)
+    Retourne le coup encodé
+    """
+    game, hex_size, position, seconds = task
+    env = position_env(game, hex_size, position)
+    if game == "Dodo":
+        action = MCTS().search(env, round_time=seconds)
+    else:
+        _, action, _ = iterative_deepening(
+            env, env.current_player, time.time() + seconds,
+            table=TranspositionTable(TT_SIZE_MB), ordering=MoveOrdering(),
+        )
+    if action is None:
+        action = env.legals(env.current_player)[0]
+    return encode_action(action)
+
+
+def successors(
+    game: str, hex_size: int, position: BookPosition, actions: list[Action]
+) -> list[tuple[int, Symmetry, BookPosition]]:
+    """
+    Fonction retournant la clé canonique, la symétrie menant à la position canonique
+    et la position atteinte par chaque action (les positions de fin de partie sont ignorées)
+    """
+    env = position_env(game, hex_size, position)
+    result = []
+    for action in actions:
+        env.play(action)
+        if env.final() == 0:
+            key, symmetry = canonical_key(env)
+            result.append((key, symmetry, (env.grid.copy(), env.current_player.id)))
+        env.reverse_action(action)
+    return result
+
+
+def build_book(
+    game: str, hex_size: int, plies: int, seconds: float, workers: int
+) -> dict[int, int]:
+    """
+    Fonction construisant le livre des plies premiers demi-coups pour les deux camps
+    Dans l'arbre du livre d'un camp, on suit uniquement le coup trouvé par la recherche
+    à ses tours et toutes les réponses de l'adversaire. Les positions d'une même
+    profondeur sont cherchées en parallèle dans un pool de processus.
+    Les positions symétriques (clé canonique égale) ne sont cherchées qu'une fois ; comme
+    une symétrie de Dodo peut échanger les couleurs, le rôle d'une position est relatif
+    au joueur au trait (True : c'est le camp du livre qui joue).
+    Retourne le coup encodé de chaque position (indexée par sa clé canonique)
+    """
+    start = build_environment(game, hex_size)
+    key, symmetry = canonical_key(start)
+    # Positions de la profondeur courante :
+    # clé canonique -> (représentant, symétrie vers la position canonique, rôles)
+    frontier: dict[int, tuple[BookPosition, Symmetry, set[bool]]] = {
+        key: ((start.grid.copy(), start.current_player.id), symmetry, {True, False})
+    }
+    book: dict[int, int] = {}
+    begin = time.time()
+
+    with multiprocessing.Pool(workers) as pool:
+        for ply in range(plies):
+            # Recherche des positions où le joueur au trait est le camp du livre
+            searched = [key for key, (_, _, roles) in frontier.items()
+                        if True in roles and key not in book]
+            tasks = [(game, hex_size, frontier[key][0], seconds) for key in searched]
+            for key, move in zip(searched, pool.map(book_worker, tasks)):
+                action = transform_action(decode_action(move), frontier[key][1], hex_size)
+                book[key] = encode_action(action)
+            print(f"demi-coup {ply} : {len(searched)} positions cherchées, "
+                  f"{len(book)} dans le livre ({time.time() - begin:.0f}s)")
+            if ply == plies - 1:
+                break
+
+            following: dict[int, tuple[BookPosition, Symmetry, set[bool]]] = {}
+            for key, (position, symmetry, roles) in frontier.items():
+                children = []
+                if True in roles:
+                    move = inverse_action(decode_action(book[key]), symmetry, hex_size)
+                    children.append(([move], False))
+                if False in roles:
+                    env = position_env(game, hex_size, position)
+                    children.append((env.legals(env.current_player), True))
+                for actions, role in children:
+                    for child_key, child_symmetry, child in successors(
+                        game, hex_size, position, actions
+                    ):
+                        following.setdefault(
+                            child_key, (child, child_symmetry, set())
+                        )[2].add(role)
+            frontier = following
+    return book
+
+
+def write_book(hex_size: int, book: dict[int, int], path: Path):
+    """
+    Fonction écrivant un livre d'ouvertures (en-tête, clés triées puis coups)
+    """
+    keys = sorted(book)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(".tmp")
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, hex_size, len(keys)))
+        array("Q", keys).tofile(file)
+        array("I", (book[key] for key in keys)).tofile(file)
+    os.replace(temporary, path)
+
+
+def main():
+    """Génération d'un livre d'ouvertures depuis la ligne de commande"""
+    parser = argparse.ArgumentParser(
+        description="Build an opening book with long searches run in a process pool"
+    )
+    parser.add_argument("game", choices=["dodo", "gopher"])
+    parser.add_argument("--size", type=int, default=4, choices=range(3, 11),
+                        help="Size of the initial grid (default: 4, Dodo: 3, 4 or 7)")
+    parser.add_argument("--plies", type=int, default=4,
+                        help="Number of plies covered by the book (default: 4)")
+    parser.add_argument("--seconds", type=float, default=10.0,
+                        help="Search time per position (default: 10)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of processes (default: number of CPUs)")
+    parser.add_argument("--output", type=Path, default=BOOK_DIR,
+                        help="Directory of the book files (default: books/)")
+    args = parser.parse_args()
+    if args.game == "dodo" and args.size not in DODO_GRIDS:
+        parser.error(f"Dodo is only available on sizes {sorted(DODO_GRIDS)}")
+
+    game = "Dodo" if args.game == "dodo" else "Gopher"
+    book = build_book(game, args.size, args.plies, args.seconds, args.workers)
+    path = args.output / book_path(game, args.size).name
+    write_book(args.size, book, path)
+    print(f"{len(book)} positions, {path.stat().st_size} octets ({path})")
+
+
+if __name__ == "__main__":
+    main()
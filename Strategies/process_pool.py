@@ -0,0 +1,50 @@
+""" Module concernant les pools de processus conservés d'un coup à l'autre """
+
+import atexit
+import multiprocessing
+from multiprocessing.pool import Pool
+from typing import Any, Callable, Hashable
+
+
+class PersistentPool:
+    """
+    Classe représentant un pool de processus créé à la première utilisation et conservé
+    d'un coup à l'autre : il n'est recréé que si sa configuration (nombre de processus,
+    clé choisie par l'appelant) change, et il est arrêté à la fin du programme
+    """
+
+    def __init__(self):
+        self.pool: Pool | None = None
+        self.config: tuple[int, Hashable] | None = None
+        atexit.register(self.shutdown)
+
+    def get(
+        self,
+        processes: int,
+        key: Hashable = None,
+        initializer: Callable[..., Any] | None = None,
+        initargs: tuple = (),
+    ) -> Pool:
+        """
+        Fonction retournant le pool (recréé uniquement si processes ou key change)
+        initializer(*initargs) est exécuté au démarrage de chaque processus
+        """
+        config = (processes, key)
+        if self.pool is None or self.config != config:
+            self.shutdown()
+            # Le pool survit à l'appel : il est arrêté par shutdown, pas par un bloc with
+            self.pool = multiprocessing.Pool(  # pylint: disable=consider-using-with
+                processes, initializer=initializer, initargs=initargs
+            )
+            self.config = config
+        return self.pool
+
+    def shutdown(self):
+        """
+        Fonction arrêtant le pool
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+        self.pool = None
+        self.config = None
@@ -0,0 +1,203 @@
+""" Module concernant la recherche par nombres de preuve (df-pn) pour les fins de partie """
+
+import time
+
+from Game_playing.structures_classes import EMPTY, Action, Environment, PlayerLocal
+
+# Résultats d'une recherche
+WIN = 1  # le joueur au trait à la racine gagne
+LOSS = -1
+UNKNOWN = 0  # budget épuisé avant la preuve
+
+# Nombre de preuve « infini » (position prouvée ou réfutée)
+INFINITY = 1 << 30
+
+# Nombre maximal de nœuds développés par recherche
+PN_NODE_BUDGET = 50_000
+
+# Seuils de déclenchement en fin de partie : nombre de cases vides (Gopher)
+# ou nombre de coups légaux du joueur au trait
+PN_MAX_EMPTIES = 16
+PN_MAX_LEGALS = 4
+
+# Nombres de preuve (phi, delta) d'une position du point de vue du joueur au trait :
+# phi = nombre de preuve de sa victoire, delta = nombre de preuve de sa défaite
+ProofNumbers = tuple[int, int]
+
+
+class BudgetExhausted(Exception):
+    """
+    Exception levée lorsque le budget de nœuds (ou le temps) de la recherche est épuisé
+    """
+
+
+class ProofNumberSearch:
+    """
+    Classe représentant une recherche df-pn (recherche en profondeur par nombres de preuve)
+
+    Chaque position est vue du joueur au trait (formulation phi/delta) : une position
+    est gagnée si l'un de ses coups mène à une position perdue pour l'adversaire.
+    Les nombres de preuve sont conservés dans une table indexée par le hash de Zobrist ;
+    la recherche descend vers l'enfant le plus prometteur tant que les nombres de preuve
+    restent sous les seuils transmis par le parent.
+    Les parties de Gopher et de Dodo ne contiennent pas de cycle (les pions sont posés ou
+    avancent toujours), la table peut donc être partagée par les transpositions.
+    """
+
+    def __init__(self, node_budget: int = PN_NODE_BUDGET, deadline: float | None = None):
+        self.node_budget = node_budget
+        self.deadline = deadline
+        self.table: dict[int, ProofNumbers] = {}
+        self.nodes = 0
+
+    def terminal(self, env: Environment) -> ProofNumbers | None:
+        """
+        Fonction retournant les nombres de preuve d'une position terminale (sinon None)
+        """
+        result = env.final()
+        if result == 0:
+            return None
+        wins = (result == 1) == (env.current_player.id == env.max_player.id)
+        return (0, INFINITY) if wins else (INFINITY, 0)
+
+    def children(self, env: Environment) -> list[tuple[Action, int]]:
+        """
+        Fonction développant une position : chaque enfant terminal est évalué immédiatement
+        Retourne les coups et le hash des positions atteintes
+        """
+        self.nodes += 1
+        if self.nodes > self.node_budget or \
+                (self.deadline is not None and time.time() >= self.deadline):
+            raise BudgetExhausted()
+
+        result = []
+        for action in env.legals(env.current_player):
+            env.play(action)
+            key = env.hash
+            if key not in self.table:
+                value = self.terminal(env)
+                if value is not None:
+                    self.table[key] = value
+            env.reverse_action(action)
+            result.append((action, key))
+        return result
+
+    def lookup(self, key: int) -> ProofNumbers:
+        """
+        Fonction retournant les nombres de preuve connus d'une position ((1, 1) si inconnue)
+        """
+        return self.table.get(key, (1, 1))
+
+    def select(self, children: list[tuple[Action, int]]) -> tuple[int, int, int, int]:
+        """
+        Fonction retournant l'indice de l'enfant le plus prometteur (delta minimal),
+        ses nombres de preuve et le deuxième plus petit delta
+        """
+        best = 0
+        best_phi, best_delta = INFINITY, INFINITY
+        second_delta = INFINITY
+        for i, (_, key) in enumerate(children):
+            phi, delta = self.lookup(key)
+            if delta < best_delta:
+                second_delta = best_delta
+                best, best_phi, best_delta = i, phi, delta
+            elif delta < second_delta:
+                second_delta = delta
+        return best, best_phi, best_delta, second_delta
+
+    def proof_numbers(self, children: list[tuple[Action, int]]) -> ProofNumbers:
+        """
+        Fonction calculant les nombres de preuve d'une position à partir de ses enfants :
+        phi = plus petit delta des enfants, delta = somme (bornée) des phi des enfants
+        """
+        phi, delta = INFINITY, 0
+        for _, key in children:
+            child_phi, child_delta = self.lookup(key)
+            phi = min(phi, child_delta)
+            delta = min(delta + child_phi, INFINITY)
+        return phi, delta
+
+    def mid(self, env: Environment, phi_threshold: int, delta_threshold: int):
+        """
+        Fonction développant une position jusqu'à ce que ses nombres de preuve
+        atteignent un des seuils (l'environnement est restauré)
+        """
+        key = env.hash
+        children = self.children(env)
+        while True:
+            phi, delta = self.proof_numbers(children)
+            if phi >= phi_threshold or delta >= delta_threshold:
+                self.table[key] = (phi, delta)
+                return
+
+            best, child_phi, _, second_delta = self.select(children)
+            action = children[best][0]
+            env.play(action)
+            try:
+                self.mid(
+                    env,
+                    min(delta_threshold + child_phi - delta, INFINITY),
+                    min(phi_threshold, second_delta + 1),
+                )
+            finally:
+                env.reverse_action(action)
+
+    def search(self, env: Environment) -> tuple[int, Action | None]:
+        """
+        Fonction cherchant à prouver la position pour le joueur au trait
+        Retourne le résultat (WIN, LOSS ou UNKNOWN) et le coup à jouer : un coup gagnant
+        si la position est prouvée, sinon le coup le plus prometteur
+        """
+        value = self.terminal(env)
+        if value is not None:
+            return (WIN if value[0] == 0 else LOSS), None
+
+        root = env.hash
+        try:
+            self.mid(env, INFINITY, INFINITY)
+        except BudgetExhausted:
+            pass
+
+        phi, delta = self.lookup(root)
+        result = WIN if phi == 0 else LOSS if delta == 0 else UNKNOWN
+        children = self.children_of_root(env)
+        best = min(children, key=lambda child: self.lookup(child[1])[1], default=None)
+        return result, None if best is None else best[0]
+
+    def children_of_root(self, env: Environment) -> list[tuple[Action, int]]:
+        """
+        Fonction retournant les coups de la racine et le hash des positions atteintes
+        (sans compter dans le budget)
+        """
+        result = []
+        for action in env.legals(env.current_player):
+            env.play(action)
+            result.append((action, env.hash))
+            env.reverse_action(action)
+        return result
+
+
+def is_endgame(env: Environment) -> bool:
+    """
+    Fonction indiquant si la position est assez simple pour être prouvée :
+    peu de cases vides (Gopher) ou peu de coups légaux pour le joueur au trait
+    """
+    if env.game == "Gopher":
+        empties = sum(1 for value in env.grid.values() if value == EMPTY)
+        if empties <= PN_MAX_EMPTIES:
+            return True
+    max_moves, min_moves = env.mobility()
+    moves = max_moves if env.current_player.id == env.max_player.id else min_moves
+    return moves <= PN_MAX_LEGALS
+
+
+def strategy_proof_number(env: Environment, player: PlayerLocal) -> Action:
+    """
+    Stratégie qui retourne le coup calculé par la recherche df-pn
+    (un coup gagnant si la position est prouvée dans le budget de nœuds)
+    """
+    result, action = ProofNumberSearch().search(env)
+    print(f"df-pn : résultat {result}")
+    if action is None:
+        return env.legals(player)[0]
+    return action
@@ -0,0 +1,407 @@
+""" Module concernant la décomposition des fins de partie de Gopher en régions indépendantes """
+
+import time
+from functools import lru_cache
+
+from Game_playing.structures_classes import (ALL_DIRECTIONS, EMPTY, Action, Cell,
+                                             Environment)
+from Game_playing.symmetry import transform_cell
+from Strategies.proof_number import LOSS, UNKNOWN, WIN, BudgetExhausted
+
+# Nombre maximal de régions nouvelles évaluées par recherche
+REGION_NODE_BUDGET = 200_000
+
+# Taille maximale (cases vivantes) de la plus grande région disputée : au-delà, calculer
+# la valeur complète de la région coûte plus cher qu'une recherche alpha-beta
+REGION_MAX_CELLS = 16
+
+# Taille des caches des opérations sur les valeurs (comparaisons et sommes)
+VALUE_CACHE_SIZE = 1 << 20
+
+# Motif d'une région : cases (coordonnées normalisées) avec le nombre de pions voisins
+# du joueur au trait et de son adversaire, sous forme canonique (symétries et translation)
+Pattern = tuple[tuple[Cell, int, int], ...]
+
+# Cases d'une région avant normalisation : case -> (voisins du joueur au trait, de l'adversaire)
+RegionCells = dict[Cell, tuple[int, int]]
+
+# Compteurs des cases encore jouables un jour : une case touchant un pion de chaque camp
+# ou deux pions d'un même camp ne peut plus être jouée (les compteurs ne font qu'augmenter)
+ALIVE = {(0, 0), (0, 1), (1, 0)}
+
+# Valeurs des régions déjà évaluées, par motif canonique (partagées entre les recherches,
+# vidées au-delà de VALUE_CACHE_SIZE motifs)
+REGION_VALUES: dict[Pattern, "GameValue"] = {}
+
+
+class UnionFind:
+    """
+    Classe représentant une structure union-find (compression de chemin, union par taille)
+    Les cases sont ajoutées une à une et réunies à leurs voisines déjà ajoutées.
+    """
+
+    def __init__(self):
+        self.parent: dict[Cell, Cell] = {}
+        self.size: dict[Cell, int] = {}
+
+    def add(self, item: Cell):
+        """
+        Fonction ajoutant un élément dans sa propre classe
+        """
+        self.parent[item] = item
+        self.size[item] = 1
+
+    def find(self, item: Cell) -> Cell:
+        """
+        Fonction retournant le représentant de la classe d'un élément
+        """
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: Cell, second: Cell):
+        """
+        Fonction réunissant les classes de deux éléments
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+
+    def classes(self) -> list[list[Cell]]:
+        """
+        Fonction retournant les classes (listes d'éléments)
+        """
+        groups: dict[Cell, list[Cell]] = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return list(groups.values())
+
+
+def split(cells: RegionCells, neighbors) -> list[RegionCells]:
+    """
+    Fonction découpant des cases vivantes en régions connexes
+    neighbors(case) : cases voisines de la case
+    La structure est reconstruite à chaque appel : un coup ne fait que retirer des cases
+    vivantes et peut couper une région en deux, ce qu'un union-find ne sait pas défaire.
+    Les régions sont petites et chaque motif n'est découpé qu'une fois par coup
+    (valeurs conservées dans REGION_VALUES).
+    """
+    components = UnionFind()
+    for cell in cells:
+        components.add(cell)
+        for neighbor in neighbors(cell):
+            if neighbor in components.parent:
+                components.union(cell, neighbor)
+    return [{cell: cells[cell] for cell in group} for group in components.classes()]
+
+
+def lattice_neighbors(cell: Cell) -> list[Cell]:
+    """
+    Fonction retournant les voisins d'une case du réseau hexagonal (sans bord de grille)
+    """
+    return [(cell[0] + dq, cell[1] + dr) for dq, dr in ALL_DIRECTIONS]
+
+
+@lru_cache(maxsize=None)
+def cell_images(cell: Cell) -> tuple[Cell, ...]:
+    """
+    Fonction retournant les images d'une case par les 12 symétries de l'hexagone
+    (6 rotations, sans puis avec réflexion)
+    """
+    return tuple(transform_cell(cell, rotations, reflected)
+                 for reflected in (False, True) for rotations in range(6))
+
+
+def translated(cells: list[tuple[Cell, int, int]]) -> Pattern:
+    """
+    Fonction ramenant un motif en (0, 0) par translation (cases triées)
+    """
+    min_q = min(cell[0] for cell, _, _ in cells)
+    min_r = min(cell[1] for cell, _, _ in cells)
+    return tuple(sorted(((q - min_q, r - min_r), own, opponent)
+                        for (q, r), own, opponent in cells))
+
+
+def canonical(cells: RegionCells) -> Pattern:
+    """
+    Fonction retournant le motif canonique d'une région : le plus petit motif parmi
+    ses images par les 12 symétries de l'hexagone, ramenées en (0, 0) par translation
+    """
+    return canonical_pattern(translated([(cell, own, opponent)
+                                         for cell, (own, opponent) in cells.items()]))
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def canonical_pattern(pattern: Pattern) -> Pattern:
+    """
+    Fonction retournant le motif canonique d'un motif ramené en (0, 0)
+    """
+    images = [cell_images(cell) for cell, _, _ in pattern]
+    return min(
+        translated([(cell_image[index], own, opponent)
+                    for cell_image, (_, own, opponent) in zip(images, pattern)])
+        for index in range(12)
+    )
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def independent_moves(cells: frozenset[Cell]) -> int:
+    """
+    Fonction retournant le nombre maximal de coups d'un joueur seul dans une région :
+    chaque pion posé rend ses voisines injouables, c'est donc la taille
+    d'un stable maximum du graphe de la région
+    """
+    if not cells:
+        return 0
+    cell = min(cells)
+    without = independent_moves(cells - {cell})
+    neighbors = set(lattice_neighbors(cell))
+    return max(without, 1 + independent_moves(frozenset(c for c in cells
+                                                         if c != cell and c not in neighbors)))
+
+
+def fold(regions: list[RegionCells]) -> tuple[tuple[Pattern, ...], int]:
+    """
+    Fonction classant des régions vues du joueur au trait :
+    - aucune case jouable (compteurs (0, 0)) : la région est ignorée ;
+    - cases jouables par un seul joueur, qui ne peut en créer pour l'autre : la région
+      vaut un nombre entier de coups d'avance, ajouté à la balance ;
+    - sinon la région reste à chercher.
+    Retourne les motifs restants (triés) et la balance du joueur au trait
+    """
+    hot = []
+    balance = 0
+    for cells in regions:
+        counts = set(cells.values())
+        if counts == {(0, 0)}:
+            continue
+        if counts == {(0, 1)}:
+            balance += independent_moves(frozenset(cells))
+        elif counts == {(1, 0)}:
+            balance -= independent_moves(frozenset(cells))
+        else:
+            hot.append(canonical(cells))
+    return tuple(sorted(hot)), balance
+
+
+# Valeur d'un jeu combinatoire sous forme canonique : options de Gauche, options de Droite
+# (Gauche est le joueur au trait de la position découpée). Deux valeurs égales ont la même
+# forme canonique, l'égalité des tuples est donc l'égalité des jeux.
+GameValue = tuple[frozenset, frozenset]
+
+ZERO: GameValue = (frozenset(), frozenset())
+
+
+@lru_cache(maxsize=None)
+def integer(n: int) -> GameValue:
+    """
+    Fonction retournant la forme canonique de l'entier n : n = { n - 1 | } si n > 0
+    """
+    if n == 0:
+        return ZERO
+    if n > 0:
+        return frozenset({integer(n - 1)}), frozenset()
+    return frozenset(), frozenset({integer(n + 1)})
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def less_equal(first: GameValue, second: GameValue) -> bool:
+    """
+    Fonction indiquant si first <= second : aucune option de Gauche de first n'est >= second
+    et aucune option de Droite de second n'est <= first
+    """
+    return not any(less_equal(second, left) for left in first[0]) and \
+        not any(less_equal(right, first) for right in second[1])
+
+
+def simplify(lefts: set, rights: set) -> GameValue:
+    """
+    Fonction retournant la forme canonique d'un jeu dont les options sont canoniques :
+    suppression des options dominées et contournement des options réversibles
+    """
+    while True:
+        lefts = {left for left in lefts
+                 if not any(other != left and less_equal(left, other) for other in lefts)}
+        rights = {right for right in rights
+                  if not any(other != right and less_equal(other, right) for other in rights)}
+        game = (frozenset(lefts), frozenset(rights))
+
+        reversible = next(((left, answer) for left in lefts for answer in left[1]
+                           if less_equal(answer, game)), None)
+        if reversible is not None:
+            lefts = (lefts - {reversible[0]}) | reversible[1][0]
+            continue
+        reversible = next(((right, answer) for right in rights for answer in right[0]
+                           if less_equal(game, answer)), None)
+        if reversible is not None:
+            rights = (rights - {reversible[0]}) | reversible[1][1]
+            continue
+        return game
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def add(first: GameValue, second: GameValue) -> GameValue:
+    """
+    Fonction retournant la forme canonique de la somme de deux jeux
+    """
+    if first == ZERO:
+        return second
+    if second == ZERO:
+        return first
+    return simplify(
+        {add(left, second) for left in first[0]} | {add(first, left) for left in second[0]},
+        {add(right, second) for right in first[1]} | {add(first, right) for right in second[1]},
+    )
+
+
+def region_moves(pattern: Pattern, player: int) -> list[tuple[tuple[Pattern, ...], int]]:
+    """
+    Fonction retournant, pour chaque coup de Gauche (player = 0) ou de Droite (player = 1)
+    dans une région, les régions atteintes et leur balance (du point de vue de Gauche)
+    """
+    playable = (0, 1) if player == 0 else (1, 0)
+    cells = {cell: (own, opponent) for cell, own, opponent in pattern}
+    result = []
+    for move, counts in cells.items():
+        if counts != playable:
+            continue
+        neighbors = lattice_neighbors(move)
+        following = {}
+        for cell, (own, opponent) in cells.items():
+            if cell == move:
+                continue
+            if cell in neighbors:
+                if player == 0:
+                    own += 1
+                else:
+                    opponent += 1
+            if (own, opponent) in ALIVE:
+                following[cell] = (own, opponent)
+        result.append(fold(split(following, lattice_neighbors)))
+    return result
+
+
+def decompose(env: Environment) -> tuple[tuple[Pattern, ...], int, int]:
+    """
+    Fonction découpant les cases vides vivantes de la grille en régions indépendantes
+    (union-find sur env.neighbor_dict), vues du joueur au trait
+    Retourne les motifs à chercher, la balance du joueur au trait et le nombre de régions
+    """
+    mover = env.current_player.id
+    grid = env.grid
+    neighbor_dict = env.neighbor_dict
+    cells: RegionCells = {}
+    for cell, value in grid.items():
+        if value != EMPTY:
+            continue
+        own = opponent = 0
+        for neighbor in neighbor_dict[cell]:
+            if grid[neighbor] == mover:
+                own += 1
+            elif grid[neighbor] != EMPTY:
+                opponent += 1
+        if (own, opponent) in ALIVE:
+            cells[cell] = (own, opponent)
+    regions = split(cells, lambda cell: neighbor_dict[cell])
+    hot, balance = fold(regions)
+    return hot, balance, len(regions)
+
+
+class RegionSearch:
+    """
+    Classe représentant la résolution d'une fin de partie de Gopher comme somme de régions
+
+    Un coup ne modifie que les compteurs de ses voisines : deux régions de cases vides
+    séparées par des cases mortes ou des pions n'interagissent donc plus. Gopher se joue
+    en jeu normal (le joueur qui ne peut plus jouer perd), chaque région est donc un jeu
+    combinatoire dont la valeur (forme canonique) ne dépend que de son motif. La valeur
+    d'un motif est calculée une seule fois, en ne cherchant que cette région ; la position
+    vaut la somme des valeurs de ses régions et le joueur au trait perd si elle est <= 0.
+    Le coût est exponentiel dans la taille de la plus grande région et non de la grille.
+    """
+
+    def __init__(self, node_budget: int = REGION_NODE_BUDGET, deadline: float | None = None):
+        self.node_budget = node_budget
+        self.deadline = deadline
+        self.nodes = 0
+
+    def value(self, pattern: Pattern) -> GameValue:
+        """
+        Fonction retournant la valeur d'une région (conservée d'une recherche à l'autre)
+        """
+        if pattern in REGION_VALUES:
+            return REGION_VALUES[pattern]
+        if len(REGION_VALUES) >= VALUE_CACHE_SIZE:
+            REGION_VALUES.clear()
+
+        self.nodes += 1
+        if self.nodes > self.node_budget or \
+                (self.deadline is not None and time.time() >= self.deadline):
+            raise BudgetExhausted()
+
+        options = [
+            {self.total(regions, balance) for regions, balance in region_moves(pattern, player)}
+            for player in (0, 1)
+        ]
+        REGION_VALUES[pattern] = simplify(*options)
+        return REGION_VALUES[pattern]
+
+    def total(self, regions: tuple[Pattern, ...], balance: int) -> GameValue:
+        """
+        Fonction retournant la valeur d'une somme de régions et d'un entier
+        """
+        result = integer(balance)
+        for pattern in regions:
+            result = add(result, self.value(pattern))
+        return result
+
+    def search(self, env: Environment) -> tuple[int, Action | None]:
+        """
+        Fonction cherchant un coup gagnant pour le joueur au trait
+        Retourne le résultat (WIN, LOSS ou UNKNOWN) et le coup gagnant éventuel
+        """
+        try:
+            for action in env.legals(env.current_player):
+                env.play(action)
+                try:
+                    regions, balance, _ = decompose(env)
+                    opponent_loses = less_equal(self.total(regions, balance), ZERO)
+                finally:
+                    env.reverse_action(action)
+                if opponent_loses:
+                    return WIN, action
+        except BudgetExhausted:
+            return UNKNOWN, None
+        return LOSS, None
+
+
+def is_decomposed(env: Environment) -> bool:
+    """
+    Fonction indiquant si la grille de Gopher est découpée en plusieurs régions disputées,
+    toutes assez petites pour être évaluées (hors premier coup, où toutes les cases
+    sont jouables)
+    """
+    if env.game != "Gopher" or not env.max_positions.positions and \
+            not env.min_positions.positions:
+        return False
+    regions, _, _ = decompose(env)
+    return len(regions) > 1 and max(len(pattern) for pattern in regions) <= REGION_MAX_CELLS
+
+
+def region_endgame(env: Environment, deadline: float) -> Action | None:
+    """
+    Fonction cherchant un coup gagnant par décomposition en régions
+    Retourne None si la grille n'est pas découpée ou si la position n'est pas prouvée
+    """
+    if not is_decomposed(env):
+        return None
+    search = RegionSearch(deadline=deadline)
+    result, action = search.search(env)
+    print(f"régions : résultat {result} ({search.nodes} régions évaluées)")
+    return action if result == WIN else None
@@ -0,0 +1,150 @@
+""" Module concernant la table de transposition partagée entre processus (Lazy SMP) """
+
+import struct
+from multiprocessing import shared_memory
+from typing import Optional
+
+from Strategies.transposition import BucketTable, Entry
+
+# Une entrée occupe trois mots de 64 bits :
+# - contrôle : clé ^ score ^ données (une entrée en cours d'écriture par un autre
+#   processus ne vérifie pas le contrôle et est ignorée, sans verrou)
+# - score (flottant 64 bits)
+# - données : coup encodé + 1 (32 bits), profondeur + 1 (8 bits, 0 : entrée vide),
+#   type de borne (8 bits) et âge (8 bits)
+WORDS_PER_ENTRY = 3
+ENTRY_BYTES = 8 * WORDS_PER_ENTRY
+
+MASK_64 = (1 << 64) - 1
+
+# Nombre d'entrées examinées pour estimer le taux de remplissage
+FILL_SAMPLE = 2000
+
+
+def pack_data(depth: int, flag: int, move: int, age: int) -> int:
+    """
+    Fonction regroupant les champs d'une entrée dans un mot de 64 bits
+    """
+    return ((move + 1) & 0xFFFFFFFF) | (min(depth, 126) + 1) << 32 | flag << 40 | age << 48
+
+
+def score_bits(score: float) -> int:
+    """
+    Fonction retournant la représentation binaire (64 bits) d'un score flottant
+    """
+    return int.from_bytes(struct.pack("<d", score), "little")
+
+
+def bits_score(bits: int) -> float:
+    """
+    Fonction retournant le score flottant représenté par un mot de 64 bits
+    """
+    return struct.unpack("<d", bits.to_bytes(8, "little"))[0]
+
+
+def unpack_data(data: int) -> tuple[int, int, int, int]:
+    """
+    Fonction retournant la profondeur, le type de borne, le coup et l'âge d'une entrée
+    """
+    return (data >> 32 & 0xFF) - 1, data >> 40 & 0xFF, (data & 0xFFFFFFFF) - 1, data >> 48 & 0xFF
+
+
+class SharedTranspositionTable(BucketTable):
+    """
+    Classe représentant une table de transposition stockée dans un bloc de mémoire partagée
+    (multiprocessing.shared_memory) et utilisable simultanément par plusieurs processus
+
+    Elle offre la même interface que TranspositionTable (probe, store, new_search...) et
+    le même schéma de remplacement (voir BucketTable). Les statistiques sont propres
+    à chaque processus.
+    """
+
+    label = "table de transposition partagée"
+
+    def __init__(self, size_mb: float = 16, name: str | None = None):
+        super().__init__(size_mb, ENTRY_BYTES)
+        size = len(self) * ENTRY_BYTES
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+            self.memory.buf[:size] = bytes(size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.name = self.memory.name
+        self.words = self.memory.buf.cast("Q")
+
+    def read(self, slot: int, key: int) -> Optional[tuple[int, int]]:
+        """
+        Fonction retournant le score (binaire) et le mot de données d'une entrée
+        si elle est non vide et que son contrôle correspond à la clé
+        """
+        base = WORDS_PER_ENTRY * slot
+        score = self.words[base + 1]
+        data = self.words[base + 2]
+        if data >> 32 & 0xFF and self.words[base] ^ score ^ data == key:
+            return score, data
+        return None
+
+    def probe(self, key: int) -> Optional[Entry]:
+        """
+        Fonction retournant l'entrée associée à une position (ou None)
+        """
+        self.probes += 1
+        key &= MASK_64
+        index = self.bucket(key)
+        for slot in (index, index + 1):
+            entry = self.read(slot, key)
+            if entry is not None:
+                depth, flag, move, _ = unpack_data(entry[1])
+                self.hits += 1
+                return depth, flag, bits_score(entry[0]), move
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: float, move: int):
+        """
+        Fonction enregistrant le résultat de la recherche d'une position
+        """
+        self.stores += 1
+        key &= MASK_64
+        index = self.bucket(key)
+
+        # Une entrée invalide (écriture concurrente) ne contient pas la même position
+        current = self.words[WORDS_PER_ENTRY * index + 2]
+        current_depth, _, _, current_age = unpack_data(current)
+        slot = self.replaced_slot(
+            index, depth, current_depth, self.read(index, key) is not None, current_age
+        )
+
+        base = WORDS_PER_ENTRY * slot
+        bits = score_bits(score)
+        data = pack_data(depth, flag, move, self.generation)
+        self.words[base + 1] = bits
+        self.words[base + 2] = data
+        self.words[base] = key ^ bits ^ data
+
+    def fill(self) -> float:
+        """
+        Fonction retournant le taux de remplissage estimé sur les premières entrées de la table
+        """
+        sample = min(len(self), FILL_SAMPLE)
+        used = sum(
+            1 for slot in range(sample) if self.words[WORDS_PER_ENTRY * slot + 2] >> 32 & 0xFF
+        )
+        return used / sample
+
+    def clear(self):
+        """
+        Fonction vidant la table
+        """
+        size = len(self) * ENTRY_BYTES
+        self.memory.buf[:size] = bytes(size)
+        self.new_search()
+
+    def close(self):
+        """
+        Fonction libérant le bloc de mémoire partagée (supprimé par le processus créateur)
+        """
+        self.words.release()
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
@@ -1,98 +1,152 @@
 """ Module contenant les différentes stratégies pour le jeu Strategies """
 
+import atexit
 import random
 import time
-from cmath import log
 from typing import Callable
 
-from Game_playing.structures_classes import (Action, Cell, Environment,
-                                             GridDict, PlayerLocal)
-from Strategies.mcts import MCTS
+from Game_playing.structures_classes import (Action, Environment, GridDict,
+                                             PlayerLocal, decode_action,
+                                             encode_action)
+from Game_playing.symmetry import (SymmetricHash, Symmetry, inverse_action,
+                                   transform_action)
+from Strategies.evaluation import get_evaluation
+from Strategies.lazy_smp import lazy_smp_search
+from Strategies.mcts_parallel import parallel_search
+from Strategies.move_ordering import MoveOrdering
+from Strategies.regions import region_endgame
+from Strategies.shared_transposition import SharedTranspositionTable
+from Strategies.transposition import EXACT, LOWER, UPPER, TranspositionTable
 
 StrategyLocal = Callable[[Environment, PlayerLocal], Action]
 
-# Définition d'un alias pour la clé
-MemoKey = tuple[GridDict, int]
+# Définition d'un alias pour la clé (hash de Zobrist de la position, voir Environment.hash)
+MemoKey = int
 
+# Score d'une partie gagnée et demi-largeur de la fenêtre d'aspiration
+WIN_SCORE = 10000
+ASPIRATION_WINDOW = 100
 
-def strategy_first_legal(
-    env: Environment,
-    player: PlayerLocal,
-) -> Action:
+# Profondeur maximale de l'approfondissement itératif et nombre de coups
+# restants estimé pour répartir le temps de jeu
+MAX_DEPTH = 64
+MINMAX_MOVES_TO_GO = 20
+
+# Taille par défaut (en Mo) de la table de transposition de l'alpha-beta
+TT_SIZE_MB = 64
+
+# Table de transposition partagée par les coups successifs (créée à la première utilisation)
+TRANSPOSITION_TABLE: TranspositionTable | None = None
+
+
+def get_transposition_table() -> TranspositionTable:
     """
-    Stratégie qui retourne la première action légale calculée
+    Fonction retournant la table de transposition de l'alpha-beta
     """
-    return env.legals(player)[0]
+    global TRANSPOSITION_TABLE  # pylint: disable=global-statement
+    if TRANSPOSITION_TABLE is None:
+        TRANSPOSITION_TABLE = TranspositionTable(TT_SIZE_MB)
+    return TRANSPOSITION_TABLE
 
 
-def strategy_random(
-    env: Environment,
-    player: PlayerLocal,
-) -> Action:
+# Table de transposition indexée par la clé canonique des positions (positions symétriques
+# partagées, symétries sans échange de couleurs pour conserver le sens des scores)
+SYMMETRIC_TABLE = False
+
+
+def set_symmetric_table(enabled: bool):
     """
-    Stratégie qui retourne une action légale aléatoire
+    Fonction activant le partage des entrées de la table de transposition
+    entre positions symétriques
     """
-    return random.choice(env.legals(player))
+    global SYMMETRIC_TABLE  # pylint: disable=global-statement
+    SYMMETRIC_TABLE = enabled
+
+
+# Nombre de processus de l'alpha-beta (1 : recherche séquentielle, sinon Lazy SMP)
+SEARCH_WORKERS = 1
+
+# Table de transposition en mémoire partagée utilisée par le Lazy SMP
+SHARED_TRANSPOSITION_TABLE: SharedTranspositionTable | None = None
 
 
-# Fonctions d'évaluation
-def is_near_edge(cell: Cell, grid_height: int, grid_width: int) -> bool:
+def get_shared_transposition_table() -> SharedTranspositionTable:
     """
-    Déterminer si une cellule est proche du bord de la grille
+    Fonction retournant la table de transposition partagée entre les processus du Lazy SMP
     """
-    return (
-        cell[0] == 0
-        or cell[0] == grid_height - 1
-        or cell[1] == 0
-        or cell[1] == grid_width - 1
-    )
+    global SHARED_TRANSPOSITION_TABLE  # pylint: disable=global-statement
+    if SHARED_TRANSPOSITION_TABLE is None:
+        SHARED_TRANSPOSITION_TABLE = SharedTranspositionTable(TT_SIZE_MB)
+        atexit.register(SHARED_TRANSPOSITION_TABLE.close)
+    return SHARED_TRANSPOSITION_TABLE
 
 
-# nombre de coups pour gagner ?
-def evaluate_dynamic(env: Environment, grid: GridDict, player: PlayerLocal) -> int:
+def set_search_workers(workers: int):
     """
-    Fonction d'évaluation pour le jeu Dodo
+    Fonction fixant le nombre de processus utilisés par l'alpha-beta
     """
+    global SEARCH_WORKERS  # pylint: disable=global-statement
+    SEARCH_WORKERS = max(1, workers)
 
-    # Sélection de l'adversaire
-    opponent = env.min_player if player == env.max_player else env.max_player
 
-    # Calcul des coups légaux
-    player_moves = len(env.legals(player))
-    opponent_moves = len(env.legals(opponent))
+# Heuristiques d'ordonnancement conservées entre les coups d'une même partie
+MOVE_ORDERING: MoveOrdering | None = None
 
-    # Initialisation des variables
-    player_score = 0
-    opponent_score = 0
 
-    grid_height = env.hex_size
-    grid_width = env.hex_size
+def get_move_ordering(env: Environment) -> MoveOrdering:
+    """
+    Fonction retournant les heuristiques d'ordonnancement de la partie en cours
+    (réinitialisées lorsque l'environnement change)
+    """
+    global MOVE_ORDERING  # pylint: disable=global-statement
+    game_key = (env.game, env.hex_size, id(env))
+    if MOVE_ORDERING is None or MOVE_ORDERING.game_key != game_key:
+        MOVE_ORDERING = MoveOrdering(game_key)
+    return MOVE_ORDERING
 
-    for cell in grid:
-        if grid[cell] == player:
-            player_score -= 40  # Pénalité pour avoir une pièce
-            player_score -= 80 * player_moves  # Pénalité ajustée pour la mobilité
 
-            if is_near_edge(cell, grid_height, grid_width):
-                player_score += 40 - distance_to_edge(
-                    cell, grid_height, grid_width
-                )  # Récompense dynamique pour la proximité du bord
-        elif cell == opponent:
-            opponent_score += 40  # Récompense pour avoir une pièce
-            opponent_score += 80 * opponent_moves  # Récompense ajustée pour la mobilité
+def set_transposition_table_size(size_mb: float):
+    """
+    Fonction fixant la mémoire maximale (en Mo) de la table de transposition
+    """
+    # pylint: disable-next=global-statement
+    global TT_SIZE_MB, TRANSPOSITION_TABLE, SHARED_TRANSPOSITION_TABLE
+    TT_SIZE_MB = size_mb
+    TRANSPOSITION_TABLE = None
+    if SHARED_TRANSPOSITION_TABLE is not None:
+        atexit.unregister(SHARED_TRANSPOSITION_TABLE.close)
+        SHARED_TRANSPOSITION_TABLE.close()
+        SHARED_TRANSPOSITION_TABLE = None
 
-            if is_near_edge(cell, grid_height, grid_width):
-                # Pénalité dynamique pour l'adversaire près du bord
-                opponent_score -= 40 - distance_to_edge(cell, grid_height, grid_width)
 
-    return player_score - opponent_score
+def strategy_first_legal(
+    env: Environment,
+    player: PlayerLocal,
+) -> Action:
+    """
+    Stratégie qui retourne la première action légale calculée
+    """
+    return env.legals(player)[0]
 
 
-def distance_to_edge(cell: Cell, grid_height: int, grid_width: int) -> int:
+def strategy_random(
+    env: Environment,
+    player: PlayerLocal,
+) -> Action:
+    """
+    Stratégie qui retourne une action légale aléatoire
+    """
+    return random.choice(env.legals(player))
+
+
+# Fonction d'évaluation
+def evaluate_dynamic(env: Environment, _: GridDict, player: PlayerLocal) -> int:
     """
-    Calculer la distance minimale d'une cellule aux bords de la grille
+    Fonction d'évaluation (Dodo et Gopher) du point de vue d'un joueur : mobilité,
+    pions bloqués, proximité du bord et nombre de pions, lus dans les accumulateurs
+    incrémentaux de l'environnement (voir Strategies/evaluation.py)
     """
-    return min(cell[0], grid_height - 1 - cell[0], cell[1], grid_width - 1 - cell[1])
+    return get_evaluation(env).score(env, player)
 
 
 # Minimax Strategy (sans cache)
@@ -130,12 +184,61 @@ def minmax_action(
     return 0, (-1, -1)
 
 
+class SearchTimeout(Exception):
+    """
+    Exception levée lorsque la date limite d'une recherche est dépassée
+    """
+
+
 def minmax_action_alpha_beta_pruning(
-    env: Environment, player: PlayerLocal, depth: int = 0, start_time: float = 0
+    env: Environment,
+    player: PlayerLocal,
+    depth: int = 0,
+    deadline: float | None = None,
+    table: TranspositionTable | SharedTranspositionTable | None = None,
+    window: tuple[float, float] = (float("-inf"), float("inf")),
+    first_move: Action | None = None,
+    ordering: MoveOrdering | None = None,
 ) -> tuple[float, Action]:
     """
     Stratégie qui retourne le résultat de l'algorithme Minimax avec élagage Alpha-Beta
+    deadline : date limite (time.time()) au-delà de laquelle SearchTimeout est levée,
+    l'environnement étant alors remis dans son état initial
+    table : table de transposition (optionnelle) indexée par le hash de la position
+    window : fenêtre (alpha, beta) initiale, first_move : coup à explorer en premier à la racine
+    ordering : heuristiques d'ordonnancement des coups (hash move, killers, historique)
     """
+    root_depth = depth
+    # Hash de toutes les images de la position, mis à jour avec l'environnement
+    symmetric = SymmetricHash(env, colour_swap=False) \
+        if table is not None and SYMMETRIC_TABLE else None
+
+    def table_key() -> tuple[int, Symmetry | None]:
+        # Clé de la position dans la table et symétrie vers la position canonique
+        # (None : identité)
+        if symmetric is None:
+            return env.hash, None
+        key, symmetry = symmetric.canonical()
+        if symmetry.rotations == 0 and not symmetry.reflected:
+            return key, None
+        return key, symmetry
+
+    def table_action(code: int, symmetry: Symmetry | None) -> Action | None:
+        # Coup de la table ramené dans le repère de la position courante
+        action = decode_action(code)
+        if symmetry is None or action is None:
+            return action
+        return inverse_action(action, symmetry, env.hex_size)
+
+    def play(action: Action, player_id: int):
+        env.play(action)
+        if symmetric is not None:
+            symmetric.apply(action, player_id)
+
+    def reverse(action: Action, player_id: int):
+        env.reverse_action(action)
+        if symmetric is not None:
+            symmetric.apply(action, player_id)
 
     def minmax_alpha_beta_pruning(
         env: Environment,
@@ -143,97 +246,202 @@ def minmax_action_alpha_beta_pruning(
         depth: int,
         alpha: float,
         beta: float,
-        start_time: float,
     ) -> tuple[float, Action]:
 
         # Si la profondeur est nulle ou si la partie est terminée
         res = env.final()
         if res != 0:
             if res == 1:
-                score = 10000
+                score = WIN_SCORE
             else:
-                score = -10000
+                score = -WIN_SCORE
             return score, (-1, -1)
         if depth == 0:
-            score = evaluate_dynamic(env, env.grid, player)
+            # Scores du point de vue du joueur max, comme WIN_SCORE
+            score = evaluate_dynamic(env, env.grid, env.max_player)
             return score, (-1, -1)
 
-        # Si le temps est écoulé on arrête la recherche
-        if env.total_time - time.time() - start_time >= 20:
-            print("break")
-            return -5, (int("-inf"), int("inf"))
+        # Si le temps est écoulé on abandonne la recherche
+        if deadline is not None and time.time() >= deadline:
+            raise SearchTimeout()
+
+        # Consultation de la table de transposition (hors racine qui doit retourner un coup)
+        alpha_origin, beta_origin = alpha, beta
+        hash_move = first_move if depth == root_depth else None
+        if table is not None and depth < root_depth:
+            key, symmetry = table_key()
+            entry = table.probe(key)
+            if entry is not None:
+                hash_move = table_action(entry[3], symmetry)
+            if entry is not None and entry[0] >= depth:
+                _, flag, tt_score, _ = entry
+                if flag == EXACT:
+                    return tt_score, hash_move
+                if flag == LOWER:
+                    alpha = max(alpha, tt_score)
+                else:
+                    beta = min(beta, tt_score)
+                if beta <= alpha:
+                    return tt_score, hash_move
+
+        actions = env.legals(player)
+        ply = root_depth - depth
+        if ordering is not None:
+            actions = ordering.order(actions, ply, player.id, hash_move)
+        elif hash_move in actions:
+            actions.remove(hash_move)
+            actions.insert(0, hash_move)
 
         if player.id == env.max_player.id:  # Maximizing player
             best_max: tuple[float, Action] = (float("-inf"), (-1, -1))
-            for action in env.legals(player):
-                env.play(action)
-                returned_values = minmax_alpha_beta_pruning(
-                    env, env.min_player, depth - 1, alpha, beta, start_time
-                )
-                env.reverse_action(action)
+            index = -1
+            for index, action in enumerate(actions):
+                play(action, player.id)
+                try:
+                    returned_values = minmax_alpha_beta_pruning(
+                        env, env.min_player, depth - 1, alpha, beta
+                    )
+                finally:
+                    reverse(action, player.id)
                 if returned_values[0] > best_max[0]:
                     best_max = (returned_values[0], action)
                 alpha = max(alpha, best_max[0])
                 if beta <= alpha:
+                    if ordering is not None:
+                        ordering.cutoff(action, ply, player.id, depth, index)
                     break
+            if ordering is not None:
+                ordering.node(index + 1)
+            store(env, depth, best_max, alpha_origin, beta_origin)
             return best_max
 
         if player.id == env.min_player.id:  # Minimizing player
             best_min: tuple[float, Action] = (float("inf"), (-1, -1))
-            for item in env.legals(player):
-                env.play(item)
-                returned_values = minmax_alpha_beta_pruning(
-                    env, env.max_player, depth - 1, alpha, beta, start_time
-                )
-                env.reverse_action(item)
+            index = -1
+            for index, item in enumerate(actions):
+                play(item, player.id)
+                try:
+                    returned_values = minmax_alpha_beta_pruning(
+                        env, env.max_player, depth - 1, alpha, beta
+                    )
+                finally:
+                    reverse(item, player.id)
                 if returned_values[0] < best_min[0]:
                     best_min = (returned_values[0], item)
                 beta = min(beta, best_min[0])
 
                 if beta <= alpha:
+                    if ordering is not None:
+                        ordering.cutoff(item, ply, player.id, depth, index)
                     break
+            if ordering is not None:
+                ordering.node(index + 1)
+            store(env, depth, best_min, alpha_origin, beta_origin)
             return best_min
         return 0, (-3, -3)
 
-    return minmax_alpha_beta_pruning(env, player, depth, float("-inf"), float("inf"), start_time)
+    def store(
+        env: Environment, depth: int, best: tuple[float, Action], alpha: float, beta: float
+    ):
+        # Enregistrement du résultat et du type de borne dans la table de transposition
+        if table is None:
+            return
+        if best[0] <= alpha:
+            flag = UPPER
+        elif best[0] >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        key, symmetry = table_key()
+        move = best[1] if symmetry is None else transform_action(best[1], symmetry, env.hex_size)
+        table.store(key, depth, flag, best[0], encode_action(move))
+
+    return minmax_alpha_beta_pruning(env, player, depth, window[0], window[1])
+
+
+def iterative_deepening(
+    env: Environment,
+    player: PlayerLocal,
+    deadline: float,
+    max_depth: int = MAX_DEPTH,
+    table: TranspositionTable | SharedTranspositionTable | None = None,
+    ordering: MoveOrdering | None = None,
+    start_depth: int = 1,
+) -> tuple[float, Action | None, int]:
+    """
+    Fonction recherchant le meilleur coup à des profondeurs croissantes
+    (start_depth, start_depth + 1...) jusqu'à la date limite
+    Chaque itération utilise une fenêtre d'aspiration centrée sur le score précédent
+    et explore d'abord le meilleur coup de l'itération précédente. Une itération
+    interrompue est abandonnée : on retourne le résultat de la dernière itération complète
+    (score, coup, profondeur atteinte).
+    """
+    best_score: float = 0
+    best_action: Action | None = None
+    completed_depth = 0
+
+    for depth in range(start_depth, max_depth + 1):
+        try:
+            # Fenêtre d'aspiration autour du score de l'itération précédente
+            if best_action is None or abs(best_score) >= WIN_SCORE:
+                window = (float("-inf"), float("inf"))
+            else:
+                window = (best_score - ASPIRATION_WINDOW, best_score + ASPIRATION_WINDOW)
+            score, action = minmax_action_alpha_beta_pruning(
+                env, player, depth, deadline, table, window, best_action, ordering
+            )
+
+            # Échec de la fenêtre : nouvelle recherche avec une fenêtre complète
+            if score <= window[0] or score >= window[1]:
+                score, action = minmax_action_alpha_beta_pruning(
+                    env, player, depth, deadline, table, first_move=action, ordering=ordering
+                )
+        except SearchTimeout:
+            break
+
+        best_score, best_action, completed_depth = score, action, depth
+
+        # Résultat prouvé : inutile de chercher plus profondément
+        if abs(best_score) >= WIN_SCORE:
+            break
+
+    return best_score, best_action, completed_depth
 
 
 def strategy_minmax(env: Environment, player: PlayerLocal) -> Action:
     """
     Stratégie qui retourne l'action calculée par l'algorithme Minimax
+    (approfondissement itératif jusqu'à la date limite du coup)
     """
-    start_time = time.time()
-    try:
-        depth_factor = 1 / (log(len(env.legals(player)), 2) / 5) * 1.2
-    except ZeroDivisionError:
-        depth_factor = 1
-    depth_factor = depth_factor.real  # convert depth factor to a float
-
-    bonus = 1.0
-
-    if env.hex_size <= 4:
-        bonus = 1.5
-
-    depth = 6 + round(depth_factor * bonus)
-
-    if env.game == "Gopher":
-        # Profondeur maximale pour le jeu Gopher
-        if len(env.legals(player)) >= 8:
-            depth = min(depth, 7)
-        # Si la taille de la grille est supérieure ou égale à 6 on limite la profondeur
-        if env.hex_size >= 6:
-            depth = min(depth, 10)
-
-        # On limite la profondeur à 15
-        depth = min(depth, 15)
-    print(f"depth {depth}")
-
-    res = minmax_action_alpha_beta_pruning(env, player, depth, start_time)
-    action: Action = res[1]
-    score: float = res[0]
-    if score < 0:
-        print("\ntime out\n")
-        return random.choice(env.legals(player))
+    play_time = env.total_time / (MINMAX_MOVES_TO_GO + max(30 - env.current_round, 0))
+    deadline = time.time() + play_time
+
+    # Fin de partie de Gopher découpée en régions indépendantes : coup gagnant prouvé
+    action = region_endgame(env, time.time() + play_time / 2)
+    if action is not None:
+        return action
+
+    ordering = get_move_ordering(env)
+    ordering.new_search()
+    if SEARCH_WORKERS > 1:
+        table = get_shared_transposition_table()
+        table.new_search()
+        score, action, depth = lazy_smp_search(
+            env, player, deadline, SEARCH_WORKERS, table, iterative_deepening, ordering
+        )
+    else:
+        table = get_transposition_table()
+        table.new_search()
+        score, action, depth = iterative_deepening(
+            env, player, deadline, table=table, ordering=ordering
+        )
+    print(f"depth {depth} (score {score}, {play_time:.2f}s)")
+    print(table.report())
+    print(ordering.report())
+
+    # Aucune itération terminée dans le temps imparti
+    if action is None:
+        return strategy_first_legal(env, player)
     return action
 
 
@@ -241,6 +449,4 @@ def strategy_mcts(env: Environment, player: PlayerLocal) -> Action:
     """
     Stratégie qui retourne l'action calculée par l'algorithme MCTS
     """
-    mcts = MCTS()
-
-    return mcts.search(env, player, round_time=10)
+    return parallel_search(env, round_time=10)
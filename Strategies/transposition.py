@@ -0,0 +1,166 @@
+""" Module concernant la table de transposition utilisée par l'alpha-beta """
+
+from abc import ABC, abstractmethod
+from array import array
+from typing import Optional
+
+# Types de borne d'une entrée
+EXACT = 0
+LOWER = 1  # le score est une borne inférieure (coupure beta)
+UPPER = 2  # le score est une borne supérieure (aucun coup n'a dépassé alpha)
+
+# Taille d'une entrée : clé (8), score (8), coup encodé (4), profondeur (1), borne (1), âge (1)
+ENTRY_BYTES = 23
+
+Entry = tuple[int, int, float, int]  # profondeur, type de borne, score, coup encodé
+
+
+class BucketTable(ABC):
+    """
+    Classe commune aux tables de transposition de taille fixe indexées par le hash
+    de Zobrist des positions : découpage en cases (buckets) de deux entrées,
+    règle de remplacement et statistiques de la recherche en cours
+
+    Chaque case de la table contient deux entrées :
+    - une entrée remplacée uniquement par une recherche au moins aussi profonde
+      (ou issue d'une recherche précédente)
+    - une entrée toujours remplacée
+    """
+
+    # Nom de la table dans le rapport des statistiques
+    label = "table de transposition"
+
+    def __init__(self, size_mb: float, entry_bytes: int):
+        self.size_mb = size_mb
+        self.buckets = max(1, int(size_mb * 1024 * 1024) // (2 * entry_bytes))
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def __len__(self) -> int:
+        return 2 * self.buckets
+
+    def bucket(self, key: int) -> int:
+        """
+        Fonction retournant l'indice de la première entrée de la case d'une position
+        """
+        return 2 * (key % self.buckets)
+
+    def replaced_slot(
+        self, index: int, depth: int, current_depth: int, same_key: bool, current_age: int
+    ) -> int:
+        """
+        Fonction choisissant l'entrée de la case index à remplacer : l'entrée à profondeur
+        préférée si elle est vide, si elle contient la même position, si la nouvelle
+        recherche est au moins aussi profonde ou si elle date d'une recherche précédente,
+        l'entrée toujours remplacée sinon
+        """
+        if (
+            current_depth < 0
+            or same_key
+            or depth >= current_depth
+            or current_age != self.generation
+        ):
+            return index
+        return index + 1
+
+    @abstractmethod
+    def fill(self) -> float:
+        """
+        Fonction retournant le taux de remplissage de la table
+        """
+
+    def hit_rate(self) -> float:
+        """
+        Fonction retournant le taux de positions trouvées dans la table
+        """
+        return self.hits / self.probes if self.probes else 0.0
+
+    def report(self) -> str:
+        """
+        Fonction retournant les statistiques de la recherche en cours
+        """
+        return (
+            f"{self.label} : {self.hit_rate():.1%} de hits "
+            f"({self.hits}/{self.probes}), {self.stores} écritures, "
+            f"remplissage {self.fill():.1%} de {self.size_mb} Mo"
+        )
+
+    def new_search(self):
+        """
+        Fonction préparant la table pour la recherche d'un nouveau coup
+        (remise à zéro des statistiques et vieillissement des entrées)
+        """
+        self.generation = (self.generation + 1) % 256
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+
+class TranspositionTable(BucketTable):
+    """
+    Classe représentant une table de transposition de taille fixe indexée par le hash
+    de Zobrist des positions (deux entrées par case, voir BucketTable)
+
+    Les entrées sont stockées dans des tableaux du module array pour que la mémoire
+    occupée reste bornée par size_mb.
+    """
+
+    def __init__(self, size_mb: float = 16):
+        super().__init__(size_mb, ENTRY_BYTES)
+        size = len(self)
+
+        self.keys = array("Q", [0]) * size
+        self.scores = array("d", [0.0]) * size
+        self.moves = array("i", [-1]) * size
+        self.depths = array("b", [-1]) * size  # -1 : entrée vide
+        self.flags = array("b", [EXACT]) * size
+        self.ages = array("B", [0]) * size
+        self.used = 0
+
+    def probe(self, key: int) -> Optional[Entry]:
+        """
+        Fonction retournant l'entrée associée à une position (ou None)
+        """
+        self.probes += 1
+        index = self.bucket(key)
+        for slot in (index, index + 1):
+            if self.depths[slot] >= 0 and self.keys[slot] == key:
+                self.hits += 1
+                return self.depths[slot], self.flags[slot], self.scores[slot], self.moves[slot]
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score: float, move: int):
+        """
+        Fonction enregistrant le résultat de la recherche d'une position
+        """
+        self.stores += 1
+        index = self.bucket(key)
+        slot = self.replaced_slot(
+            index, depth, self.depths[index], self.keys[index] == key, self.ages[index]
+        )
+
+        if self.depths[slot] < 0:
+            self.used += 1
+        self.keys[slot] = key
+        self.depths[slot] = min(depth, 127)
+        self.flags[slot] = flag
+        self.scores[slot] = score
+        self.moves[slot] = move
+        self.ages[slot] = self.generation
+
+    def fill(self) -> float:
+        """
+        Fonction retournant le taux de remplissage de la table
+        """
+        return self.used / len(self)
+
+    def clear(self):
+        """
+        Fonction vidant la table
+        """
+        size = len(self)
+        self.depths = array("b", [-1]) * size
+        self.used = 0
+        self.new_search()
@@ -7,9 +7,16 @@ from typing import Any, List
 import matplotlib
 import matplotlib.pyplot as plt
 from Server.gndclient import BLUE, RED, State, cell_to_grid, empty_grid
-from Strategies.strategies import (StrategyLocal, strategy_minmax, strategy_random, strategy_mcts)
+from Strategies.strategies import (StrategyLocal, set_search_workers,
+                                   set_symmetric_table,
+                                   set_transposition_table_size,
+                                   strategy_minmax, strategy_random, strategy_mcts)
+from Strategies.evaluation import set_evaluation_check
+from Strategies.mcts_parallel import set_mcts_workers
+from Strategies.proof_number import strategy_proof_number
 from Game_playing.benchmark import add_to_benchmark
-from Game_playing.grid import INIT_GRID, INIT_GRID4
+from Game_playing.bitboard import BACKENDS
+from Game_playing.grid import DODO_GRIDS
 from Game_playing.structures_classes import (ALL_DIRECTIONS, DOWN_DIRECTIONS,
                                              UP_DIRECTIONS, Action, Environment, GameDodo,
                                              GameGopher, GridDict, PlayerLocal,
@@ -198,13 +205,22 @@ def gopher(
 
 
 # Initialisation de l'environnement
-def initialize(game: str, grid: GridDict, player: int, hex_size: int, total_time: Time):
+def initialize(
+    game: str,
+    grid: GridDict,
+    player: int,
+    hex_size: int,
+    total_time: Time,
+    backend: str = "dict",
+):
     """
     Fonction permettant d'initialiser l'environnement de jeu
+    backend : représentation de la grille ("dict" ou "bitboard")
     """
     # Initialisation des joueurs
     player_selected: PlayerLocal
     player_opponent: PlayerLocal
+    dodo_class, gopher_class = BACKENDS[backend]
 
     # Initialisation de l'environnement du jeu Dodo
     if game == "Dodo":
@@ -213,7 +229,7 @@ def initialize(game: str, grid: GridDict, player: int, hex_size: int, total_time
             player_selected = PlayerLocal(1, UP_DIRECTIONS)
             player_opponent = PlayerLocal(2, DOWN_DIRECTIONS)
             # Retourne l'environnement du jeu Dodo initialisé
-            return GameDodo(
+            return dodo_class(
                 grid,
                 player_selected,
                 player_opponent,
@@ -230,7 +246,7 @@ def initialize(game: str, grid: GridDict, player: int, hex_size: int, total_time
         player_opponent = PlayerLocal(1, UP_DIRECTIONS)
 
         # Retourne l'environnement du jeu Dodo initialisé
-        return GameDodo(
+        return dodo_class(
             grid,
             player_selected,
             player_opponent,
@@ -250,7 +266,7 @@ def initialize(game: str, grid: GridDict, player: int, hex_size: int, total_time
         player_param = PlayerLocal(1, ALL_DIRECTIONS)
         player_opponent = PlayerLocal(2, ALL_DIRECTIONS)
         # Retourne l'environnement du jeu Gopher initialisé
-        return GameGopher(
+        return gopher_class(
             grid,
             player_param,
             player_opponent,
@@ -266,7 +282,7 @@ def initialize(game: str, grid: GridDict, player: int, hex_size: int, total_time
     player_param = PlayerLocal(2, ALL_DIRECTIONS)
     player_opponent = PlayerLocal(1, ALL_DIRECTIONS)
     # Retourne l'environnement du jeu Gopher initialisé
-    return GameGopher(
+    return gopher_class(
         grid,
         player_param,
         player_opponent,
@@ -327,6 +343,7 @@ def launch_multi_game(
     strategy_2: Any = strategy_minmax,
     timer: Time = 720,
     size_init_grid: int = 4,
+    backend: str = "dict",
 ):
     """
     Fonction permettant de lancer plusieurs parties de jeu à la suite
@@ -346,11 +363,8 @@ def launch_multi_game(
         print(f"Stratégie 2: {strategy_2.__name__} pour le joueur B")
         # Lancement de n parties de jeu Dodo
         for i in range(game_number):
-            if size_init_grid == 4:
-                init_grid = convert_grid(INIT_GRID4, size_init_grid)
-            else:
-                init_grid = convert_grid(INIT_GRID, size_init_grid)
-            game = initialize("Dodo", init_grid, 1, size_init_grid, timer)
+            init_grid = convert_grid(DODO_GRIDS[size_init_grid], size_init_grid)
+            game = initialize("Dodo", init_grid, 1, size_init_grid, timer, backend)
             res = dodo(
                 game,
                 strategy_1,
@@ -369,7 +383,7 @@ def launch_multi_game(
         print(f"Stratégie 2: {strategy_2.__name__} pour le joueur B")
         init_grid = generate_grid(size_init_grid)
         for i in range(game_number):
-            game = initialize("Gopher", init_grid, 1, size_init_grid, 720)
+            game = initialize("Gopher", init_grid, 1, size_init_grid, 720, backend)
             res = gopher(
                 game,
                 strategy_1,
@@ -402,11 +416,11 @@ def main():
         "--games", type=int, default=1, help="Number of games to play (default: 1)"
     )
     parser.add_argument(
-        "--strategy1", choices=["minmax", "random", "mcts"], default="random",
+        "--strategy1", choices=["minmax", "random", "mcts", "pn"], default="random",
         help="Strategy for player 1 (default: random)"
     )
     parser.add_argument(
-        "--strategy2", choices=["minmax", "random", "mcts"], default="mcts",
+        "--strategy2", choices=["minmax", "random", "mcts", "pn"], default="mcts",
         help="Strategy for player 2 (default: mcts)"
     )
     parser.add_argument(
@@ -414,16 +428,54 @@ def main():
         help="Time for one player (default: 360)"
     )
     parser.add_argument(
-        "--size", type=int, default=4, choices=[4, 7],
-        help="Size of the initial grid (default: 4)"
+        "--size", type=int, default=4, choices=range(3, 11),
+        help="Size of the initial grid (default: 4, Dodo: 3, 4 or 7)"
+    )
+    parser.add_argument(
+        "--backend", choices=list(BACKENDS), default="dict",
+        help="Board representation (default: dict)"
+    )
+
+    parser.add_argument(
+        "--tt-size", type=float, default=64,
+        help="Memory of the alpha-beta transposition table in MB (default: 64)"
+    )
+    parser.add_argument(
+        "--search-workers", type=int, default=1,
+        help="Number of processes used by the alpha-beta (Lazy SMP, default: 1)"
+    )
+    parser.add_argument(
+        "--symmetry", action="store_true",
+        help="Index the alpha-beta transposition table by canonical (symmetric) keys"
+    )
+    parser.add_argument(
+        "--check-evaluation", action="store_true",
+        help="Check the incremental evaluation against a full computation at every leaf (slow)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of processes used by the MCTS (default: 1)"
+    )
+    parser.add_argument(
+        "--parallel", choices=["root", "tree"], default="root",
+        help="MCTS parallelization: one tree per process or a shared tree (default: root)"
     )
 
     args = parser.parse_args()
+    set_transposition_table_size(args.tt_size)
+    set_search_workers(args.search_workers)
+    set_symmetric_table(args.symmetry)
+    set_evaluation_check(args.check_evaluation)
+    set_mcts_workers(args.workers, args.parallel)
+
+    if args.game == "dodo" and args.size not in DODO_GRIDS:
+        parser.error(f"Dodo is only available on sizes {sorted(DODO_GRIDS)}")
 
     strategies = {
         "minmax": strategy_minmax,
         "random": strategy_random,
         "mcts": strategy_mcts,
+        "pn": strategy_proof_number,
     }
 
     strategy_1 = strategies[args.strategy1]
@@ -437,6 +489,7 @@ def main():
             strategy_2=strategy_2,
             timer=Time(args.time*2),
             size_init_grid=args.size,
+            backend=args.backend,
         )
     else:
         launch_multi_game(
@@ -446,6 +499,7 @@ def main():
             strategy_2=strategy_2,
             timer=Time(args.time*2),
             size_init_grid=args.size,
+            backend=args.backend,
         )
 
 
@@ -0,0 +1,6 @@
+""" Configuration des tests : racine du dépôt dans le chemin d'import """
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,118 @@
+""" Tests des positions terminales et des coups gagnants des trois stockages du MCTS """
+
+import random
+
+import pytest
+
+from Game_playing.grid import build_environment
+from Game_playing.structures_classes import Action, Environment
+from Strategies.mcts import MCTS, TreeNode
+from Strategies.mcts_dag import DagMCTS, DagNode
+from Strategies.mcts_tree import ROOT
+
+SIZE = 4
+POSITIONS = 20
+SIMULATIONS = 600
+
+
+def winning_moves(env: Environment) -> list[Action]:
+    """
+    Fonction retournant les coups du joueur au trait qui terminent la partie à son avantage
+    """
+    good = 1 if env.current_player.id == env.max_player.id else -1
+    winning = []
+    for action in env.legals(env.current_player):
+        env.play(action)
+        if env.final() == good:
+            winning.append(action)
+        env.reverse_action(action)
+    return winning
+
+
+def random_games(game: str, count: int, seed: int = 0) -> list[list[Action]]:
+    """
+    Fonction retournant les coups de count parties aléatoires jouées jusqu'au bout
+    """
+    rng = random.Random(seed)
+    env = build_environment(game, SIZE)
+    games = []
+    for _ in range(count):
+        actions = []
+        while env.final() == 0:
+            actions.append(rng.choice(env.legals(env.current_player)))
+            env.play(actions[-1])
+        games.append(actions)
+        for action in reversed(actions):
+            env.reverse_action(action)
+    return games
+
+
+def position(game: str, actions: list[Action]) -> Environment:
+    """
+    Fonction rejouant des coups depuis la position initiale, le joueur au trait
+    étant le joueur max (celui pour qui le MCTS cherche)
+    """
+    env = build_environment(game, SIZE, player_id=1 if len(actions) % 2 == 0 else 2)
+    for action in actions:
+        env.play(action)
+    return env
+
+
+def winning_positions(game: str) -> list[list[Action]]:
+    """
+    Fonction retournant des positions de parties aléatoires où le joueur au trait
+    a un coup gagnant immédiat
+    """
+    found = []
+    for actions in random_games(game, 4 * POSITIONS):
+        for ply in range(len(actions)):
+            if winning_moves(position(game, actions[:ply])):
+                found.append(actions[:ply])
+                break
+        if len(found) == POSITIONS:
+            break
+    return found
+
+
+@pytest.mark.parametrize("game", ["Dodo", "Gopher"])
+def test_finished_positions_are_terminal(game):
+    # À Dodo, la partie est aussi finie quand le joueur qui vient de jouer est bloqué,
+    # alors que le joueur au trait a encore des coups
+    for actions in random_games(game, 50):
+        env = position(game, actions)
+        assert env.final() != 0
+
+        node = TreeNode(env)
+        assert node.is_terminal and not node.unexplored_actions
+        assert node.proven == env.final()
+        assert DagNode(env).is_terminal
+        assert not MCTS().node_actions(env, ROOT)
+
+
+@pytest.mark.parametrize("game", ["Dodo", "Gopher"])
+@pytest.mark.parametrize("store", ["nodes", "arrays", "dag"])
+def test_immediate_win_is_played(game, store):
+    for actions in winning_positions(game):
+        env = position(game, actions)
+        winning = winning_moves(env)
+        if store == "dag":
+            mcts = DagMCTS(check_invariants=True, symmetry=False)
+        else:
+            mcts = MCTS(check_invariants=True, tree_store=store, symmetry=False)
+        played = mcts.search(env, nb_simulations=SIMULATIONS)
+
+        if store == "nodes":
+            # MCTS-Solver : la racine est prouvée gagnée et le coup joué est prouvé gagnant
+            child = next(c for c in mcts.root.children if c.parent_action == played)
+            assert mcts.root.proven == 1
+            assert child.proven == 1
+            continue
+
+        # Sans preuve : un coup gagnant immédiat est une victoire à chaque visite,
+        # et le coup joué a un score parfait (lui aussi gagnant dans toutes les simulations)
+        statistics = mcts.root_statistics()
+        for action in winning:
+            visits, score = statistics[action]
+            assert visits > 0 and score == visits
+        visits, score = statistics[played]
+        assert score == visits